@@ -1,5 +1,6 @@
 """Main entry point for event analysis."""
 
+import argparse
 import sys
 from pathlib import Path
 import logging
@@ -7,9 +8,13 @@ import logging
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.data import load_events_data
-from src.stats import descriptive, advanced
-from src.viz import basic, advanced as viz_advanced
+from src.data import (load_events_data, load_sharded_dataset, combine_series, is_sharded_source,
+                      calendar_summary)
+from src.stats import descriptive, advanced, simulation, detection
+from src.viz import basic, advanced as viz_advanced, render
+from src.perf import instrument, cache as results_cache
+from src import watch as watch_mode
+from src import server as query_server
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -51,9 +56,8 @@ def report_aggregate_stats(data_by_year: dict) -> None:
     
     print_subsection("Standard Deviation by Year")
     for year in sorted(data_by_year.keys()):
-        stdev = descriptive.std_dev_events_per_month(data_by_year[year])
-        cv = descriptive.coefficient_of_variation(data_by_year[year])
-        print(f"  • {year}: σ = {stdev}, CV = {cv}%")
+        summary = descriptive.year_summary(data_by_year[year])
+        print(f"  • {year}: σ = {summary['std_dev']}, CV = {summary['cv']}%")
 
 
 def report_year_comparisons(data_by_year: dict) -> None:
@@ -95,7 +99,8 @@ def report_advanced_analysis(data_by_year: dict) -> None:
     
     # Year-over-year trend
     print_subsection("📊 Year-Over-Year Trend")
-    trend = advanced.year_over_year_trend(data_by_year)
+    with instrument.stage('analysis.trend'):
+        trend = results_cache.cached(advanced.year_over_year_trend, data_by_year)
     print(f"  Years: {trend['years']}")
     print(f"  Totals: {trend['totals']}")
     print(f"  Trend: {trend['trend'].upper()}")
@@ -105,7 +110,8 @@ def report_advanced_analysis(data_by_year: dict) -> None:
     
     # Seasonality
     print_subsection("🌊 Seasonality Analysis (ANOVA)")
-    seasonality = advanced.seasonality_anova(data_by_year)
+    with instrument.stage('analysis.anova'):
+        seasonality = results_cache.cached(advanced.seasonality_anova, data_by_year)
     print(f"  F-statistic: {seasonality['f_statistic']:.4f}")
     print(f"  p-value: {seasonality['p_value']:.4f}")
     print(f"  Result: {seasonality['interpretation']}")
@@ -117,36 +123,65 @@ def report_advanced_analysis(data_by_year: dict) -> None:
     
     # Day distribution
     print_subsection("📅 Day Distribution Analysis")
+    with instrument.stage('analysis.calendar'):
+        weekdays = results_cache.cached(calendar_summary, data_by_year)
     for year in sorted(data_by_year.keys()):
-        day_dist = advanced.day_distribution_analysis(data_by_year[year])
+        with instrument.stage('analysis.day_distribution'):
+            day_dist = results_cache.cached(advanced.day_distribution_analysis, data_by_year[year])
         print(f"\n  {year}:")
         print(f"    Unique days: {day_dist['total_unique_days']}")
         print(f"    Most common: day {day_dist['most_common_day']} ({day_dist['most_common_count']} times)")
         print(f"    Least common: day {day_dist['least_common_day']} ({day_dist['least_common_count']} times)")
         print(f"    First week:  {day_dist['first_week_events']:3d} | Second week: {day_dist['second_week_events']:3d} | "
               f"Third week: {day_dist['third_week_events']:3d}")
+        cal = weekdays[year]
+        print(f"    Busiest weekday: {cal['busiest_weekday']} | Business-day events: "
+              f"{cal['business_day_events']} ({cal['events_per_business_day']:.2f}/business day) | "
+              f"Weekend/other: {cal['other_events']}")
     
     # Correlations
     print_subsection("🔗 Year-to-Year Correlations")
-    correlations = advanced.correlation_between_years(data_by_year)
+    with instrument.stage('analysis.correlation'):
+        correlations = results_cache.cached(advanced.correlation_between_years, data_by_year)
     for corr in correlations['correlations']:
         print(f"  {corr['pair']}: r = {corr['correlation']:6.3f} ({corr['relationship']} relationship)")
     print(f"  Average correlation: {correlations['average_correlation']:.3f}")
     
     # Normality test
     print_subsection("📊 Normality Test (Shapiro-Wilk)")
-    for year in sorted(data_by_year.keys()):
-        norm_test = advanced.normality_test(data_by_year[year])
-        status = "✓ Normal" if norm_test['normal'] else "✗ Non-normal"
-        print(f"  {year}: p-value = {norm_test['p_value']:.4f} {status}")
+    with instrument.stage('analysis.normality'):
+        years, counts = advanced.monthly_count_matrix(data_by_year)
+        norm_tests = results_cache.cached(advanced.batch_normality_test, counts, method='shapiro')
+    for year, p_value, normal in zip(years, norm_tests['p_value'], norm_tests['normal']):
+        status = "✓ Normal" if normal else "✗ Non-normal"
+        print(f"  {year}: p-value = {p_value:.4f} {status}")
     
     # Predictive summary
     print_subsection("🔮 Predictive Summary")
-    pred = advanced.predictive_summary(data_by_year)
+    with instrument.stage('analysis.predictive'):
+        pred = results_cache.cached(advanced.predictive_summary, data_by_year)
     print(f"  Overall trend direction: {pred['trend_direction'].upper()}")
     print(f"  Trend is statistically significant: {'YES ✓' if pred['trend_significance'] else 'NO ✗'}")
     print(f"  Seasonality detected: {'YES ✓' if pred['seasonality_detected'] else 'NO ✗'}")
     print(f"  Expected annual total (based on recent years): {pred['expected_annual_total']:.0f} events")
+    with instrument.stage('analysis.simulation'):
+        sim = results_cache.cached(simulation.simulate_next_year, data_by_year, n_sims=100_000,
+                                   quantiles=(0.05, 0.5, 0.95), seed=0)
+    annual = sim['annual']['quantiles']
+    print(f"  Simulated next-year total: median {annual['q50']} events, "
+          f"90% interval [{annual['q5']}, {annual['q95']}]")
+    
+    print_subsection("🚨 Change Points & Anomalies")
+    with instrument.stage('analysis.detection'):
+        detected = results_cache.cached(detection.detection_summary, data_by_year)
+    for cp in detected['changepoints']:
+        print(f"  Rate shift from {descriptive.MONTHS[cp['month'] - 1]} {cp['year']}: "
+              f"{cp['mean_before']:.2f} → {cp['mean_after']:.2f} events/month")
+    if not detected['changepoints']:
+        print("  No rate shifts detected")
+    for anomaly in detected['anomalies']:
+        print(f"  Anomalous month: {descriptive.MONTHS[anomaly['month'] - 1]} {anomaly['year']} "
+              f"({anomaly['count']} events, expected {anomaly['expected']:.1f}, score {anomaly['score']:+.2f})")
 
 
 def report_comparative_analysis(data_by_year: dict) -> None:
@@ -171,8 +206,64 @@ def report_comparative_analysis(data_by_year: dict) -> None:
         print(f"  Jaccard similarity: {comp['jaccard_days']} (0=completely different, 1=identical)")
 
 
-def main():
-    """Main execution function."""
+def report_watch_update(analysis: watch_mode.IncrementalAnalysis, summary: dict) -> None:
+    """Print the results recomputed during one watch cycle."""
+    diff = summary['diff']
+    print_section("WATCH UPDATE")
+    print(f"  Added: {diff['added']} | Changed: {diff['changed']} | "
+          f"Removed: {diff['removed']} | Reused: {diff['unchanged']}")
+    
+    if not summary['recomputed_global']:
+        print("  No changes in event data, nothing recomputed.")
+        return
+    
+    for year in summary['recomputed_years']:
+        stats = analysis.year_results[year]
+        print(f"\n📊 Year {year}:")
+        print("-" * 70)
+        print(f"  Total: {stats['total']} | Avg/month: {stats['avg_per_month']} | "
+              f"σ = {stats['std_dev']}, CV = {stats['cv']}%")
+        print(f"  Total per months: {stats['per_month']}")
+        print(f"  Highest month: {stats['peak_month']} | Lowest month: {stats['lowest_month']}")
+        print(f"  Top 3 days: {stats['top3']} | Bottom 3 days: {stats['bottom3']}")
+        status = "✓ Normal" if stats['normality']['normal'] else "✗ Non-normal"
+        print(f"  Normality p-value: {stats['normality']['p_value']:.4f} {status}")
+    
+    for ya, yb in summary['recomputed_pairs']:
+        comp = analysis.pair_results[(ya, yb)]
+        ta, tb = comp['total_events']
+        print(f"\n📈 {ya} vs {yb}: total {ta} → {tb} (Δ {tb - ta:+d}), "
+              f"Jaccard {comp['jaccard_days']}")
+    
+    results = analysis.global_results
+    trend = results['year_trend']
+    print_subsection("Cross-year results")
+    print(f"  Trend: {trend['trend'].upper()} (slope {trend['slope']:.4f}, p-value {trend['p_value']:.4f})")
+    print(f"  Seasonality: {results['seasonality']['interpretation']} "
+          f"(p-value {results['seasonality']['p_value']:.4f})")
+    print(f"  Average correlation: {results['correlations']['average_correlation']:.3f}")
+    print(f"  Expected annual total: {results['predictive_summary']['expected_annual_total']:.0f} events")
+
+
+def run_watch(args: argparse.Namespace) -> None:
+    """Run the analysis in watch mode until interrupted."""
+    watch_mode.watch(args.data_file, on_update=report_watch_update,
+                     output_dir=args.output_dir, interval=args.interval,
+                     render_profile=args.render_profile)
+
+
+def main(data_file: str = 'events.json', output_dir: str = 'outputs',
+         render_profile: str = render.DEFAULT_PROFILE):
+    """
+    Main execution function.
+    
+    Args:
+        data_file: JSON file name in data/raw/ (or an absolute path); a
+            directory or glob pattern loads a sharded dataset with all
+            series pooled
+        output_dir: Directory where visualizations are saved
+        render_profile: Render profile of the plots (see src.viz.render.PROFILES)
+    """
     print("\n" + "=" * 70)
     print("  🎯 ANALYSIS CONTEO v2.0 - Event Data Analysis System")
     print("=" * 70)
@@ -180,27 +271,108 @@ def main():
     try:
         # Load data
         logger.info("Loading data from JSON...")
-        data_by_year = load_events_data()
+        with instrument.stage('load'):
+            if is_sharded_source(data_file):
+                store, _ = load_sharded_dataset(data_file)
+                data_by_year = combine_series(store)
+            else:
+                data_by_year = load_events_data(data_file)
         logger.info(f"Successfully loaded data for years: {sorted(data_by_year.keys())}")
         
         # Generate reports
-        report_descriptive_stats(data_by_year)
-        report_aggregate_stats(data_by_year)
-        report_year_comparisons(data_by_year)
-        report_advanced_analysis(data_by_year)
-        report_comparative_analysis(data_by_year)
+        with instrument.stage('report.descriptive'):
+            report_descriptive_stats(data_by_year)
+        with instrument.stage('report.aggregate'):
+            report_aggregate_stats(data_by_year)
+        with instrument.stage('report.comparisons'):
+            report_year_comparisons(data_by_year)
+        with instrument.stage('report.advanced'):
+            report_advanced_analysis(data_by_year)
+        with instrument.stage('report.comparative'):
+            report_comparative_analysis(data_by_year)
         
         # Generate visualizations
         print_section("GENERATING VISUALIZATIONS")
-        viz_advanced.generate_all_plots(data_by_year, output_dir='outputs')
+        with instrument.stage('plots'):
+            viz_advanced.generate_all_plots(data_by_year, output_dir=output_dir,
+                                            profile=render_profile)
         
         print_section("ANALYSIS COMPLETE ✓")
-        print("Check the 'outputs/' folder for generated visualizations.\n")
+        print(f"Check the '{output_dir}/' folder for generated visualizations.\n")
         
     except Exception as e:
         logger.error(f"Error during analysis: {e}", exc_info=True)
         sys.exit(1)
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description='Event data analysis system.')
+    parser.add_argument('--data-file', default='events.json',
+                        help='JSON file in data/raw/ or an absolute path; '
+                             'a directory or glob loads a sharded dataset')
+    parser.add_argument('--output-dir', default='outputs',
+                        help='Directory where visualizations are saved')
+    parser.add_argument('--render-profile', choices=sorted(render.PROFILES), default=render.DEFAULT_PROFILE,
+                        help='Plot output: draft (fast PNG), publish (300 dpi PNG), svg or pdf')
+    parser.add_argument('--watch', action='store_true',
+                        help='Poll the data file and recompute only the years that change')
+    parser.add_argument('--interval', type=float, default=watch_mode.DEFAULT_POLL_INTERVAL,
+                        help='Seconds between polls in watch mode')
+    parser.add_argument('--serve', action='store_true',
+                        help='Serve per-year summaries, comparisons, trend and seasonality over HTTP')
+    parser.add_argument('--host', default=query_server.DEFAULT_HOST,
+                        help='Interface for --serve')
+    parser.add_argument('--port', type=int, default=query_server.DEFAULT_PORT,
+                        help='Port for --serve')
+    parser.add_argument('--profile', action='store_true',
+                        help='Record per-stage and per-function timings and print a summary')
+    parser.add_argument('--profile-output', type=Path,
+                        help='Also write the profile summary table to this file')
+    parser.add_argument('--profile-dump', type=Path,
+                        help='Write a cProfile dump (.prof) for pstats/flamegraph tools')
+    parser.add_argument('--profile-alloc', action='store_true',
+                        help='Track allocations per stage with tracemalloc (slower)')
+    parser.add_argument('--cache', nargs='?', type=Path, const=results_cache.DEFAULT_CACHE_PATH,
+                        help='Reuse test, simulation and detection results stored in this SQLite file '
+                             f'(default {results_cache.DEFAULT_CACHE_PATH}) when their inputs are unchanged')
+    parser.add_argument('--cache-max-mb', type=float, default=results_cache.DEFAULT_MAX_MB,
+                        help='Size bound of the result cache; least recently used results are evicted')
+    return parser.parse_args(argv)
+
+
+def run_profiled(args: argparse.Namespace) -> None:
+    """Run main() with instrumentation enabled and report the results."""
+    instrument.enable(modules=[descriptive, advanced, basic, viz_advanced],
+                      track_allocations=args.profile_alloc)
+    try:
+        with instrument.profile_calls(args.profile_dump):
+            main(data_file=args.data_file, output_dir=args.output_dir,
+                 render_profile=args.render_profile)
+    finally:
+        instrument.disable()
+    
+    table = instrument.format_summary()
+    print_section("PROFILE SUMMARY")
+    print(table)
+    if args.profile_output:
+        args.profile_output.write_text(table + '\n', encoding='utf-8')
+        logger.info(f"Profile summary written to {args.profile_output}")
+    if args.profile_dump:
+        logger.info(f"cProfile dump written to {args.profile_dump}")
+
+
 if __name__ == '__main__':
-    main()
+    cli_args = parse_args()
+    if cli_args.cache:
+        results_cache.enable(cli_args.cache, max_mb=cli_args.cache_max_mb)
+    if cli_args.serve:
+        query_server.serve(cli_args.data_file, host=cli_args.host, port=cli_args.port)
+    elif cli_args.watch:
+        run_watch(cli_args)
+    elif cli_args.profile or cli_args.profile_dump:
+        run_profiled(cli_args)
+    else:
+        main(data_file=cli_args.data_file, output_dir=cli_args.output_dir,
+             render_profile=cli_args.render_profile)
+    results_cache.disable()
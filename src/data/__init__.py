@@ -1,5 +1,26 @@
 """Data module for loading and validating event data."""
 
-from .loader import load_events_data, validate_data, get_data_by_year
+from .loader import (load_events_data, load_event_counts, validate_data, get_data_by_year, YearEvents,
+                     observed_mask)
+from .shards import load_sharded_dataset, combine_series, is_sharded_source
+from .calendar import EventCalendar, calendar_summary
+from .shared import SharedStore, MappedStore, write_mapped_store
+from .rollups import Rollups
 
-__all__ = ['load_events_data', 'validate_data', 'get_data_by_year']
+__all__ = [
+    'load_events_data',
+    'load_event_counts',
+    'validate_data',
+    'get_data_by_year',
+    'YearEvents',
+    'observed_mask',
+    'load_sharded_dataset',
+    'combine_series',
+    'is_sharded_source',
+    'EventCalendar',
+    'calendar_summary',
+    'SharedStore',
+    'MappedStore',
+    'write_mapped_store',
+    'Rollups',
+]
@@ -0,0 +1,249 @@
+"""
+Calendar layer mapping (year, month, day) events to real dates.
+
+The whole store is flattened once into datetime64[D] arrays; day-of-week,
+ISO-week and business-day aggregations are then single bincount passes
+over those arrays.
+"""
+
+import itertools
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .loader import observed_mask
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# 1970-01-01 (day 0 of datetime64[D]) was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+def flatten_store(data_by_year: Dict[int, List[List[int]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten a year -> months mapping into parallel year/month/day arrays.
+
+    Args:
+        data_by_year: Dictionary with year as key and monthly events as value
+
+    Returns:
+        Tuple of int arrays (years, months 1-12, days), one entry per event,
+        in year and month order
+    """
+    years = sorted(data_by_year.keys())
+    months = [month for year in years for month in data_by_year[year]]
+    counts = np.fromiter((len(m) for m in months), dtype=np.int64, count=len(months))
+    n_months = [len(data_by_year[year]) for year in years]
+
+    year_col = np.repeat(np.repeat(np.array(years, dtype=np.int64), n_months), counts)
+    month_col = np.repeat(np.concatenate([np.arange(1, n + 1) for n in n_months]) if years else
+                          np.empty(0, dtype=np.int64), counts)
+    day_col = np.fromiter(itertools.chain.from_iterable(months), dtype=np.int64, count=int(counts.sum()))
+    return year_col, month_col, day_col
+
+
+def month_starts(years, months) -> np.ndarray:
+    """First day of each (year, month) as datetime64[D]."""
+    offsets = (np.asarray(years) - 1970) * 12 + np.asarray(months) - 1
+    return offsets.astype('datetime64[M]').astype('datetime64[D]')
+
+
+def month_lengths(years, months) -> np.ndarray:
+    """Number of days of each (year, month), leap years included."""
+    start = month_starts(years, months)
+    end = (start.astype('datetime64[M]') + 1).astype('datetime64[D]')
+    return (end - start).astype(np.int64)
+
+
+def to_datetime64(years, months, days) -> np.ndarray:
+    """
+    Convert year/month/day arrays to datetime64[D].
+
+    Days past the end of their month are not checked here (they roll over
+    into the next month); use invalid_dates to find them.
+
+    Args:
+        years: Array of years
+        months: Array of months (1-12)
+        days: Array of days of month
+
+    Returns:
+        datetime64[D] array
+    """
+    return month_starts(years, months) + (np.asarray(days) - 1).astype('timedelta64[D]')
+
+
+def invalid_dates(data_by_year: Dict[int, List[List[int]]]) -> List[Tuple[int, int, int]]:
+    """
+    List events whose day does not exist in their month (e.g. February 30).
+
+    Args:
+        data_by_year: Dictionary with year as key and monthly events as value
+
+    Returns:
+        Sorted list of unique (year, month, day) tuples
+    """
+    years, months, days = flatten_store(data_by_year)
+    bad = (days < 1) | (days > month_lengths(years, months))
+    return sorted(set(zip(years[bad].tolist(), months[bad].tolist(), days[bad].tolist())))
+
+
+def weekday(dates: np.ndarray) -> np.ndarray:
+    """Day of week (Monday = 0 ... Sunday = 6) of datetime64[D] values."""
+    return (dates.astype(np.int64) + _EPOCH_WEEKDAY) % 7
+
+
+def iso_calendar(dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ISO 8601 year and week number of datetime64[D] values.
+
+    The ISO week belongs to the year of its Thursday.
+
+    Args:
+        dates: datetime64[D] array
+
+    Returns:
+        Tuple of (ISO years, ISO weeks 1-53)
+    """
+    thursday = dates - weekday(dates).astype('timedelta64[D]') + np.timedelta64(3, 'D')
+    iso_year = thursday.astype('datetime64[Y]')
+    week = (thursday - iso_year.astype('datetime64[D]')).astype(np.int64) // 7 + 1
+    return iso_year.astype(np.int64) + 1970, week
+
+
+class EventCalendar:
+    """
+    Events of a store as real dates, ready for calendar aggregations.
+
+    Attributes:
+        years: Sorted years of the store
+        dates: datetime64[D] of every valid event
+        year_index: Position of each event's year in `years`
+        month: Month (1-12) of each event
+        weekday: Day of week (Monday = 0) of each event
+        observed: (years x 12) observed-months mask
+    """
+
+    def __init__(self, data_by_year: Dict[int, List[List[int]]], strict: bool = False):
+        """
+        Args:
+            data_by_year: Dictionary with year as key and monthly events as value
+            strict: Raise on days that do not exist in their month instead of
+                dropping them with a warning
+
+        Raises:
+            ValueError: In strict mode, if any event has an impossible date
+        """
+        years, months, days = flatten_store(data_by_year)
+        valid = (days >= 1) & (days <= month_lengths(years, months))
+        if not valid.all():
+            bad = sorted(set(zip(years[~valid].tolist(), months[~valid].tolist(), days[~valid].tolist())))
+            message = f"{int((~valid).sum())} events on impossible dates, e.g. {bad[:5]}"
+            if strict:
+                raise ValueError(message)
+            logger.warning(f"Dropping {message}")
+
+        self.years = sorted(data_by_year.keys())
+        self.n_invalid = int((~valid).sum())
+        self.month = months[valid]
+        self.dates = to_datetime64(years[valid], self.month, days[valid])
+        self.year_index = np.searchsorted(self.years, years[valid])
+        self.weekday = weekday(self.dates)
+        self.observed = np.array([observed_mask(data_by_year[year]) for year in self.years],
+                                 dtype=bool).reshape(len(self.years), -1)
+
+    def _by_year(self, keys: np.ndarray, n_keys: int) -> np.ndarray:
+        """Count events per (year, key) in one bincount pass."""
+        flat = np.bincount(self.year_index * n_keys + keys, minlength=len(self.years) * n_keys)
+        return flat.reshape(len(self.years), n_keys)
+
+    def weekday_counts(self) -> Dict[int, List[int]]:
+        """
+        Events per day of week for every year.
+
+        Returns:
+            Dictionary year -> 7 counts (Monday first)
+        """
+        matrix = self._by_year(self.weekday, 7)
+        return {year: row.tolist() for year, row in zip(self.years, matrix)}
+
+    def iso_week_counts(self) -> Dict[Tuple[int, int], int]:
+        """
+        Events per ISO week.
+
+        Returns:
+            Dictionary (ISO year, ISO week) -> count, sorted, weeks without
+            events omitted
+        """
+        iso_year, week = iso_calendar(self.dates)
+        keys, counts = np.unique(iso_year * 100 + week, return_counts=True)
+        return {(int(k) // 100, int(k) % 100): int(c) for k, c in zip(keys, counts)}
+
+    def business_day_counts(self, holidays: Optional[Sequence] = None,
+                            weekmask: str = '1111100') -> Dict[int, Dict]:
+        """
+        Events on business days vs. other days, with business-day rates.
+
+        Rates divide by the business days of observed months only, so a
+        partial year is not diluted by the months it has no data for.
+
+        Args:
+            holidays: Dates excluded from business days (anything np.datetime64 accepts)
+            weekmask: Business days of the week, Monday first (numpy busday format)
+
+        Returns:
+            Dictionary year -> {'business_day_events', 'other_events',
+            'business_days' (per month, observed or not),
+            'events_per_business_day'}
+        """
+        holidays = np.array(holidays if holidays is not None else [], dtype='datetime64[D]')
+        busday = np.is_busday(self.dates, weekmask=weekmask, holidays=holidays)
+        counts = self._by_year(busday.astype(np.int64), 2)
+
+        years = np.repeat(self.years, 12)
+        months = np.tile(np.arange(1, 13), len(self.years))
+        starts = month_starts(years, months)
+        ends = (starts.astype('datetime64[M]') + 1).astype('datetime64[D]')
+        business_days = np.busday_count(starts, ends, weekmask=weekmask,
+                                        holidays=holidays).reshape(len(self.years), 12)
+
+        result = {}
+        for i, year in enumerate(self.years):
+            total_days = int(business_days[i][self.observed[i]].sum())
+            result[year] = {
+                'business_day_events': int(counts[i, 1]),
+                'other_events': int(counts[i, 0]),
+                'business_days': business_days[i].tolist(),
+                'events_per_business_day': round(float(counts[i, 1]) / total_days, 4) if total_days else 0.0,
+            }
+        return result
+
+
+def calendar_summary(data_by_year: Dict[int, List[List[int]]], strict: bool = False,
+                     holidays: Optional[Sequence] = None) -> Dict:
+    """
+    Day-of-week and business-day breakdown of every year.
+
+    Args:
+        data_by_year: Dictionary with year as key and monthly events as value
+        strict: Raise on impossible dates instead of dropping them
+        holidays: Dates excluded from business days
+
+    Returns:
+        Dictionary year -> {'weekday_counts', 'busiest_weekday',
+        'business_day_events', 'other_events', 'business_days',
+        'events_per_business_day'}
+    """
+    cal = EventCalendar(data_by_year, strict=strict)
+    business = cal.business_day_counts(holidays)
+    summary = {}
+    for year, counts in cal.weekday_counts().items():
+        summary[year] = {
+            'weekday_counts': dict(zip(WEEKDAYS, counts)),
+            'busiest_weekday': WEEKDAYS[int(np.argmax(counts))],
+            **business[year],
+        }
+    return summary
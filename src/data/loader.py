@@ -1,10 +1,13 @@
 """Data loader for JSON event files with validation."""
 
+import calendar
 import json
 from pathlib import Path
 from typing import Dict, List, Tuple
 import logging
 
+import numpy as np
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,6 +19,12 @@ MONTHS = ['January', 'February', 'March', 'April', 'May', 'June',
 EXPECTED_MONTHS = 12
 VALID_DAYS_RANGE = (1, 31)
 
+# v2 schema: per-month day-count histograms instead of day lists
+SCHEMA_VERSION = 2
+ENCODINGS = ('dense', 'sparse')
+MAX_DAY_COUNT = int(np.iinfo(np.uint16).max)
+_DAYS = np.arange(VALID_DAYS_RANGE[0], VALID_DAYS_RANGE[1] + 1)
+
 
 def get_data_path(filename: str = 'events.json') -> Path:
     """Get path to data file relative to this module."""
@@ -23,12 +32,14 @@ def get_data_path(filename: str = 'events.json') -> Path:
     return current_dir.parent.parent / 'data' / 'raw' / filename
 
 
-def load_events_data(filename: str = 'events.json') -> Dict[int, List[List[int]]]:
+def load_events_data(filename: str = 'events.json',
+                     strict_dates: bool = False) -> Dict[int, List[List[int]]]:
     """
     Load event data from JSON file.
     
     Args:
         filename: Name of JSON file in data/raw/
+        strict_dates: Reject days that do not exist in their month
         
     Returns:
         Dictionary with year as key and list of monthly events as value
@@ -39,46 +50,136 @@ def load_events_data(filename: str = 'events.json') -> Dict[int, List[List[int]]
         ValueError: If data validation fails
     """
     data_path = get_data_path(filename)
+    data_by_year = parse_events(read_events_file(data_path), strict_dates=strict_dates)
     
+    logger.info(f"Loaded data for years: {sorted(data_by_year.keys())}")
+    return data_by_year
+
+
+def read_events_file(data_path: Path) -> Dict:
+    """
+    Read a raw events JSON file.
+    
+    Args:
+        data_path: Path to the JSON file
+        
+    Returns:
+        Parsed JSON payload
+        
+    Raises:
+        FileNotFoundError: If data file not found
+        json.JSONDecodeError: If JSON is malformed
+    """
     if not data_path.exists():
         raise FileNotFoundError(f"Data file not found: {data_path}")
     
     try:
         with open(data_path, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
+            return json.load(f)
     except json.JSONDecodeError as e:
-        raise json.JSONDecodeError(f"Invalid JSON in {filename}: {e.msg}", e.doc, e.pos)
+        raise json.JSONDecodeError(f"Invalid JSON in {data_path.name}: {e.msg}", e.doc, e.pos)
+
+
+def parse_events(raw_data: Dict, strict_dates: bool = False) -> Dict[int, List[List[int]]]:
+    """
+    Extract and validate the events of a raw JSON payload.
     
-    # Extract events and validate
+    Both schemas are accepted; v2 day counts are expanded to sorted day
+    lists. Years failing validation are skipped with a warning.
+    
+    Args:
+        raw_data: Parsed JSON payload with an 'events' key
+        strict_dates: Reject days that do not exist in their month
+        
+    Returns:
+        Dictionary with year as key and list of monthly events as value
+        
+    Raises:
+        ValueError: If the payload has no 'events' key
+    """
     if 'events' not in raw_data:
         raise ValueError("JSON must contain 'events' key")
     
+    if schema_version(raw_data) != 1:
+        counts_by_year = parse_event_counts(raw_data, strict_dates=strict_dates)
+        return {year: expand_counts(counts) for year, counts in counts_by_year.items()}
+    
     events = raw_data['events']
     data_by_year = {}
     
     for year_str, monthly_data in events.items():
         try:
             year = int(year_str)
-            validated_data = validate_data(monthly_data, year)
+            validated_data = validate_data(monthly_data, year, strict_dates=strict_dates)
             data_by_year[year] = validated_data
         except (ValueError, TypeError) as e:
             logger.warning(f"Skipping year {year_str}: {e}")
             continue
     
-    logger.info(f"Loaded data for years: {sorted(data_by_year.keys())}")
     return data_by_year
 
 
-def validate_data(data: List[List[int]], year: int = None) -> List[List[int]]:
+class YearEvents(list):
+    """
+    Monthly events of one year together with its observed-months mask.
+    
+    Behaves exactly like the plain list of 12 months; months that were not
+    observed (e.g. the rest of the current year) are empty lists and marked
+    False in `observed`, so masked statistics can tell them apart from
+    months with zero events.
+    
+    Attributes:
+        observed: One flag per month, True if the month was recorded
+    """
+    
+    def __init__(self, months: List[List[int]], observed=None):
+        """
+        Args:
+            months: List of monthly day lists
+            observed: One flag per month (default: all observed)
+        """
+        super().__init__(months)
+        self.observed = tuple(bool(flag) for flag in observed) if observed is not None else (True,) * len(self)
+        if len(self.observed) != len(self):
+            raise ValueError(f"Expected {len(self)} observed flags, got {len(self.observed)}")
+
+
+def observed_mask(data: List[List[int]]) -> np.ndarray:
+    """
+    Observed-months mask of one year.
+    
+    Args:
+        data: Monthly events (plain lists count as fully observed)
+        
+    Returns:
+        Boolean array with one flag per month
+    """
+    return np.array(getattr(data, 'observed', (True,) * len(data)), dtype=bool)
+
+
+def is_complete(data: List[List[int]]) -> bool:
+    """Whether every month of a year was observed."""
+    return all(getattr(data, 'observed', ()))
+
+
+def validate_data(data: List[List[int]], year: int = None,
+                  strict_dates: bool = False) -> List[List[int]]:
     """
     Validate event data structure.
     
+    Partial years are accepted: a month given as null was not observed,
+    and a year with fewer than 12 months is observed up to its last month.
+    
     Args:
-        data: List of 12 months, each containing day numbers
+        data: List of up to 12 months, each containing day numbers (or
+            None for an unobserved month)
         year: Year being validated (for error messages)
+        strict_dates: Also reject days past the end of their month
+            (e.g. February 30); requires the year
         
     Returns:
-        Validated data (same structure)
+        YearEvents with 12 months (unobserved months empty) and the
+        observed-months mask
         
     Raises:
         ValueError: If validation fails
@@ -88,15 +189,27 @@ def validate_data(data: List[List[int]], year: int = None) -> List[List[int]]:
     if not isinstance(data, list):
         raise ValueError(f"{year_str}Data must be a list of months")
     
-    if len(data) != EXPECTED_MONTHS:
-        raise ValueError(f"{year_str}Expected {EXPECTED_MONTHS} months, got {len(data)}")
+    if not 1 <= len(data) <= EXPECTED_MONTHS:
+        raise ValueError(f"{year_str}Expected 1 to {EXPECTED_MONTHS} months, got {len(data)}")
+    
+    observed = [month is not None for month in data] + [False] * (EXPECTED_MONTHS - len(data))
+    if not any(observed):
+        raise ValueError(f"{year_str}No observed months")
     
     validated = []
     for month_idx, month_data in enumerate(data):
+        if month_data is None:
+            validated.append([])
+            continue
+        
         if not isinstance(month_data, list):
             raise ValueError(f"{year_str}Month {month_idx + 1} must be a list")
         
         # Validate each day
+        last_day = VALID_DAYS_RANGE[1]
+        if strict_dates and year:
+            last_day = calendar.monthrange(year, month_idx + 1)[1]
+        
         validated_month = []
         for day in month_data:
             if not isinstance(day, int):
@@ -108,11 +221,252 @@ def validate_data(data: List[List[int]], year: int = None) -> List[List[int]]:
                     f"{VALID_DAYS_RANGE[0]}-{VALID_DAYS_RANGE[1]}"
                 )
             
+            if day > last_day:
+                raise ValueError(f"{year_str}{MONTHS[month_idx]} has no day {day}")
+            
             validated_month.append(day)
         
         validated.append(validated_month)
     
-    return validated
+    validated.extend([] for _ in range(EXPECTED_MONTHS - len(data)))
+    return YearEvents(validated, observed)
+
+
+def schema_version(raw_data: Dict) -> int:
+    """Schema version of a raw JSON payload (files without one are v1)."""
+    return raw_data.get('schema_version', 1)
+
+
+def load_event_counts(filename: str = 'events.json',
+                      strict_dates: bool = False) -> Dict[int, np.ndarray]:
+    """
+    Load event data as per-month day-count histograms.
+    
+    For v2 files, loading and validation never touch individual events.
+    
+    Args:
+        filename: Name of JSON file in data/raw/ (v1 or v2 schema)
+        strict_dates: Reject days that do not exist in their month
+        
+    Returns:
+        Dictionary with year as key and a (12 x 31) uint16 count array as value
+        
+    Raises:
+        FileNotFoundError: If data file not found
+        json.JSONDecodeError: If JSON is malformed
+        ValueError: If data validation fails
+    """
+    return parse_event_counts(read_events_file(get_data_path(filename)), strict_dates=strict_dates)
+
+
+def parse_event_counts(raw_data: Dict, strict_dates: bool = False) -> Dict[int, np.ndarray]:
+    """
+    Extract and validate the events of a raw JSON payload as day counts.
+    
+    Years failing validation are skipped with a warning.
+    
+    Args:
+        raw_data: Parsed JSON payload (v1 or v2 schema)
+        strict_dates: Reject days that do not exist in their month
+        
+    Returns:
+        Dictionary with year as key and a (12 x 31) uint16 count array as value
+        
+    Raises:
+        ValueError: If the payload has no 'events' key, or an unknown
+            schema version or encoding
+    """
+    if 'events' not in raw_data:
+        raise ValueError("JSON must contain 'events' key")
+    
+    version = schema_version(raw_data)
+    encoding = raw_data.get('encoding', 'dense')
+    if version not in (1, SCHEMA_VERSION):
+        raise ValueError(f"Unsupported schema_version {version!r}")
+    if version == SCHEMA_VERSION and encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding {encoding!r}, expected one of {ENCODINGS}")
+    
+    counts_by_year = {}
+    for year_str, payload in raw_data['events'].items():
+        try:
+            year = int(year_str)
+            if version == 1:
+                counts = month_counts(validate_data(payload, year, strict_dates=strict_dates))
+            else:
+                counts = decode_counts(payload, encoding, year)
+            counts_by_year[year] = validate_counts(counts, year, strict_dates=strict_dates)
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Skipping year {year_str}: {e}")
+            continue
+    
+    return counts_by_year
+
+
+def month_counts(data: List[List[int]]) -> np.ndarray:
+    """
+    Histogram validated monthly day lists into day counts.
+    
+    Args:
+        data: List of 12 months, each containing day numbers
+        
+    Returns:
+        (12 x 31) int64 array, [month, day - 1] -> number of events; a
+        masked array with the rows of unobserved months masked for
+        partial years
+    """
+    n_days = VALID_DAYS_RANGE[1]
+    sizes = [len(month) for month in data]
+    month_idx = np.repeat(np.arange(len(data)), sizes)
+    days = np.fromiter((day for month in data for day in month), dtype=np.int64, count=sum(sizes))
+    flat = np.bincount(month_idx * n_days + days - 1, minlength=len(data) * n_days)
+    return _mask_months(flat.reshape(len(data), n_days), observed_mask(data))
+
+
+def _mask_months(counts: np.ndarray, observed: np.ndarray) -> np.ndarray:
+    """Mask the rows of unobserved months (plain array if all are observed)."""
+    if observed.all():
+        return counts
+    return np.ma.masked_array(counts, mask=np.broadcast_to(~observed[:, None], counts.shape))
+
+
+def counts_observed(counts: np.ndarray) -> np.ndarray:
+    """Observed-months mask of (12 x 31) day counts."""
+    return ~np.ma.getmaskarray(counts).any(axis=1)
+
+
+def expand_counts(counts: np.ndarray) -> List[List[int]]:
+    """Expand (12 x 31) day counts into sorted monthly day lists (YearEvents)."""
+    rows = np.ma.getdata(counts)
+    return YearEvents([np.repeat(_DAYS, row).tolist() for row in rows], counts_observed(counts))
+
+
+def decode_counts(payload: List, encoding: str, year: int = None) -> np.ndarray:
+    """
+    Decode the v2 payload of one year into day counts.
+    
+    Args:
+        payload: 'dense': up to 12 lists of 31 counts; 'sparse': up to 12
+            lists of [day, count] pairs (repeated days are summed). Months
+            given as null, and months past the end of a short payload, were
+            not observed
+        encoding: 'dense' or 'sparse'
+        year: Year being decoded (for error messages)
+        
+    Returns:
+        (12 x 31) integer array (unvalidated counts), masked for partial years
+        
+    Raises:
+        ValueError: If the payload does not have the expected shape
+    """
+    year_str = f"Year {year}: " if year else ""
+    n_days = VALID_DAYS_RANGE[1]
+    
+    if not isinstance(payload, list) or not 1 <= len(payload) <= EXPECTED_MONTHS:
+        raise ValueError(f"{year_str}Expected 1 to {EXPECTED_MONTHS} months of day counts")
+    
+    payload = payload + [None] * (EXPECTED_MONTHS - len(payload))
+    observed = np.array([month is not None for month in payload])
+    if not observed.any():
+        raise ValueError(f"{year_str}No observed months")
+    
+    if encoding == 'dense':
+        try:
+            counts = np.asarray([month if month is not None else [0] * n_days for month in payload])
+        except ValueError:
+            counts = None
+        if counts is None or counts.shape != (EXPECTED_MONTHS, n_days):
+            raise ValueError(f"{year_str}Dense counts must be {EXPECTED_MONTHS} lists of {n_days} counts")
+        if counts.dtype.kind not in 'iu':
+            raise ValueError(f"{year_str}Dense counts must be integers")
+        return _mask_months(counts, observed)
+    
+    counts = np.zeros((EXPECTED_MONTHS, n_days), dtype=np.int64)
+    for month_idx, pairs in enumerate(payload):
+        if pairs is None:
+            continue
+        if not isinstance(pairs, list):
+            raise ValueError(f"{year_str}Month {month_idx + 1} must be a list of [day, count] pairs")
+        if not pairs:
+            continue
+        
+        try:
+            pairs = np.asarray(pairs)
+        except ValueError:
+            pairs = None
+        if pairs is None or pairs.ndim != 2 or pairs.shape[1] != 2 or pairs.dtype.kind not in 'iu':
+            raise ValueError(f"{year_str}Month {month_idx + 1} must be a list of [day, count] pairs")
+        
+        days, values = pairs[:, 0], pairs[:, 1]
+        out_of_range = (days < VALID_DAYS_RANGE[0]) | (days > VALID_DAYS_RANGE[1])
+        if out_of_range.any():
+            raise ValueError(
+                f"{year_str}Month {month_idx + 1} day {days[out_of_range][0]} out of range "
+                f"{VALID_DAYS_RANGE[0]}-{VALID_DAYS_RANGE[1]}"
+            )
+        np.add.at(counts[month_idx], days - 1, values)
+    
+    return _mask_months(counts, observed)
+
+
+def validate_counts(counts: np.ndarray, year: int = None,
+                    strict_dates: bool = False) -> np.ndarray:
+    """
+    Validate (12 x 31) day counts.
+    
+    Args:
+        counts: Day counts of one year
+        year: Year being validated (for error messages)
+        strict_dates: Also reject events on days past the end of their
+            month (e.g. February 30); requires the year
+        
+    Returns:
+        Counts as uint16 array
+        
+    Raises:
+        ValueError: If validation fails
+    """
+    year_str = f"Year {year}: " if year else ""
+    
+    if (counts < 0).any():
+        raise ValueError(f"{year_str}Day counts must be non-negative")
+    
+    if (counts > MAX_DAY_COUNT).any():
+        raise ValueError(f"{year_str}Day counts above {MAX_DAY_COUNT} are not supported")
+    
+    if strict_dates and year:
+        lengths = np.array([calendar.monthrange(year, month)[1] for month in range(1, EXPECTED_MONTHS + 1)])
+        impossible = np.argwhere((counts > 0) & (_DAYS > lengths[:, None]))
+        if len(impossible):
+            month_idx, day_idx = impossible[0]
+            raise ValueError(f"{year_str}{MONTHS[month_idx]} has no day {day_idx + 1}")
+    
+    return counts.astype(np.uint16)
+
+
+def encode_counts(counts: np.ndarray, encoding: str = 'dense') -> List:
+    """
+    Encode the day counts of one year as a v2 payload.
+    
+    Args:
+        counts: (12 x 31) day counts (masked rows are unobserved months)
+        encoding: 'dense' (31 counts per month) or 'sparse' ([day, count]
+            pairs of the days with events)
+        
+    Returns:
+        JSON-serializable list of 12 months, None for unobserved months
+        
+    Raises:
+        ValueError: If the encoding is unknown
+    """
+    observed = counts_observed(counts)
+    rows = np.ma.getdata(counts)
+    if encoding == 'dense':
+        months = rows.tolist()
+    elif encoding == 'sparse':
+        months = [np.column_stack((_DAYS[row > 0], row[row > 0])).tolist() for row in rows]
+    else:
+        raise ValueError(f"Unknown encoding {encoding!r}, expected one of {ENCODINGS}")
+    return [month if flag else None for month, flag in zip(months, observed)]
 
 
 def get_data_by_year(data: Dict[int, List[List[int]]], year: int) -> List[List[int]]:
@@ -157,25 +511,68 @@ def get_month_name(month_index: int) -> str:
     return MONTHS[month_index]
 
 
-def export_to_json(data: Dict[int, List[List[int]]], output_path: Path) -> None:
+def export_to_json(data: Dict[int, List[List[int]]], output_path: Path,
+                   schema_version: int = 1, encoding: str = 'dense',
+                   metadata: Dict = None) -> None:
     """
     Export data to JSON file.
     
     Args:
-        data: Data dictionary
+        data: Data dictionary (monthly day lists, or (12 x 31) day counts
+            as returned by load_event_counts)
         output_path: Path where to save JSON
+        schema_version: 1 (day lists) or 2 (day-count histograms)
+        encoding: v2 encoding, 'dense' or 'sparse'
+        metadata: Metadata block to write (default: generic description)
+        
+    Raises:
+        ValueError: If the schema version or encoding is unknown
     """
-    output = {
-        'metadata': {
+    if metadata is None:
+        metadata = {
             'description': 'Daily events data collected on a specific day of each month',
             'event_type': 'recurring_monthly_event'
-        },
-        'events': {str(year): monthly_data for year, monthly_data in data.items()}
-    }
+        }
+    
+    if schema_version == 1:
+        output = {
+            'metadata': metadata,
+            'events': {str(year): _encode_months(expand_counts(monthly_data) if isinstance(monthly_data, np.ndarray)
+                                             else monthly_data) for year, monthly_data in data.items()}
+        }
+    elif schema_version == SCHEMA_VERSION:
+        output = {
+            'schema_version': SCHEMA_VERSION,
+            'encoding': encoding,
+            'metadata': metadata,
+            'events': {str(year): encode_counts(monthly_data if isinstance(monthly_data, np.ndarray)
+                                                else month_counts(monthly_data), encoding)
+                       for year, monthly_data in data.items()}
+        }
+    else:
+        raise ValueError(f"Unsupported schema_version {schema_version!r}")
     
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+        if schema_version == 1:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+        else:
+            # One line per year: indenting would put every count on its own line
+            f.write(_dump_v2(output))
     
     logger.info(f"Data exported to {output_path}")
+
+
+def _encode_months(data: List[List[int]]) -> List:
+    """v1 payload of one year: day lists, None for unobserved months."""
+    return [month if flag else None for month, flag in zip(data, observed_mask(data))]
+
+
+def _dump_v2(output: Dict) -> str:
+    """Serialize a v2 payload with one line per year."""
+    header = {key: value for key, value in output.items() if key != 'events'}
+    lines = [f'  {json.dumps(year)}: {json.dumps(payload, separators=(",", ":"))}'
+             for year, payload in output['events'].items()]
+    body = json.dumps(header, indent=2, ensure_ascii=False)[:-2]
+    return body + ',\n  "events": {\n' + ',\n'.join('  ' + line for line in lines) + '\n  }\n}\n'
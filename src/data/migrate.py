@@ -0,0 +1,88 @@
+"""
+One-shot migration of v1 events files (day lists) to the v2 schema
+(per-month day-count histograms).
+
+Run from the repository root:
+
+    python -m src.data.migrate events.json events_v2.json --encoding sparse
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .loader import (ENCODINGS, SCHEMA_VERSION, counts_observed, export_to_json, get_data_path,
+                     parse_event_counts, read_events_file, schema_version)
+
+logger = logging.getLogger(__name__)
+
+
+def migrate_file(source: str, destination: Optional[str] = None, encoding: str = 'dense',
+                 strict_dates: bool = False) -> Dict:
+    """
+    Convert an events file to the v2 schema and verify the result.
+
+    Args:
+        source: v1 file in data/raw/ (or an absolute path)
+        destination: Output file (default: '<source stem>_v2.json' next to it)
+        encoding: 'dense' or 'sparse'
+        strict_dates: Reject days that do not exist in their month
+
+    Returns:
+        Dictionary with 'source', 'destination', 'years', 'events' and the
+        file sizes 'bytes_before' / 'bytes_after'
+
+    Raises:
+        ValueError: If the source is already v2 or the round trip differs
+    """
+    source_path = get_data_path(source)
+    raw_data = read_events_file(source_path)
+    if schema_version(raw_data) == SCHEMA_VERSION:
+        raise ValueError(f"{source_path} already uses schema version {SCHEMA_VERSION}")
+
+    destination_path = (get_data_path(destination) if destination
+                        else source_path.with_name(f'{source_path.stem}_v2.json'))
+    counts = parse_event_counts(raw_data, strict_dates=strict_dates)
+    export_to_json(counts, destination_path, schema_version=SCHEMA_VERSION, encoding=encoding,
+                   metadata=raw_data.get('metadata'))
+
+    migrated = parse_event_counts(read_events_file(destination_path), strict_dates=strict_dates)
+    if migrated.keys() != counts.keys() or any(
+            not np.array_equal(np.ma.getdata(migrated[y]), np.ma.getdata(counts[y]))
+            or not np.array_equal(counts_observed(migrated[y]), counts_observed(counts[y])) for y in counts):
+        raise ValueError(f"Round trip of {destination_path} does not reproduce {source_path}")
+
+    return {
+        'source': str(source_path),
+        'destination': str(destination_path),
+        'encoding': encoding,
+        'years': sorted(counts),
+        'events': int(sum(c.sum(dtype=np.int64) for c in counts.values())),
+        'bytes_before': source_path.stat().st_size,
+        'bytes_after': destination_path.stat().st_size,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Migrate a v1 events file to the v2 day-count schema.')
+    parser.add_argument('source', help='v1 JSON file in data/raw/ or an absolute path')
+    parser.add_argument('destination', nargs='?', help="Output file (default: '<source>_v2.json')")
+    parser.add_argument('--encoding', choices=ENCODINGS, default='dense')
+    parser.add_argument('--strict-dates', action='store_true',
+                        help='Reject days that do not exist in their month')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        force=True)
+    print(json.dumps(migrate_file(args.source, args.destination, args.encoding, args.strict_dates),
+                     indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
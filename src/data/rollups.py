@@ -0,0 +1,302 @@
+"""
+Pre-aggregated rollups of a store at several resolutions.
+
+Rollups are materialized once per year and kept up to date on append:
+
+    day           (years x 12 x 31)  events per calendar day
+    month         (years x 12)       events per month
+    quarter       (years x 4)        events per quarter
+    year          (years,)           events per year
+    day_of_month  (years x 31)       events per day of the month
+
+Rollups.query() routes each request to the coarsest rollup that can
+answer it (e.g. yearly totals from `year`, a day range across years from
+`day_of_month`), so aggregate queries cost O(result) instead of a scan of
+the raw per-month event lists.
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calendar import flatten_store
+from .loader import EXPECTED_MONTHS, observed_mask
+
+logger = logging.getLogger(__name__)
+
+N_DAYS = 31
+N_QUARTERS = 4
+
+GROUP_BY = ('total', 'year', 'quarter', 'month', 'day', 'day_of_month')
+
+ALL_MONTHS = tuple(range(1, EXPECTED_MONTHS + 1))
+ALL_DAYS = (1, N_DAYS)
+
+
+def day_counts(data_by_year: Dict[int, List[List[int]]]) -> Tuple[List[int], np.ndarray]:
+    """
+    Events per calendar day of every year.
+
+    Args:
+        data_by_year: Dictionary with year as key and monthly events as value
+
+    Returns:
+        Tuple of (sorted years, (years x 12 x 31) int64 counts)
+    """
+    sorted_years = sorted(data_by_year.keys())
+    years, months, days = flatten_store(data_by_year)
+    index = (np.searchsorted(sorted_years, years) * EXPECTED_MONTHS + months - 1) * N_DAYS + days - 1
+    flat = np.bincount(index, minlength=len(sorted_years) * EXPECTED_MONTHS * N_DAYS)
+    return sorted_years, flat.reshape(len(sorted_years), EXPECTED_MONTHS, N_DAYS)
+
+
+def _quarter_of(month: int) -> int:
+    return (month - 1) // 3 + 1
+
+
+class Rollups:
+    """
+    Materialized day/month/quarter/year/day-of-month rollups.
+
+    The day rollup is the base; coarser rollups are maintained alongside it
+    for every changed year, so appends cost O(new events) (add_events) or
+    O(one year) (set_year) rather than a rebuild.
+
+    Attributes:
+        years: Sorted years covered
+        observed: (years x 12) observed-months mask
+    """
+
+    def __init__(self, data_by_year: Optional[Dict[int, List[List[int]]]] = None):
+        """
+        Args:
+            data_by_year: Dictionary with year -> data mapping (optional)
+        """
+        self.years: List[int] = []
+        self.observed = np.zeros((0, EXPECTED_MONTHS), dtype=bool)
+        self.levels: Dict[str, np.ndarray] = {
+            'day': np.zeros((0, EXPECTED_MONTHS, N_DAYS), dtype=np.int64),
+            'month': np.zeros((0, EXPECTED_MONTHS), dtype=np.int64),
+            'quarter': np.zeros((0, N_QUARTERS), dtype=np.int64),
+            'year': np.zeros(0, dtype=np.int64),
+            'day_of_month': np.zeros((0, N_DAYS), dtype=np.int64),
+        }
+        if data_by_year:
+            self.update(data_by_year)
+
+    def _derive(self, rows) -> None:
+        """Recompute the coarser rollups of some rows from the day rollup."""
+        day = self.levels['day'][rows]
+        self.levels['month'][rows] = day.sum(axis=-1)
+        month = self.levels['month'][rows]
+        self.levels['quarter'][rows] = month.reshape(*month.shape[:-1], N_QUARTERS, 3).sum(axis=-1)
+        self.levels['year'][rows] = month.sum(axis=-1)
+        self.levels['day_of_month'][rows] = day.sum(axis=-2)
+
+    def update(self, data_by_year: Dict[int, List[List[int]]],
+               changed: Optional[Sequence[int]] = None) -> None:
+        """
+        Bring the rollups in line with a store.
+
+        Years no longer in the store are dropped; changed years and years
+        not covered yet are rebuilt.
+
+        Args:
+            data_by_year: Dictionary with year -> data mapping
+            changed: Years whose data changed (default: every year of the store)
+        """
+        for year in [y for y in self.years if y not in data_by_year]:
+            self.remove_year(year)
+        dirty = set(data_by_year) if changed is None else set(changed) | (set(data_by_year) - set(self.years))
+        self._fill({year: data_by_year[year] for year in dirty if year in data_by_year})
+
+    def set_year(self, year: int, data: List[List[int]]) -> None:
+        """
+        Add or replace one year.
+
+        Args:
+            year: Year
+            data: List of 12 months with daily events
+        """
+        self._fill({year: data})
+
+    def _fill(self, data_by_year: Dict[int, List[List[int]]]) -> None:
+        """Rebuild the rows of some years, inserting years not covered yet."""
+        if not data_by_year:
+            return
+        new_years = sorted(set(data_by_year) - set(self.years))
+        if new_years:
+            positions = np.searchsorted(self.years, new_years)
+            for name, array in self.levels.items():
+                self.levels[name] = np.insert(array, positions, 0, axis=0)
+            self.observed = np.insert(self.observed, positions, False, axis=0)
+            self.years = sorted(self.years + new_years)
+
+        years, counts = day_counts(data_by_year)
+        rows = np.searchsorted(self.years, years)
+        self.levels['day'][rows] = counts
+        self.observed[rows] = [observed_mask(data_by_year[year]) for year in years]
+        self._derive(rows)
+
+    def remove_year(self, year: int) -> None:
+        """
+        Drop one year.
+
+        Args:
+            year: Year
+
+        Raises:
+            KeyError: If the year is not covered
+        """
+        row = self._row(year)
+        for name, array in self.levels.items():
+            self.levels[name] = np.delete(array, row, axis=0)
+        self.observed = np.delete(self.observed, row, axis=0)
+        self.years.pop(row)
+
+    def add_events(self, year: int, month: int, days: Sequence[int]) -> None:
+        """
+        Append events to one month of a covered year.
+
+        Args:
+            year: Year
+            month: Month (1-12)
+            days: Days (1-31) of the new events
+
+        Raises:
+            KeyError: If the year is not covered
+        """
+        row = self._row(year)
+        added = np.bincount(np.asarray(days, dtype=np.int64), minlength=N_DAYS + 1)[1:]
+        self.levels['day'][row, month - 1] += added
+        self.levels['month'][row, month - 1] += added.sum()
+        self.levels['quarter'][row, _quarter_of(month) - 1] += added.sum()
+        self.levels['year'][row] += added.sum()
+        self.levels['day_of_month'][row] += added
+        self.observed[row, month - 1] = True
+
+    def _row(self, year: int) -> int:
+        row = int(np.searchsorted(self.years, year))
+        if row == len(self.years) or self.years[row] != year:
+            raise KeyError(f"Year {year} not available. Available years: {self.years}")
+        return row
+
+    @staticmethod
+    def plan(group_by: str = 'year', months: Optional[Sequence[int]] = None,
+             days: Optional[Tuple[int, int]] = None) -> str:
+        """
+        Choose the coarsest rollup that answers a query.
+
+        Args:
+            group_by: One of GROUP_BY
+            months: Months (1-12) to include (default: all)
+            days: Inclusive (first, last) day-of-month range (default: all)
+
+        Returns:
+            Rollup name
+
+        Raises:
+            ValueError: If group_by is unknown
+        """
+        if group_by not in GROUP_BY:
+            raise ValueError(f"Unknown group_by {group_by!r}, expected one of {GROUP_BY}")
+        month_filter = months is not None and tuple(sorted(set(months))) != ALL_MONTHS
+        day_filter = days is not None and tuple(days) != ALL_DAYS
+
+        if group_by == 'day' or (day_filter and (month_filter or group_by in ('month', 'quarter'))):
+            return 'day'
+        if day_filter or group_by == 'day_of_month':
+            return 'day_of_month' if not month_filter else 'day'
+        if group_by == 'month':
+            return 'month'
+        if month_filter:
+            quarters = {_quarter_of(m) for m in months}
+            whole = sorted(months) == sorted(m for q in quarters for m in range(3 * q - 2, 3 * q + 1))
+            return 'quarter' if whole else 'month'
+        return 'quarter' if group_by == 'quarter' else 'year'
+
+    def query(self, group_by: str = 'year', years: Optional[Tuple[int, int]] = None,
+              months: Optional[Sequence[int]] = None, days: Optional[Tuple[int, int]] = None) -> Dict:
+        """
+        Aggregate event counts from the coarsest sufficient rollup.
+
+        Unobserved months count as zero in sums and are reported as None in
+        month-level rows.
+
+        Args:
+            group_by: 'total', 'year', 'quarter', 'month', 'day' or 'day_of_month'
+                (across the selected years)
+            years: Inclusive (first, last) year range (default: all years)
+            months: Months (1-12) to include (default: all)
+            days: Inclusive (first, last) day-of-month range (default: all)
+
+        Returns:
+            Dictionary with 'group_by', 'source' (rollup used), 'rows' (one
+            dictionary per group, empty for 'total') and 'total'
+
+        Raises:
+            ValueError: If group_by is unknown or a filter is out of range
+        """
+        source = self.plan(group_by, months, days)
+        month_sel = np.array(sorted(set(months)) if months is not None else ALL_MONTHS) - 1
+        first_day, last_day = days if days is not None else ALL_DAYS
+        if not (1 <= first_day <= last_day <= N_DAYS and 0 <= month_sel.min() <= month_sel.max() < EXPECTED_MONTHS):
+            raise ValueError(f"Filters out of range: months={months}, days={days}")
+        day_sel = slice(first_day - 1, last_day)
+
+        lo, hi = 0, len(self.years)
+        if years is not None:
+            lo = int(np.searchsorted(self.years, years[0], side='left'))
+            hi = int(np.searchsorted(self.years, years[1], side='right'))
+        selected = self.years[lo:hi]
+        data = self.levels[source][lo:hi]
+
+        if source == 'year':
+            per_year = data
+        elif source == 'quarter':
+            quarter_sel = sorted({_quarter_of(int(m) + 1) - 1 for m in month_sel})
+            data = data[:, quarter_sel]
+            per_year = data.sum(axis=1)
+        elif source == 'month':
+            data = data[:, month_sel]
+            per_year = data.sum(axis=1)
+        elif source == 'day_of_month':
+            data = data[:, day_sel]
+            per_year = data.sum(axis=1)
+        else:
+            data = data[:, month_sel, day_sel]
+            per_year = data.sum(axis=(1, 2))
+
+        rows = []
+        if group_by == 'year':
+            rows = [{'year': y, 'total': int(t)} for y, t in zip(selected, per_year)]
+        elif group_by == 'quarter':
+            quarters = sorted({int(_quarter_of(int(m) + 1)) for m in month_sel})
+            if source == 'quarter':
+                by_quarter = data
+            else:
+                monthly = data if source == 'month' else data.sum(axis=2)
+                by_quarter = np.stack([monthly[:, [i for i, m in enumerate(month_sel) if _quarter_of(m + 1) == q]]
+                                       .sum(axis=1) for q in quarters], axis=1)
+            rows = [{'year': y, 'quarter': q, 'total': int(by_quarter[i, j])}
+                    for i, y in enumerate(selected) for j, q in enumerate(quarters)]
+        elif group_by == 'month':
+            monthly = data if source == 'month' else data.sum(axis=2)
+            observed = self.observed[lo:hi][:, month_sel]
+            rows = [{'year': y, 'month': int(m) + 1, 'total': int(monthly[i, j]) if observed[i, j] else None}
+                    for i, y in enumerate(selected) for j, m in enumerate(month_sel)]
+        elif group_by == 'day':
+            rows = [{'year': y, 'month': int(m) + 1, 'day': first_day + k, 'total': int(data[i, j, k])}
+                    for i, y in enumerate(selected) for j, m in enumerate(month_sel)
+                    for k in range(data.shape[2])]
+        elif group_by == 'day_of_month':
+            across = data.sum(axis=0) if source == 'day_of_month' else data.sum(axis=(0, 1))
+            rows = [{'day': first_day + k, 'total': int(t)} for k, t in enumerate(across)]
+
+        return {
+            'group_by': group_by,
+            'source': source,
+            'rows': rows,
+            'total': int(per_year.sum()),
+        }
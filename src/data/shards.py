@@ -0,0 +1,235 @@
+"""Loader for datasets partitioned into many events.json-compatible shards."""
+
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .loader import YearEvents, get_data_path, observed_mask, parse_events, read_events_file
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+GLOB_CHARS = '*?['
+
+
+def is_sharded_source(source: str) -> bool:
+    """
+    Check whether a data source refers to a sharded dataset.
+
+    Args:
+        source: File name, directory or glob pattern (relative to data/raw/ or absolute)
+
+    Returns:
+        True for directories and glob patterns, False for single files
+    """
+    return any(c in str(source) for c in GLOB_CHARS) or get_data_path(source).is_dir()
+
+
+def discover_shards(source: str, manifest: Optional[str] = None) -> List[Dict]:
+    """
+    List the shards of a dataset.
+
+    Shards come from the manifest when one is given or found in the dataset
+    directory. Otherwise every *.json file under the directory (or matching
+    the glob) is a shard.
+
+    Manifest format:
+
+        {"shards": [{"path": "north/2024.json", "series": "north"}, ...]}
+
+    Shard paths in a manifest are relative to the manifest's directory.
+
+    Args:
+        source: Directory or glob pattern (relative to data/raw/ or absolute)
+        manifest: Explicit manifest path (optional)
+
+    Returns:
+        List of {'path', 'series', 'default_series'} entries sorted by path.
+        'series' comes from the manifest (None otherwise); 'default_series'
+        is the first directory below the dataset root, or the directory
+        containing the shard
+
+    Raises:
+        FileNotFoundError: If no shards are found
+    """
+    root = get_data_path(source)
+    manifest_path = Path(manifest) if manifest else root / MANIFEST_NAME
+
+    if root.is_dir() or manifest:
+        if manifest_path.is_file():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)['shards']
+            base = manifest_path.parent
+            shards = [
+                {'path': base / entry['path'], 'series': entry.get('series'),
+                 'default_series': Path(entry['path']).parent.name or base.name}
+                for entry in entries
+            ]
+        else:
+            shards = [
+                {'path': path, 'series': None, 'default_series': _series_from_path(path, root)}
+                for path in root.rglob('*.json')
+                if path.name != MANIFEST_NAME
+            ]
+    else:
+        shards = [
+            {'path': Path(path), 'series': None, 'default_series': Path(path).parent.name}
+            for path in glob.glob(str(root), recursive=True)
+            if Path(path).name != MANIFEST_NAME
+        ]
+
+    if not shards:
+        raise FileNotFoundError(f"No shards found for {source}")
+
+    return sorted(shards, key=lambda s: str(s['path']))
+
+
+def _series_from_path(path: Path, root: Path) -> str:
+    """Use the first directory below the dataset root (or the root) as the series name."""
+    relative = path.relative_to(root)
+    return relative.parts[0] if len(relative.parts) > 1 else root.name
+
+
+def _load_shard(shard: Dict) -> Tuple[str, Dict[int, List[List[int]]], float]:
+    """
+    Parse and validate one shard (runs in a worker process).
+
+    The series is taken from the manifest, then from the shard metadata
+    ('series' or 'region'), then from the shard's directory.
+
+    Returns:
+        Tuple of (series, data by year, parse time in seconds)
+    """
+    start = time.perf_counter()
+    path = Path(shard['path'])
+    raw_data = read_events_file(path)
+    metadata = raw_data.get('metadata', {})
+    series = (shard['series'] or metadata.get('series') or metadata.get('region')
+              or shard['default_series'])
+    data_by_year = parse_events(raw_data)
+    return series, data_by_year, time.perf_counter() - start
+
+
+def _load_all(shards: List[Dict], workers: int) -> List[Tuple]:
+    """Load shards in input order, in-process or with a process pool."""
+    if workers == 1:
+        return [_load_shard(shard) for shard in shards]
+    chunksize = max(1, len(shards) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_load_shard, shards, chunksize=chunksize))
+
+
+def load_sharded_dataset(source: str, manifest: Optional[str] = None,
+                         workers: Optional[int] = None,
+                         measure_speedup: bool = False
+                         ) -> Tuple[Dict[str, Dict[int, List[List[int]]]], Dict]:
+    """
+    Load a sharded dataset into one store with a series dimension.
+
+    Shards are parsed and validated in a process pool and merged in sorted
+    shard-path order, so the result does not depend on completion order.
+
+    Args:
+        source: Directory or glob pattern (relative to data/raw/ or absolute)
+        manifest: Explicit manifest path (optional)
+        workers: Number of worker processes (default: CPU count; 1 = in-process)
+        measure_speedup: Also load every shard in-process first and report
+            the measured speedup of the parallel load over it
+
+    Returns:
+        Tuple of (store, report). The store maps series -> year -> monthly
+        data, with series and years sorted. The report has shard count,
+        workers, wall time, summed per-shard parse time, their ratio as
+        'parallelism' and, with measure_speedup, the serial wall time and
+        measured 'speedup'.
+
+    Raises:
+        ValueError: If two shards provide the same year of the same series
+    """
+    shards = discover_shards(source, manifest)
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(shards))
+
+    serial_wall = None
+    if measure_speedup:
+        start = time.perf_counter()
+        _load_all(shards, 1)
+        serial_wall = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = _load_all(shards, workers)
+    wall = time.perf_counter() - start
+
+    merged: Dict[str, Dict[int, List[List[int]]]] = {}
+    origin: Dict[Tuple[str, int], Path] = {}
+    for shard, (series, data_by_year, _) in zip(shards, results):
+        target = merged.setdefault(series, {})
+        for year, data in data_by_year.items():
+            if year in target:
+                raise ValueError(
+                    f"Series {series} year {year} found in both "
+                    f"{origin[(series, year)]} and {shard['path']}"
+                )
+            target[year] = data
+            origin[(series, year)] = shard['path']
+
+    store = {
+        series: {year: merged[series][year] for year in sorted(merged[series])}
+        for series in sorted(merged)
+    }
+
+    shard_time = sum(elapsed for _, _, elapsed in results)
+    report = {
+        'shards': len(shards),
+        'series': len(store),
+        'workers': workers,
+        'wall_s': round(wall, 4),
+        'shard_time_s': round(shard_time, 4),
+        'parallelism': round(shard_time / wall, 2) if wall else None,
+    }
+    if serial_wall is not None:
+        report['serial_wall_s'] = round(serial_wall, 4)
+        report['speedup'] = round(serial_wall / wall, 2) if wall else None
+
+    speedup = f", speedup x{report['speedup']}" if 'speedup' in report else ''
+    logger.info(
+        f"Loaded {report['shards']} shards ({report['series']} series) with "
+        f"{workers} workers in {report['wall_s']}s "
+        f"(parallelism x{report['parallelism']}{speedup})"
+    )
+    return store, report
+
+
+def combine_series(store: Dict[str, Dict[int, List[List[int]]]]) -> Dict[int, List[List[int]]]:
+    """
+    Merge all series into a single year -> monthly data mapping.
+
+    Events of the same year and month are pooled and kept sorted. A pooled
+    month is observed if any series observed it.
+
+    Args:
+        store: Series -> year -> monthly data mapping
+
+    Returns:
+        Dictionary with year as key and pooled monthly events as value
+    """
+    combined: Dict[int, List[List[int]]] = {}
+    observed: Dict[int, np.ndarray] = {}
+    for series_data in store.values():
+        for year, data in series_data.items():
+            months = combined.setdefault(year, [[] for _ in data])
+            observed[year] = observed.get(year, False) | observed_mask(data)
+            for month_idx, month in enumerate(data):
+                months[month_idx].extend(month)
+
+    return {
+        year: YearEvents([sorted(month) for month in combined[year]], observed[year])
+        for year in sorted(combined)
+    }
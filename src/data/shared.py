@@ -0,0 +1,401 @@
+"""
+Packed event stores shared between processes: in shared memory or in a
+memory-mapped file.
+
+A store is packed into four flat arrays (a CSR layout of the events):
+
+    years     (Y,)         int64  sorted years
+    observed  (Y, 12)      bool   observed-months mask
+    offsets   (Y * 12 + 1) int64  start of every (year, month) in `days`
+    days      (N,)         uint8  day of every event, month by month
+
+SharedStore keeps the arrays in one multiprocessing.shared_memory block;
+MappedStore keeps them in a file (a JSON header followed by the arrays)
+that is memory-mapped read-only, so stores larger than RAM are paged in
+on demand. Both handles pickle as a few hundred bytes (the block name or
+the file path), so workers attach to the same memory instead of
+receiving a copy of the store.
+"""
+
+import abc
+import json
+import logging
+import mmap
+import os
+import sys
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .loader import EXPECTED_MONTHS, YearEvents, observed_mask
+
+logger = logging.getLogger(__name__)
+
+_ALIGNMENT = 8
+
+# MappedStore files start with the magic string and a JSON spec padded to
+# one page, so the arrays that follow are page aligned
+MAGIC = b'EVSTORE1'
+HEADER_SIZE = 4096
+
+
+def pack_store(data_by_year: Dict[int, List[List[int]]]) -> Dict[str, np.ndarray]:
+    """
+    Pack a year -> months mapping into flat arrays.
+
+    Args:
+        data_by_year: Dictionary with year as key and monthly events as value
+            (12 months per year)
+
+    Returns:
+        Dictionary with the 'years', 'observed', 'offsets' and 'days' arrays
+    """
+    years = sorted(data_by_year.keys())
+    months = [month for year in years for month in data_by_year[year]]
+    sizes = np.fromiter((len(month) for month in months), dtype=np.int64, count=len(months))
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+    days = np.fromiter((day for month in months for day in month), dtype=np.uint8, count=int(offsets[-1]))
+    observed = np.array([observed_mask(data_by_year[year]) for year in years], dtype=bool)
+    return {
+        'years': np.array(years, dtype=np.int64),
+        'observed': observed.reshape(len(years), EXPECTED_MONTHS),
+        'offsets': offsets,
+        'days': days,
+    }
+
+
+def unpack_store(arrays: Dict[str, np.ndarray]) -> Dict[int, List[List[int]]]:
+    """
+    Rebuild the year -> months mapping from packed arrays.
+
+    Args:
+        arrays: Output of pack_store (or views of it)
+
+    Returns:
+        Dictionary with year as key and YearEvents as value
+    """
+    bounds = arrays['offsets'].tolist()
+    days = arrays['days'].tolist()
+    result = {}
+    for i, year in enumerate(arrays['years'].tolist()):
+        cells = range(i * EXPECTED_MONTHS, (i + 1) * EXPECTED_MONTHS)
+        result[year] = YearEvents([days[bounds[c]:bounds[c + 1]] for c in cells], arrays['observed'][i])
+    return result
+
+
+def _layout(fields: Dict[str, Tuple[str, Tuple[int, ...]]]) -> Dict:
+    """Byte offsets, dtypes and shapes of arrays stored back to back."""
+    layout, size = {}, 0
+    for name, (dtype, shape) in fields.items():
+        size = -(-size // _ALIGNMENT) * _ALIGNMENT
+        layout[name] = {'offset': size, 'dtype': np.dtype(dtype).str, 'shape': list(shape)}
+        size += np.dtype(dtype).itemsize * int(np.prod(shape))
+    return {'fields': layout, 'size': max(size, 1)}
+
+
+def _array_fields(arrays: Dict[str, np.ndarray]) -> Dict[str, Tuple[str, Tuple[int, ...]]]:
+    return {name: (array.dtype.str, array.shape) for name, array in arrays.items()}
+
+
+class _PackedStore(abc.ABC):
+    """Read access shared by SharedStore and MappedStore (views of packed arrays)."""
+
+    def __init__(self, buffer, spec: Dict, base: int = 0):
+        self.spec = spec
+        # frombuffer holds a buffer export, so the memory cannot be unmapped
+        # under a live view (close() reports it instead of crashing)
+        self._arrays = {
+            name: np.frombuffer(buffer, dtype=np.dtype(field['dtype']), count=int(np.prod(field['shape'])),
+                                offset=base + field['offset']).reshape(field['shape'])
+            for name, field in spec['fields'].items()
+        }
+
+    def __del__(self):
+        # Handles dropped without close() (e.g. unpickled in a worker task)
+        # must release their views before the memory's own finalizer runs
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Zero-copy views of the packed arrays (see pack_store)."""
+        return self._arrays
+
+    @property
+    def years(self) -> List[int]:
+        """Sorted years of the store."""
+        return self._arrays['years'].tolist()
+
+    def month(self, year: int, month: int) -> np.ndarray:
+        """
+        Days of the events of one month (zero-copy view).
+
+        Args:
+            year: Year
+            month: Month (1-12)
+
+        Returns:
+            uint8 array of days
+
+        Raises:
+            KeyError: If the year is not in the store
+        """
+        index = np.searchsorted(self._arrays['years'], year)
+        if index == len(self._arrays['years']) or self._arrays['years'][index] != year:
+            raise KeyError(f"Year {year} not available. Available years: {self.years}")
+        cell = index * EXPECTED_MONTHS + month - 1
+        offsets = self._arrays['offsets']
+        return self._arrays['days'][offsets[cell]:offsets[cell + 1]]
+
+    def monthly_counts(self) -> np.ndarray:
+        """(years x 12) events per month, computed from the offsets."""
+        return np.diff(self._arrays['offsets']).reshape(-1, EXPECTED_MONTHS)
+
+    def to_dict(self) -> Dict[int, List[List[int]]]:
+        """Materialize the store as the usual year -> months mapping (copy)."""
+        return unpack_store(self._arrays)
+
+    def close(self) -> None:
+        """Release this handle's views and its mapping."""
+        if getattr(self, '_arrays', None) is None:
+            return
+        self._arrays = None
+        try:
+            self._unmap()
+        except BufferError:
+            # Views handed out by month()/arrays are still alive; the mapping
+            # is released when they are garbage collected
+            logger.warning(f"Views of {self} still in use; unmapping deferred")
+
+    @abc.abstractmethod
+    def _unmap(self) -> None:
+        """Release the underlying memory mapping."""
+
+
+class SharedStore(_PackedStore):
+    """
+    Handle on an event store held in shared memory.
+
+    The creating process owns the block: closing the owner's handle (or
+    leaving its `with` block, or dropping it) unlinks it. Handles attached
+    by name only unmap their view. Arrays returned by the handle are
+    zero-copy views and become invalid once the handle is closed.
+
+    Attributes:
+        spec: Picklable layout (block name and array fields)
+        owner: Whether this handle created (and will unlink) the block
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, spec: Dict, owner: bool):
+        self._shm = shm
+        self._pid = os.getpid()
+        self.owner = owner
+        super().__init__(shm.buf, spec)
+
+    def __repr__(self) -> str:
+        return f'SharedStore({self.name!r})'
+
+    @classmethod
+    def create(cls, data_by_year: Dict[int, List[List[int]]], name: Optional[str] = None) -> 'SharedStore':
+        """
+        Publish a store in a new shared-memory block.
+
+        Args:
+            data_by_year: Dictionary with year as key and monthly events as value
+            name: Block name (default: generated)
+
+        Returns:
+            Owning handle
+        """
+        arrays = pack_store(data_by_year)
+        layout = _layout(_array_fields(arrays))
+        shm = shared_memory.SharedMemory(name=name, create=True, size=layout['size'])
+        spec = dict(layout, name=shm.name)
+        handle = cls(shm, spec, owner=True)
+        for key, array in arrays.items():
+            handle._arrays[key][...] = array
+        logger.info(f"Published {len(arrays['years'])} years ({layout['size']} bytes) as {shm.name}")
+        return handle
+
+    @classmethod
+    def attach(cls, spec: Dict) -> 'SharedStore':
+        """
+        Attach to a published store by its spec.
+
+        Args:
+            spec: `spec` of the owning handle
+
+        Returns:
+            Non-owning handle
+
+        Raises:
+            FileNotFoundError: If the block no longer exists
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=spec['name'], track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=spec['name'])
+        return cls(shm, spec, owner=False)
+
+    def __reduce__(self):
+        # Pickle as the spec: the receiving process attaches by name
+        return SharedStore.attach, (self.spec,)
+
+    @property
+    def name(self) -> str:
+        """Shared-memory block name."""
+        return self.spec['name']
+
+    def _unmap(self) -> None:
+        try:
+            self._shm.close()
+        finally:
+            if self.owner and os.getpid() == self._pid:
+                # Forked children inherit the owner handle but never unlink the block
+                self._shm.unlink()
+
+
+def write_mapped_store(path: Union[str, Path],
+                       data_by_year: Union[Dict[int, List[List[int]]], Iterable[Tuple[int, List[List[int]]]]]
+                       ) -> Path:
+    """
+    Write a store file for MappedStore, streaming one year at a time.
+
+    Only the current year and the per-month index (a few integers per
+    year) are held in memory, so a generator of (year, months) pairs can
+    produce stores larger than RAM.
+
+    Args:
+        path: Output file
+        data_by_year: Year -> months mapping, or (year, months) pairs in
+            increasing year order
+
+    Returns:
+        Path of the written file
+
+    Raises:
+        ValueError: If the years of an iterable are not strictly increasing
+    """
+    path = Path(path)
+    items = sorted(data_by_year.items()) if isinstance(data_by_year, dict) else data_by_year
+    years, observed, sizes = [], [], []
+
+    with open(path, 'wb') as f:
+        f.write(bytes(HEADER_SIZE))
+        for year, months in items:
+            if years and year <= years[-1]:
+                raise ValueError(f"Years must be strictly increasing, got {year} after {years[-1]}")
+            years.append(year)
+            observed.append(observed_mask(months))
+            for month in months:
+                sizes.append(len(month))
+                f.write(np.asarray(month, dtype=np.uint8).tobytes())
+
+        index = {
+            'years': np.array(years, dtype=np.int64),
+            'observed': np.array(observed, dtype=bool).reshape(len(years), EXPECTED_MONTHS),
+            'offsets': np.concatenate(([0], np.cumsum(sizes, dtype=np.int64))),
+        }
+        # Days come first so they can be streamed before their count is known
+        layout = _layout({'days': ('|u1', (int(index['offsets'][-1]),)), **_array_fields(index)})
+        for name, array in index.items():
+            f.seek(HEADER_SIZE + layout['fields'][name]['offset'])
+            f.write(array.tobytes())
+        f.truncate(HEADER_SIZE + layout['size'])
+
+        header = MAGIC + json.dumps(layout).encode('utf-8')
+        if len(header) > HEADER_SIZE:
+            raise ValueError(f"Store header exceeds {HEADER_SIZE} bytes")
+        f.seek(0)
+        f.write(header)
+
+    logger.info(f"Wrote {len(years)} years ({int(index['offsets'][-1])} events) to {path}")
+    return path
+
+
+class MappedStore(_PackedStore):
+    """
+    Handle on an event store file mapped read-only into memory.
+
+    Pages of the file are loaded on first access and can be dropped again
+    with release(), so scanning a store larger than RAM keeps the resident
+    set bounded. Arrays returned by the handle are zero-copy views and
+    become invalid once the handle is closed.
+
+    Attributes:
+        path: Store file (see write_mapped_store)
+        spec: Array layout read from the file header
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+            if not header.startswith(MAGIC):
+                raise ValueError(f"{self.path} is not an event store file")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        spec = json.loads(header[len(MAGIC):].rstrip(b'\0').decode('utf-8'))
+        super().__init__(self._map, spec, base=HEADER_SIZE)
+
+    def __repr__(self) -> str:
+        return f'MappedStore({str(self.path)!r})'
+
+    @classmethod
+    def create(cls, path: Union[str, Path], data_by_year) -> 'MappedStore':
+        """
+        Write a store file (see write_mapped_store) and map it.
+
+        Args:
+            path: Output file
+            data_by_year: Year -> months mapping or (year, months) pairs
+
+        Returns:
+            Handle on the new file
+        """
+        return cls(write_mapped_store(path, data_by_year))
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'MappedStore':
+        """
+        Map an existing store file.
+
+        Args:
+            path: Store file
+
+        Returns:
+            Handle on the file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not a store file
+        """
+        return cls(path)
+
+    def __reduce__(self):
+        # Pickle as the path: the receiving process maps the same file
+        return MappedStore.open, (str(self.path),)
+
+    def release(self, start: int, stop: int) -> None:
+        """
+        Drop the resident pages of days[start:stop] (they are re-read from
+        the file if accessed again).
+
+        Args:
+            start: First event index
+            stop: End event index (exclusive)
+        """
+        if not hasattr(mmap, 'MADV_DONTNEED') or stop <= start:
+            return
+        base = HEADER_SIZE + self.spec['fields']['days']['offset']
+        first = (base + start) // mmap.PAGESIZE * mmap.PAGESIZE
+        self._map.madvise(mmap.MADV_DONTNEED, first, base + stop - first)
+
+    def _unmap(self) -> None:
+        self._map.close()
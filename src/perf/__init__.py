@@ -0,0 +1,5 @@
+"""Performance tooling: synthetic data and benchmarks."""
+
+from .synthetic import generate_events, write_synthetic_dataset
+
+__all__ = ['generate_events', 'write_synthetic_dataset']
@@ -0,0 +1,341 @@
+"""
+Benchmark suite for the loading, statistics and plotting hot paths.
+
+Run from the repository root:
+
+    python -m src.perf.bench --years 6 20 --events-per-month 12 100 --output bench.json
+    python -m src.perf.bench --compare bench.json
+"""
+
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import product
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, get_origin
+
+import numpy as np
+
+from ..data.loader import load_events_data
+from ..stats import descriptive, advanced
+from ..viz import advanced as viz_advanced
+from .synthetic import write_synthetic_dataset
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Modules whose public functions are timed individually
+BENCHMARKED_MODULES = (descriptive, advanced)
+
+# Relative slowdown above which a result is flagged as a regression
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+
+def discover_functions(module) -> List[Tuple[str, Callable]]:
+    """
+    List the public functions defined in a module.
+
+    Args:
+        module: Module to inspect
+
+    Returns:
+        List of (qualified name, function) tuples sorted by name
+    """
+    short_name = module.__name__.rsplit('.', 1)[-1]
+    return [
+        (f'{short_name}.{name}', func)
+        for name, func in sorted(vars(module).items())
+        if inspect.isfunction(func)
+        and not name.startswith('_')
+        and func.__module__ == module.__name__
+    ]
+
+
+def build_arguments(func: Callable, store: Dict[int, List[List[int]]]) -> Optional[List]:
+    """
+    Build positional arguments for a stats function from a loaded store.
+
+    Arguments are resolved by parameter name, following the naming used in
+    the stats modules. Parameters with defaults are left untouched.
+
+    Args:
+        func: Function to call
+        store: Year -> monthly data mapping
+
+    Returns:
+        Positional argument list, or None if a required parameter is unknown
+    """
+    years = sorted(store.keys())
+    first, last = years[0], years[-1]
+    resolvers = {
+        'data': lambda p: store[first],
+        'a': lambda p: store[first],
+        'data_a': lambda p: store[first],
+        'b': lambda p: store[last],
+        'data_b': lambda p: store[last],
+        'ya': lambda p: first,
+        'yb': lambda p: last,
+        'years_data': lambda p: (
+            [store[y] for y in years] if get_origin(p.annotation) is list else store
+        ),
+        'corr': lambda p: 0.5,
+    }
+
+    args = []
+    for param in inspect.signature(func).parameters.values():
+        if param.default is not inspect.Parameter.empty:
+            break
+        if param.name not in resolvers:
+            return None
+        args.append(resolvers[param.name](param))
+    return args
+
+
+def measure(func: Callable, args: List, repeat: int = 3) -> Dict:
+    """
+    Time a call and record its peak traced memory.
+
+    Timing runs are performed without tracemalloc; one extra traced run
+    measures the peak allocation. Output printed by the call is discarded.
+
+    Args:
+        func: Function to call
+        args: Positional arguments
+        repeat: Number of timed runs
+
+    Returns:
+        Dictionary with timing statistics (seconds) and peak memory (KiB)
+    """
+    sink = io.StringIO()
+    timings = []
+    with contextlib.redirect_stdout(sink):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - start)
+            sink.seek(0)
+            sink.truncate()
+
+        tracemalloc.start()
+        try:
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'repeat': repeat,
+        'min_s': round(min(timings), 6),
+        'median_s': round(statistics.median(timings), 6),
+        'mean_s': round(statistics.mean(timings), 6),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def _run_main(data_file: Path, output_dir: Path) -> None:
+    """Run the full main.py pipeline against a given data file."""
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    import main as pipeline
+    pipeline.main(data_file=str(data_file), output_dir=str(output_dir))
+
+
+def run_case(years: int, events_per_month: float, n_series: int,
+             repeat: int = 3, seed: int = 0,
+             include_plots: bool = True, include_main: bool = True) -> List[Dict]:
+    """
+    Benchmark every public function for one dataset size.
+
+    Args:
+        years: Number of years per series
+        events_per_month: Expected events per month
+        n_series: Number of series; each function runs over all of them
+        repeat: Number of timed runs per function
+        seed: Seed for the synthetic data
+        include_plots: Whether to time generate_all_plots
+        include_main: Whether to time the full main.main() pipeline
+
+    Returns:
+        List of result dictionaries
+    """
+    size = {'years': years, 'events_per_month': events_per_month, 'series': n_series}
+    results = []
+
+    def record(name: str, func: Callable, args: List, runs: int = repeat) -> None:
+        entry = {'name': name, 'size': size}
+        entry.update(measure(func, args, runs))
+        results.append(entry)
+        logger.info(f"{name} {size}: {entry['median_s']:.6f}s, {entry['peak_kib']} KiB")
+
+    with tempfile.TemporaryDirectory(prefix='conteo_bench_') as tmp:
+        tmp_path = Path(tmp)
+        paths = write_synthetic_dataset(tmp_path / 'data', years, events_per_month,
+                                        n_series=n_series, seed=seed)
+
+        def load_all():
+            return [load_events_data(str(p)) for p in paths]
+
+        record('loader.load_events_data', load_all, [])
+        stores = load_all()
+
+        for module in BENCHMARKED_MODULES:
+            for name, func in discover_functions(module):
+                args_per_series = [build_arguments(func, store) for store in stores]
+                if any(args is None for args in args_per_series):
+                    logger.debug(f"Skipping {name}: unresolved parameters")
+                    continue
+
+                def call_all(func=func, args_per_series=args_per_series):
+                    for args in args_per_series:
+                        func(*args)
+
+                record(name, call_all, [])
+
+        if include_plots:
+            def plot_all():
+                for store in stores:
+                    viz_advanced.generate_all_plots(store, output_dir=str(tmp_path / 'plots'))
+
+            record('viz.generate_all_plots', plot_all, [], runs=1)
+
+        if include_main:
+            def main_all():
+                for path in paths:
+                    _run_main(path, tmp_path / 'main_outputs')
+
+            record('main.main', main_all, [], runs=1)
+
+    return results
+
+
+def run_suite(years: List[int], events_per_month: List[float], series: List[int],
+              repeat: int = 3, seed: int = 0,
+              include_plots: bool = True, include_main: bool = True) -> Dict:
+    """
+    Benchmark every combination of the configured sizes.
+
+    Args:
+        years: Year counts to benchmark
+        events_per_month: Event rates to benchmark
+        series: Series counts to benchmark
+        repeat: Number of timed runs per function
+        seed: Seed for the synthetic data
+        include_plots: Whether to time generate_all_plots
+        include_main: Whether to time the full main.main() pipeline
+
+    Returns:
+        Dictionary with environment metadata and the list of results
+    """
+    results = []
+    for n_years, rate, n_series in product(years, events_per_month, series):
+        results.extend(run_case(n_years, rate, n_series, repeat=repeat, seed=seed,
+                                include_plots=include_plots, include_main=include_main))
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def _result_key(entry: Dict) -> Tuple:
+    size = entry['size']
+    return entry['name'], size['years'], size['events_per_month'], size['series']
+
+
+def compare_results(current: Dict, baseline: Dict,
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict]:
+    """
+    Compare two benchmark reports by median time.
+
+    Args:
+        current: Report produced by run_suite
+        baseline: Earlier report to compare against
+        threshold: Relative slowdown flagged as a regression (0.10 = 10%)
+
+    Returns:
+        List of comparison rows for results present in both reports
+    """
+    previous = {_result_key(e): e for e in baseline.get('results', [])}
+    rows = []
+    for entry in current['results']:
+        old = previous.get(_result_key(entry))
+        if old is None or old['median_s'] == 0:
+            continue
+        ratio = entry['median_s'] / old['median_s']
+        rows.append({
+            'name': entry['name'],
+            'size': entry['size'],
+            'baseline_s': old['median_s'],
+            'current_s': entry['median_s'],
+            'ratio': round(ratio, 3),
+            'regression': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Benchmark the analysis pipeline.')
+    parser.add_argument('--years', type=int, nargs='+', default=[6])
+    parser.add_argument('--events-per-month', type=float, nargs='+', default=[12.0])
+    parser.add_argument('--series', type=int, nargs='+', default=[1])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-plots', action='store_true', help='Skip generate_all_plots')
+    parser.add_argument('--no-main', action='store_true', help='Skip the main.main() pipeline')
+    parser.add_argument('--output', type=Path, help='Write the JSON report to this file')
+    parser.add_argument('--compare', type=Path, help='Baseline JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    import matplotlib
+    matplotlib.use('Agg')
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        force=True)
+    logging.getLogger('src.data.loader').setLevel(logging.WARNING)
+    logging.getLogger('main').setLevel(logging.WARNING)
+
+    report = run_suite(args.years, args.events_per_month, args.series,
+                       repeat=args.repeat, seed=args.seed,
+                       include_plots=not args.no_plots, include_main=not args.no_main)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['comparison'] = compare_results(report, baseline, args.threshold)
+        regressions = [row for row in report['comparison'] if row['regression']]
+        for row in regressions:
+            logger.warning(f"Regression: {row['name']} {row['size']} "
+                           f"{row['baseline_s']:.6f}s -> {row['current_s']:.6f}s (x{row['ratio']})")
+        exit_code = 1 if regressions else 0
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output, encoding='utf-8')
+        logger.info(f"Benchmark report written to {args.output}")
+    else:
+        print(output)
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
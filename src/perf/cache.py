@@ -0,0 +1,520 @@
+"""
+Persistent on-disk cache of statistical results.
+
+Results are stored in a local SQLite file, keyed by:
+
+    - the qualified name of the function
+    - a fingerprint of its data arguments (lists, dicts, arrays)
+    - its scalar parameters, including the RNG seed
+    - the library version (package, numpy and scipy) and a hash of the
+      statistics code (src/stats, src/data and the function's own module),
+      so edited code does not serve results of its previous version
+
+Calls of a function that takes a `seed` are cached only when a seed is
+given; unseeded draws are not reproducible and always run. The file is
+kept under a size bound by evicting the least recently used entries.
+
+Caching is off by default. While disabled, ``cached()`` calls the
+function directly:
+
+    from src.perf import cache
+
+    cache.enable('.cache/results.sqlite', max_mb=256)
+    result = cache.cached(simulation.simulate_next_year, data_by_year, n_sims=100_000, seed=0)
+    ...
+    cache.disable()
+
+Inspect or clear the cache from the repository root:
+
+    python -m src.perf.cache info
+    python -m src.perf.cache list --function simulate_next_year
+    python -m src.perf.cache clear
+"""
+
+import argparse
+import functools
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+import pickle
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import scipy
+
+from .. import __version__
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path('.cache') / 'results.sqlite'
+DEFAULT_MAX_MB = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    function TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    params TEXT NOT NULL,
+    seed TEXT,
+    version TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+_active: Optional['ResultCache'] = None
+
+
+_PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+# Packages whose sources are hashed into every key
+_CODE_DIRS = ('stats', 'data')
+
+
+@functools.lru_cache(maxsize=None)
+def _source_hash(*paths: Path) -> str:
+    """Hash of the contents of source files (missing files are skipped)."""
+    digest = hashlib.sha256()
+    for path in sorted(set(paths)):
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            continue
+        digest.update(str(path.relative_to(_PACKAGE_DIR.parent)).encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def code_hash(func: Optional[Callable] = None) -> str:
+    """
+    Hash of the statistics sources, and of the module defining func.
+
+    Args:
+        func: Cached function (its module is included when outside the
+            hashed packages)
+
+    Returns:
+        Short hex digest
+    """
+    paths = [path for name in _CODE_DIRS for path in (_PACKAGE_DIR / name).glob('*.py')]
+    try:
+        source = inspect.getsourcefile(inspect.unwrap(func)) if func is not None else None
+    except TypeError:
+        source = None
+    if source is not None:
+        paths.append(Path(source).resolve())
+    return _source_hash(*paths)
+
+
+def library_version(func: Optional[Callable] = None) -> str:
+    """
+    Version string of the code that produces cached results.
+
+    Args:
+        func: Cached function (see code_hash)
+
+    Returns:
+        Package, numpy and scipy versions plus the code hash
+    """
+    return f"{__version__}/numpy-{np.__version__}/scipy-{scipy.__version__}/code-{code_hash(func)}"
+
+
+def _is_param(value) -> bool:
+    """Whether an argument is a scalar parameter rather than data."""
+    if value is None or isinstance(value, (bool, int, float, str, np.generic)):
+        return True
+    return isinstance(value, tuple) and all(_is_param(item) for item in value)
+
+
+def _update_hash(digest, value) -> None:
+    """Feed a data value into a hash in a canonical form."""
+    if isinstance(value, np.ndarray):
+        if np.ma.isMaskedArray(value):
+            _update_hash(digest, np.ma.getmaskarray(value))
+            value = value.data
+        digest.update(f"ndarray:{value.dtype.str}:{value.shape}:".encode('utf-8'))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}:".encode('utf-8'))
+        for key in sorted(value, key=repr):
+            digest.update(f"{key!r}=".encode('utf-8'))
+            _update_hash(digest, value[key])
+    else:
+        digest.update(json.dumps(value, separators=(',', ':'), default=repr).encode('utf-8'))
+        # YearEvents carry an observed-months mask that JSON drops
+        observed = getattr(value, 'observed', None)
+        if observed is not None:
+            digest.update(f"observed:{observed}".encode('utf-8'))
+
+
+def fingerprint(*values) -> str:
+    """
+    Content fingerprint of data values.
+
+    Args:
+        *values: Nested lists/dicts of scalars, or numpy arrays
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    for value in values:
+        _update_hash(digest, value)
+    return digest.hexdigest()
+
+
+def _function_name(func: Callable) -> str:
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def _current_version(function_name: str) -> Optional[str]:
+    """library_version() of a function given its qualified name (None if it cannot be imported)."""
+    module_name, _, qualname = function_name.rpartition('.')
+    while module_name:
+        try:
+            module = importlib.import_module(module_name)
+            break
+        except ImportError:
+            module_name, _, outer = module_name.rpartition('.')
+            qualname = f"{outer}.{qualname}"
+    else:
+        return None
+    func = module
+    for part in qualname.split('.'):
+        func = getattr(func, part, None)
+    return library_version(func) if callable(func) else None
+
+
+def call_key(func: Callable, args: tuple, kwargs: dict) -> Optional[Dict]:
+    """
+    Cache key of one call.
+
+    Args:
+        func: Function
+        args: Positional arguments
+        kwargs: Keyword arguments
+
+    Returns:
+        Dictionary with 'key', 'function', 'fingerprint', 'params', 'seed'
+        and 'version', or None if the call takes a seed and none is given
+    """
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+    except (TypeError, ValueError):
+        bound = None
+    if bound is not None:
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+    else:
+        arguments = {f"arg{i}": value for i, value in enumerate(args)}
+        arguments.update(kwargs)
+
+    seed = arguments.pop('seed', None)
+    if bound is not None and 'seed' in bound.signature.parameters and seed is None:
+        return None
+    if seed is not None and not _is_param(seed):
+        return None
+
+    params = {name: value for name, value in arguments.items() if _is_param(value)}
+    data = [(name, value) for name, value in arguments.items() if name not in params]
+    entry = {
+        'function': _function_name(func),
+        'fingerprint': fingerprint(*[value for _, value in data]),
+        'params': json.dumps(params, sort_keys=True, default=repr),
+        'seed': None if seed is None else json.dumps(seed, default=repr),
+        'version': library_version(func),
+    }
+    entry['key'] = hashlib.sha256(json.dumps(entry, sort_keys=True).encode('utf-8')).hexdigest()
+    return entry
+
+
+class ResultCache:
+    """
+    Size-bounded SQLite store of function results.
+
+    Storage errors (locked or corrupt file, unpicklable results) are logged
+    and the result is computed without the cache.
+
+    Attributes:
+        hits: Calls answered from the cache since opening
+        misses: Calls computed since opening
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH, max_mb: float = DEFAULT_MAX_MB):
+        """
+        Args:
+            path: SQLite file (created with its directory if missing)
+            max_mb: Size bound of the stored results in MiB
+        """
+        self.path = Path(path)
+        self.max_bytes = int(max_mb * 2 ** 20)
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        Return func(*args, **kwargs), from the cache when stored.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Result of the call
+        """
+        entry = call_key(func, args, kwargs)
+        if entry is None:
+            return func(*args, **kwargs)
+        try:
+            found, value = self.get(entry['key'])
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning(f"Result cache read failed for {entry['function']}: {e}")
+            found, value = False, None
+        if found:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = func(*args, **kwargs)
+        try:
+            self.put(entry, value)
+        except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning(f"Result cache write failed for {entry['function']}: {e}")
+        return value
+
+    def get(self, key: str) -> Tuple[bool, object]:
+        """
+        Look up a stored result.
+
+        Args:
+            key: Entry key (see call_key)
+
+        Returns:
+            Tuple of (found, value)
+        """
+        row = self._conn.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return False, None
+        value = pickle.loads(row[0])
+        with self._conn:
+            self._conn.execute('UPDATE results SET accessed = ?, hits = hits + 1 WHERE key = ?',
+                               (time.time(), key))
+        return True, value
+
+    def put(self, entry: Dict, value) -> None:
+        """
+        Store a result and evict old entries beyond the size bound.
+
+        Args:
+            entry: Key entry (see call_key)
+            value: Result to store
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            logger.info(f"Result of {entry['function']} ({len(blob)} bytes) exceeds the cache size")
+            return
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO results (key, function, fingerprint, params, seed, version, '
+                'value, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (entry['key'], entry['function'], entry['fingerprint'], entry['params'], entry['seed'],
+                 entry['version'], blob, len(blob), now, now))
+        self.evict()
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Drop least recently used entries until the cache fits a size.
+
+        Args:
+            max_bytes: Size bound (default: the cache's)
+
+        Returns:
+            Number of entries removed
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        if total <= limit:
+            return 0
+        removed = []
+        for key, size in self._conn.execute('SELECT key, size FROM results ORDER BY accessed'):
+            if total <= limit:
+                break
+            removed.append((key,))
+            total -= size
+        with self._conn:
+            self._conn.executemany('DELETE FROM results WHERE key = ?', removed)
+        logger.info(f"Evicted {len(removed)} cached results")
+        return len(removed)
+
+    def entries(self, function: Optional[str] = None) -> List[Dict]:
+        """
+        Describe stored entries, most recently used first.
+
+        Args:
+            function: Only entries whose function name contains this text
+
+        Returns:
+            One dictionary per entry (without the value)
+        """
+        query = ('SELECT key, function, fingerprint, params, seed, version, size, created, accessed, hits '
+                 'FROM results WHERE function LIKE ? ORDER BY accessed DESC')
+        columns = ('key', 'function', 'fingerprint', 'params', 'seed', 'version', 'size',
+                   'created', 'accessed', 'hits')
+        return [dict(zip(columns, row)) for row in self._conn.execute(query, (f"%{function or ''}%",))]
+
+    def stats(self) -> Dict:
+        """
+        Summary of the cache contents.
+
+        Returns:
+            Dictionary with 'path', 'entries', 'size_mib', 'max_mib',
+            'current_version' and 'functions' (entries, size and stored hits
+            per function)
+        """
+        rows = self._conn.execute('SELECT function, COUNT(*), SUM(size), SUM(hits) FROM results '
+                                  'GROUP BY function ORDER BY function').fetchall()
+        total = sum(row[2] for row in rows)
+        return {
+            'path': str(self.path),
+            'entries': sum(row[1] for row in rows),
+            'size_mib': round(total / 2 ** 20, 3),
+            'max_mib': round(self.max_bytes / 2 ** 20, 3),
+            'current_version': library_version(),
+            'functions': {name: {'entries': count, 'size_kib': round(size / 1024, 1), 'hits': hits}
+                          for name, count, size, hits in rows},
+        }
+
+    def clear(self, function: Optional[str] = None, stale_only: bool = False) -> int:
+        """
+        Remove entries.
+
+        Args:
+            function: Only entries whose function name contains this text
+            stale_only: Only entries written by another library or code
+                version (or whose function no longer exists)
+
+        Returns:
+            Number of entries removed
+        """
+        pattern = f"%{function or ''}%"
+        with self._conn:
+            if not stale_only:
+                removed = self._conn.execute('DELETE FROM results WHERE function LIKE ?', (pattern,)).rowcount
+            else:
+                stored = self._conn.execute('SELECT DISTINCT function, version FROM results '
+                                            'WHERE function LIKE ?', (pattern,)).fetchall()
+                stale = [(name, version) for name, version in stored if version != _current_version(name)]
+                removed = sum(self._conn.execute('DELETE FROM results WHERE function = ? AND version = ?',
+                                                 row).rowcount for row in stale)
+        self._conn.execute('VACUUM')
+        return removed
+
+
+def enable(path: Union[str, Path] = DEFAULT_CACHE_PATH, max_mb: float = DEFAULT_MAX_MB) -> ResultCache:
+    """
+    Route cached() calls through a result cache.
+
+    Args:
+        path: SQLite file
+        max_mb: Size bound in MiB
+
+    Returns:
+        The active cache
+    """
+    global _active
+    disable()
+    _active = ResultCache(path, max_mb)
+    return _active
+
+
+def disable() -> None:
+    """Stop caching and close the active cache."""
+    global _active
+    if _active is not None:
+        logger.info(f"Result cache: {_active.hits} hits, {_active.misses} misses ({_active.path})")
+        _active.close()
+    _active = None
+
+
+def active() -> Optional[ResultCache]:
+    """Return the active cache, or None while caching is disabled."""
+    return _active
+
+
+def cached(func: Callable, *args, **kwargs):
+    """
+    Call a function through the active cache (directly while disabled).
+
+    Args:
+        func: Function to call
+        *args: Positional arguments
+        **kwargs: Keyword arguments
+
+    Returns:
+        Result of the call
+    """
+    if _active is None:
+        return func(*args, **kwargs)
+    return _active.call(func, *args, **kwargs)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Inspect or clear the persistent result cache.')
+    parser.add_argument('--path', type=Path, default=DEFAULT_CACHE_PATH, help='Cache file')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('info', help='Entries and size per function')
+    listing = commands.add_parser('list', help='One line per entry, most recently used first')
+    listing.add_argument('--function', help='Only functions whose name contains this text')
+    clearing = commands.add_parser('clear', help='Remove entries')
+    clearing.add_argument('--function', help='Only functions whose name contains this text')
+    clearing.add_argument('--stale', action='store_true',
+                          help='Only entries written by another library or code version')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        force=True)
+    if not args.path.exists():
+        print(f"No cache at {args.path}")
+        return 0
+    with ResultCache(args.path) as store:
+        if args.command == 'info':
+            print(json.dumps(store.stats(), indent=2))
+        elif args.command == 'list':
+            for entry in store.entries(args.function):
+                accessed = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['accessed']))
+                print(f"{entry['key'][:12]}  {entry['function']}  params={entry['params']}  "
+                      f"seed={entry['seed']}  {entry['size']} B  hits={entry['hits']}  "
+                      f"last used {accessed}  [{entry['version']}]")
+        else:
+            removed = store.clear(args.function, stale_only=args.stale)
+            print(f"Removed {removed} entries from {args.path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""
+Lightweight timing instrumentation for pipeline stages and stats functions.
+
+Instrumentation is off by default. While disabled, ``stage()`` returns a
+shared no-op context and module functions are left unpatched, so the cost
+is a single flag check per stage.
+
+Example:
+
+    from src.perf import instrument
+
+    instrument.enable(modules=[descriptive, advanced])
+    with instrument.stage('load'):
+        data = load_events_data()
+    ...
+    instrument.disable()
+    print(instrument.format_summary())
+"""
+
+import contextlib
+import cProfile
+import functools
+import inspect
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+_enabled = False
+_track_allocations = False
+_records: Dict[str, Dict] = {}
+_patched: List = []
+
+
+def is_enabled() -> bool:
+    """Return whether instrumentation is currently recording."""
+    return _enabled
+
+
+def reset() -> None:
+    """Clear all recorded measurements."""
+    _records.clear()
+
+
+def _record(name: str, wall: float, cpu: float, alloc: int) -> None:
+    """Accumulate one measurement into the registry."""
+    rec = _records.get(name)
+    if rec is None:
+        rec = _records[name] = {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'alloc_kib': 0.0}
+    rec['calls'] += 1
+    rec['wall_s'] += wall
+    rec['cpu_s'] += cpu
+    rec['alloc_kib'] += alloc / 1024
+
+
+@contextlib.contextmanager
+def _timed(name: str) -> Iterator[None]:
+    """Measure wall time, CPU time and net allocations of a block."""
+    mem_start = tracemalloc.get_traced_memory()[0] if _track_allocations else 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        alloc = tracemalloc.get_traced_memory()[0] - mem_start if _track_allocations else 0
+        _record(name, wall, cpu, alloc)
+
+
+def stage(name: str):
+    """
+    Context manager timing a named pipeline stage.
+
+    Args:
+        name: Stage name used in the summary
+
+    Returns:
+        Recording context when enabled, a shared no-op context otherwise
+    """
+    if not _enabled:
+        return _NULL_CONTEXT
+    return _timed(name)
+
+
+def instrument(name: Optional[str] = None) -> Callable:
+    """
+    Decorator timing every call of a function while instrumentation is enabled.
+
+    Args:
+        name: Label for the summary (defaults to 'module.function')
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _timed(label):
+                return func(*args, **kwargs)
+
+        wrapper.__wrapped_label__ = label
+        return wrapper
+
+    return decorator
+
+
+def _patch_modules(modules: Iterable) -> None:
+    """
+    Wrap the public functions defined in the given modules.
+
+    Names imported from one instrumented module into another (e.g.
+    ``total_per_month`` in stats.advanced) are replaced as well, so calls
+    made through either name are recorded.
+    """
+    modules = list(modules)
+    wrappers = {}
+    for module in modules:
+        for name, func in vars(module).items():
+            if (inspect.isfunction(func) and not name.startswith('_')
+                    and func.__module__ == module.__name__):
+                wrappers[func] = instrument()(func)
+
+    for module in modules:
+        for name, value in list(vars(module).items()):
+            if inspect.isfunction(value) and value in wrappers:
+                _patched.append((module, name, value))
+                setattr(module, name, wrappers[value])
+
+
+def _restore_modules() -> None:
+    """Undo every patch applied by _patch_modules."""
+    while _patched:
+        module, name, original = _patched.pop()
+        setattr(module, name, original)
+
+
+def enable(modules: Iterable = (), track_allocations: bool = False) -> None:
+    """
+    Start recording stages and function calls.
+
+    Args:
+        modules: Modules whose public functions are timed individually
+        track_allocations: Record net allocations per stage via tracemalloc
+            (adds noticeable overhead)
+    """
+    global _enabled, _track_allocations
+    if _enabled:
+        return
+    _patch_modules(modules)
+    _track_allocations = track_allocations
+    if track_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording and restore patched module functions."""
+    global _enabled, _track_allocations
+    _enabled = False
+    _restore_modules()
+    if _track_allocations and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _track_allocations = False
+
+
+def summary() -> List[Dict]:
+    """
+    Get recorded measurements sorted by total wall time.
+
+    Returns:
+        List of dictionaries with name, calls, wall_s, cpu_s and alloc_kib.
+        Times are inclusive of nested stages and calls.
+    """
+    rows = [dict(name=name, **rec) for name, rec in _records.items()]
+    rows.sort(key=lambda r: r['wall_s'], reverse=True)
+    return rows
+
+
+def format_summary(rows: Optional[List[Dict]] = None) -> str:
+    """
+    Format measurements as a text table.
+
+    Args:
+        rows: Measurements (defaults to the current summary)
+
+    Returns:
+        Table with one line per stage or function
+    """
+    rows = summary() if rows is None else rows
+    header = f"{'Stage / function':40s} {'calls':>7s} {'wall (s)':>10s} {'cpu (s)':>10s} {'alloc (KiB)':>12s}"
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['name'][:40]:40s} {row['calls']:7d} {row['wall_s']:10.4f} "
+            f"{row['cpu_s']:10.4f} {row['alloc_kib']:12.1f}"
+        )
+    return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def profile_calls(dump_path: Optional[Path] = None) -> Iterator[Optional[cProfile.Profile]]:
+    """
+    Run a block under cProfile and dump pstats data.
+
+    The dump can be opened with pstats, snakeviz or converted to a
+    flamegraph (e.g. flameprof, gprof2dot).
+
+    Args:
+        dump_path: Where to write the .prof file; no profiling if None
+
+    Yields:
+        The active profiler, or None when dump_path is None
+    """
+    if dump_path is None:
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        Path(dump_path).parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(dump_path))
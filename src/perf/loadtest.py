@@ -0,0 +1,177 @@
+"""
+Concurrent load test for the HTTP query service.
+
+Run from the repository root against a running server:
+
+    python -m src.perf.loadtest --url http://127.0.0.1:8765 --requests 2000 --concurrency 16
+
+Without --url an in-process server is started on a free port.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENDPOINTS = [
+    '/years',
+    '/trend',
+    '/seasonality',
+    '/correlations',
+    '/predictive',
+]
+
+
+def latency_stats(latencies: List[float]) -> Dict:
+    """
+    Summarize latencies in milliseconds.
+
+    Args:
+        latencies: Request latencies in seconds
+
+    Returns:
+        Dictionary with count, mean, p50, p90, p99 and max (ms)
+    """
+    if not latencies:
+        return {'count': 0}
+    ms = np.asarray(latencies) * 1000
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {
+        'count': len(latencies),
+        'mean_ms': round(float(ms.mean()), 3),
+        'p50_ms': round(float(p50), 3),
+        'p90_ms': round(float(p90), 3),
+        'p99_ms': round(float(p99), 3),
+        'max_ms': round(float(ms.max()), 3),
+    }
+
+
+def run_load(base_url: str, endpoints: List[str], n_requests: int = 1000,
+             concurrency: int = 8, revalidate: bool = False) -> Dict:
+    """
+    Issue requests round-robin over endpoints from concurrent workers.
+
+    Each worker keeps one persistent HTTP/1.1 connection.
+
+    Args:
+        base_url: Server base URL, e.g. http://127.0.0.1:8765
+        endpoints: Request targets to cycle through
+        n_requests: Total number of requests
+        concurrency: Number of concurrent workers
+        revalidate: Send If-None-Match with the last seen ETag (exercises 304s)
+
+    Returns:
+        Dictionary with overall and per-endpoint latency statistics
+    """
+    url = urlsplit(base_url)
+    per_endpoint: Dict[str, List[float]] = {e: [] for e in endpoints}
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+    counter = iter(range(n_requests))
+
+    def worker() -> None:
+        conn = HTTPConnection(url.hostname, url.port or 80, timeout=30)
+        etags: Dict[str, str] = {}
+        local: Dict[str, List[float]] = {e: [] for e in endpoints}
+        local_status: Dict[int, int] = {}
+        try:
+            while True:
+                with lock:
+                    i = next(counter, None)
+                if i is None:
+                    break
+                target = endpoints[i % len(endpoints)]
+                headers = {'If-None-Match': etags[target]} if revalidate and target in etags else {}
+                start = time.perf_counter()
+                conn.request('GET', target, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                local[target].append(time.perf_counter() - start)
+                local_status[response.status] = local_status.get(response.status, 0) + 1
+                if response.getheader('ETag'):
+                    etags[target] = response.getheader('ETag')
+        finally:
+            conn.close()
+            with lock:
+                for target, values in local.items():
+                    per_endpoint[target].extend(values)
+                for status, count in local_status.items():
+                    statuses[status] = statuses.get(status, 0) + count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    all_latencies = [v for values in per_endpoint.values() for v in values]
+    return {
+        'requests': n_requests,
+        'concurrency': concurrency,
+        'revalidate': revalidate,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(n_requests / elapsed, 1) if elapsed else None,
+        'statuses': {str(k): v for k, v in sorted(statuses.items())},
+        'overall': latency_stats(all_latencies),
+        'endpoints': {e: latency_stats(v) for e, v in per_endpoint.items()},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Load test the HTTP query service.')
+    parser.add_argument('--url', help='Server base URL (default: start an in-process server)')
+    parser.add_argument('--data-file', default='events.json',
+                        help='Data file for the in-process server')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--revalidate', action='store_true',
+                        help='Send If-None-Match to measure 304 responses')
+    parser.add_argument('--endpoint', action='append', dest='endpoints',
+                        help='Endpoint to request (repeatable)')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    server = None
+    base_url = args.url
+    endpoints = args.endpoints
+    if base_url is None:
+        from ..server import QueryStore, make_server
+        store = QueryStore.from_file(args.data_file)
+        server = make_server(store, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_port}'
+        if endpoints is None:
+            years = sorted(store.data_by_year.keys())
+            endpoints = DEFAULT_ENDPOINTS + [f'/years/{years[-1]}/summary']
+            if len(years) > 1:
+                endpoints.append(f'/compare?a={years[0]}&b={years[-1]}')
+
+    try:
+        report = run_load(base_url, endpoints or DEFAULT_ENDPOINTS, n_requests=args.requests,
+                          concurrency=args.concurrency, revalidate=args.revalidate)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    print(json.dumps(report, indent=2))
+    overall = report['overall']
+    logger.info(f"p50 = {overall['p50_ms']} ms, p99 = {overall['p99_ms']} ms, "
+                f"{report['throughput_rps']} req/s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
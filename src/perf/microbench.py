@@ -0,0 +1,244 @@
+"""
+Micro-benchmarks comparing fused kernels against the paths they replace.
+
+Run from the repository root:
+
+    python -m src.perf.microbench --events-per-month 12 100 1000
+    python -m src.perf.microbench --kernels shared_store --store-years 200 --workers 4
+    python -m src.perf.microbench --kernels pairwise_mann_whitney --series 100 200
+"""
+
+import argparse
+import json
+import logging
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy.stats import mannwhitneyu
+
+from ..data.shared import SharedStore
+from ..stats import advanced, descriptive
+from .bench import measure
+from .synthetic import generate_year
+
+logger = logging.getLogger(__name__)
+
+
+def year_summary_legacy(data: List[List[int]]) -> Dict:
+    """Compute the view_data metrics with one call per metric (pre-fusion path)."""
+    return {
+        'total': descriptive.total(data),
+        'avg_per_month': descriptive.total_avg(data),
+        'per_month': descriptive.total_per_month(data),
+        'peak_month': descriptive.peak_month(data),
+        'lowest_month': descriptive.lowest_month(data),
+        'top_days': descriptive.top_repeated_days(data),
+        'bottom_days': descriptive.least_repeated_days(data),
+        'unique_per_month': descriptive.unique_days_per_month(data),
+        'unique_days': descriptive.unique_days_total(data),
+        'std_dev': descriptive.std_dev_events_per_month(data),
+        'cv': descriptive.coefficient_of_variation(data),
+    }
+
+
+def compare_kernels(baseline: Callable, candidate: Callable, args: List,
+                    repeat: int = 20) -> Dict:
+    """
+    Time two implementations of the same computation.
+
+    Args:
+        baseline: Reference implementation
+        candidate: Optimized implementation
+        args: Positional arguments passed to both
+        repeat: Number of timed runs per implementation
+
+    Returns:
+        Dictionary with both measurements and the speedup of the candidate
+        (ratio of median times)
+    """
+    before = measure(baseline, args, repeat)
+    after = measure(candidate, args, repeat)
+    return {
+        'baseline': before,
+        'candidate': after,
+        'speedup': round(before['median_s'] / after['median_s'], 2) if after['median_s'] else None,
+    }
+
+
+def bench_year_summary(events_per_month: Sequence[float], repeat: int = 20,
+                       seed: int = 0) -> List[Dict]:
+    """
+    Benchmark descriptive.year_summary against the per-metric calls.
+
+    Args:
+        events_per_month: Year sizes to test (expected events per month)
+        repeat: Number of timed runs
+        seed: Seed for the synthetic years
+
+    Returns:
+        One result per size
+
+    Raises:
+        AssertionError: If the fused summary disagrees with the legacy path
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for size in events_per_month:
+        data = generate_year(rng, size)
+        fused = descriptive.year_summary(data)
+        legacy = year_summary_legacy(data)
+        assert all(fused[key] == value for key, value in legacy.items()), \
+            f"year_summary disagrees with the per-metric functions at {size} events/month"
+
+        result = compare_kernels(year_summary_legacy, descriptive.year_summary, [data], repeat)
+        result.update({'kernel': 'descriptive.year_summary', 'events_per_month': size})
+        results.append(result)
+        logger.info(f"year_summary @ {size:g} events/month: "
+                    f"{result['baseline']['median_s'] * 1e6:.1f}us -> "
+                    f"{result['candidate']['median_s'] * 1e6:.1f}us (x{result['speedup']})")
+    return results
+
+
+def _monthly_totals_task(payload) -> List[int]:
+    """Worker task: events per calendar month over every year of a store."""
+    if isinstance(payload, SharedStore):
+        counts = payload.monthly_counts()
+    else:
+        counts = np.array([descriptive.total_per_month(data) for data in payload.values()])
+    return counts.sum(axis=0).tolist()
+
+
+def _roundtrip(payload) -> None:
+    """Serialize and deserialize a payload as a process pool would."""
+    restored = pickle.loads(pickle.dumps(payload))
+    if isinstance(restored, SharedStore):
+        restored.close()
+
+
+def bench_shared_store(years: int = 200, events_per_month: float = 100.0, tasks: int = 8,
+                       workers: int = 2, repeat: int = 3, seed: int = 0) -> Dict:
+    """
+    Benchmark handing a store to pool workers by pickling vs. shared memory.
+
+    Args:
+        years: Years in the synthetic store
+        events_per_month: Expected events per month
+        tasks: Tasks submitted per pool run (each receives the store)
+        workers: Worker processes
+        repeat: Number of timed runs
+        seed: Seed for the synthetic store
+
+    Returns:
+        Dictionary with the pickled payload sizes, the serialization
+        round-trip comparison and the pool run comparison
+
+    Raises:
+        AssertionError: If workers attached to shared memory disagree with
+            workers that received the pickled store
+    """
+    rng = np.random.default_rng(seed)
+    store = {2000 + i: generate_year(rng, events_per_month) for i in range(years)}
+
+    with SharedStore.create(store) as handle, ProcessPoolExecutor(max_workers=workers) as pool:
+        def run_pool(payload):
+            return list(pool.map(_monthly_totals_task, [payload] * tasks))
+
+        assert run_pool(store) == run_pool(handle), "shared-memory workers disagree with pickled store"
+        result = {
+            'years': years,
+            'events_per_month': events_per_month,
+            'tasks': tasks,
+            'workers': workers,
+            'pickled_bytes': {'store': len(pickle.dumps(store)), 'handle': len(pickle.dumps(handle))},
+            'serialization': compare_kernels(lambda: _roundtrip(store), lambda: _roundtrip(handle), [],
+                                             repeat),
+            'pool': compare_kernels(lambda: run_pool(store), lambda: run_pool(handle), [], repeat),
+        }
+
+    logger.info(f"shared store @ {years} years x {events_per_month:g} events/month: "
+                f"{result['pickled_bytes']['store']} -> {result['pickled_bytes']['handle']} bytes per task, "
+                f"pool x{result['pool']['speedup']}")
+    return result
+
+
+def mann_whitney_pairs_legacy(matrix: np.ndarray) -> np.ndarray:
+    """Two-sided Mann-Whitney p-values with one scipy call per pair of rows (pre-batching path)."""
+    rows = [row.compressed() for row in matrix]
+    p_value = np.full((len(rows), len(rows)), np.nan)
+    for i in range(len(rows)):
+        for j in range(i + 1, len(rows)):
+            p_value[i, j] = p_value[j, i] = mannwhitneyu(rows[i], rows[j], alternative='two-sided').pvalue
+    return p_value
+
+
+def bench_pairwise_mann_whitney(series: Sequence[int], events_per_month: float = 100.0,
+                                repeat: int = 3, seed: int = 0) -> List[Dict]:
+    """
+    Benchmark advanced.pairwise_mann_whitney against a loop of two-sample tests.
+
+    Args:
+        series: Numbers of series (rows of the count matrix) to test
+        events_per_month: Expected events per month
+        repeat: Number of timed runs
+        seed: Seed for the synthetic series
+
+    Returns:
+        One result per number of series
+
+    Raises:
+        AssertionError: If the shared-rank p-values disagree with scipy
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for n_series in series:
+        data = {i: generate_year(rng, events_per_month) for i in range(n_series)}
+        _, matrix = advanced.monthly_count_matrix(data)
+        batched = advanced.pairwise_mann_whitney(matrix)['p_value']
+        assert np.allclose(batched, mann_whitney_pairs_legacy(matrix), equal_nan=True), \
+            f"pairwise_mann_whitney disagrees with scipy at {n_series} series"
+
+        result = compare_kernels(mann_whitney_pairs_legacy, advanced.pairwise_mann_whitney, [matrix], repeat)
+        result.update({'kernel': 'advanced.pairwise_mann_whitney', 'series': n_series,
+                       'pairs': n_series * (n_series - 1) // 2})
+        results.append(result)
+        logger.info(f"pairwise Mann-Whitney @ {n_series} series: "
+                    f"{result['baseline']['median_s'] * 1e3:.1f}ms -> "
+                    f"{result['candidate']['median_s'] * 1e3:.1f}ms (x{result['speedup']})")
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Micro-benchmark fused kernels.')
+    parser.add_argument('--kernels', nargs='+', choices=['year_summary', 'shared_store', 'pairwise_mann_whitney'],
+                        default=['year_summary', 'shared_store', 'pairwise_mann_whitney'])
+    parser.add_argument('--events-per-month', type=float, nargs='+', default=[12.0, 100.0, 1000.0])
+    parser.add_argument('--store-years', type=int, default=200, help='Years in the shared_store benchmark')
+    parser.add_argument('--workers', type=int, default=2, help='Pool size in the shared_store benchmark')
+    parser.add_argument('--series', type=int, nargs='+', default=[100, 200],
+                        help='Series in the pairwise_mann_whitney benchmark')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        force=True)
+    report = {}
+    if 'year_summary' in args.kernels:
+        report['year_summary'] = bench_year_summary(args.events_per_month, args.repeat, args.seed)
+    if 'shared_store' in args.kernels:
+        report['shared_store'] = bench_shared_store(args.store_years, max(args.events_per_month),
+                                                    workers=args.workers, repeat=min(args.repeat, 5),
+                                                    seed=args.seed)
+    if 'pairwise_mann_whitney' in args.kernels:
+        report['pairwise_mann_whitney'] = bench_pairwise_mann_whitney(args.series, repeat=min(args.repeat, 3),
+                                                                      seed=args.seed)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Synthetic events.json-compatible dataset generator for benchmarks."""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..data.loader import EXPECTED_MONTHS, VALID_DAYS_RANGE
+
+
+def generate_year(rng: np.random.Generator, events_per_month: float) -> List[List[int]]:
+    """
+    Generate one year of monthly events.
+
+    Monthly counts are Poisson distributed around ``events_per_month`` and
+    days are drawn uniformly from the valid day range, sorted like the
+    original data.
+
+    Args:
+        rng: NumPy random generator
+        events_per_month: Expected number of events per month
+
+    Returns:
+        List of 12 months with daily events
+    """
+    counts = rng.poisson(events_per_month, size=EXPECTED_MONTHS)
+    low, high = VALID_DAYS_RANGE
+    return [
+        sorted(rng.integers(low, high + 1, size=count).tolist())
+        for count in counts
+    ]
+
+
+def generate_events(years: int, events_per_month: float,
+                    start_year: int = 2000, seed: Optional[int] = None) -> Dict:
+    """
+    Generate an events.json-compatible payload.
+
+    Args:
+        years: Number of consecutive years to generate
+        events_per_month: Expected number of events per month
+        start_year: First year of the series
+        seed: Seed for reproducible output
+
+    Returns:
+        Dictionary with 'metadata' and 'events' keys
+    """
+    rng = np.random.default_rng(seed)
+    events = {
+        str(year): generate_year(rng, events_per_month)
+        for year in range(start_year, start_year + years)
+    }
+    return {
+        'metadata': {
+            'description': 'Synthetic benchmark data',
+            'event_type': 'recurring_monthly_event',
+            'date_range': f'{start_year}-{start_year + years - 1}',
+            'units': 'days_of_month',
+        },
+        'events': events,
+    }
+
+
+def write_synthetic_dataset(output_dir: Path, years: int, events_per_month: float,
+                            n_series: int = 1, start_year: int = 2000,
+                            seed: Optional[int] = 0) -> List[Path]:
+    """
+    Write one events.json-compatible file per series.
+
+    Args:
+        output_dir: Directory where files are written
+        years: Number of years per series
+        events_per_month: Expected number of events per month
+        n_series: Number of independent series (files) to generate
+        start_year: First year of every series
+        seed: Base seed; each series gets its own derived stream
+
+    Returns:
+        Paths of the generated files, in series order
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    seeds = np.random.SeedSequence(seed).spawn(n_series)
+    paths = []
+    for idx, series_seed in enumerate(seeds):
+        payload = generate_events(years, events_per_month, start_year=start_year,
+                                  seed=series_seed.generate_state(1)[0])
+        payload['metadata']['series'] = f'series_{idx:03d}'
+        path = output_dir / f'series_{idx:03d}.json'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        paths.append(path)
+
+    return paths
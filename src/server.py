@@ -0,0 +1,238 @@
+"""
+Local HTTP query service over a warm in-memory store.
+
+Endpoints (all GET, JSON responses):
+
+    /health                      Service status
+    /years                       Available years
+    /years/<year>/summary        Per-year descriptive stats, day distribution, normality
+    /compare?a=<year>&b=<year>   Comparison between two years
+    /trend                       Year-over-year trend
+    /seasonality                 Seasonality ANOVA
+    /correlations                Adjacent-year correlations
+    /predictive                  Predictive summary
+    /rollup?group_by=<g>         Event counts from pre-aggregated rollups; g is
+                                 total, year, quarter, month, day or day_of_month;
+                                 optional years=2020-2024, months=1,2,3, days=1-7
+
+Responses carry an ETag; requests with a matching If-None-Match get 304.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .data.loader import load_events_data
+from .data.shards import combine_series, is_sharded_source, load_sharded_dataset
+from .stats import descriptive
+from .watch import IncrementalAnalysis
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Upper bound on cached encoded responses (query strings are client-controlled)
+MAX_CACHED_RESPONSES = 4096
+
+
+def _json_default(value):
+    """Serialize NumPy scalars and tuples returned by the stats modules."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(payload) -> bytes:
+    """Encode a payload as compact UTF-8 JSON."""
+    return json.dumps(payload, default=_json_default, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def _parse_range(value: str) -> Tuple[int, int]:
+    """Parse 'a-b' (or a single 'a') into an inclusive integer range."""
+    first, _, last = value.partition('-')
+    return int(first), int(last or first)
+
+
+class QueryStore:
+    """
+    Parsed data plus precomputed aggregates, kept warm for the server.
+
+    Per-year summaries and cross-year results are computed once at load
+    time. Encoded responses are cached by path, so repeated queries only
+    cost a dictionary lookup.
+    """
+
+    def __init__(self, data_by_year: Dict[int, List[List[int]]]):
+        """
+        Args:
+            data_by_year: Dictionary with year -> data mapping
+        """
+        self.data_by_year = data_by_year
+        self.analysis = IncrementalAnalysis(output_dir=None)
+        self.analysis.update(data_by_year)
+        self._responses: Dict[str, Tuple[bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, filename: str = 'events.json') -> 'QueryStore':
+        """Build a store from a JSON file in data/raw/ (or an absolute path) or a sharded source."""
+        if is_sharded_source(filename):
+            store, _ = load_sharded_dataset(filename)
+            return cls(combine_series(store))
+        return cls(load_events_data(filename))
+
+    def _payload(self, path: str, query: Dict[str, List[str]]):
+        """Resolve a request path to a response payload (raises KeyError/ValueError)."""
+        parts = [p for p in path.split('/') if p]
+        results = self.analysis.global_results
+
+        if parts == ['health']:
+            return {'status': 'ok', 'years': len(self.data_by_year)}
+        if parts == ['years']:
+            return {'years': sorted(self.data_by_year.keys())}
+        if len(parts) == 3 and parts[0] == 'years' and parts[2] == 'summary':
+            year = int(parts[1])
+            if year not in self.analysis.year_results:
+                raise KeyError(f"Year {year} not available")
+            return dict(year=year, **self.analysis.year_results[year])
+        if parts == ['compare']:
+            if 'a' not in query or 'b' not in query:
+                raise ValueError("Query parameters 'a' and 'b' are required")
+            ya, yb = int(query['a'][0]), int(query['b'][0])
+            for year in (ya, yb):
+                if year not in self.data_by_year:
+                    raise KeyError(f"Year {year} not available")
+            cached = self.analysis.pair_results.get((ya, yb))
+            if cached is None:
+                cached = descriptive.compare_years(self.data_by_year[ya], self.data_by_year[yb], ya, yb)
+            return cached
+        if parts == ['trend']:
+            return results['year_trend']
+        if parts == ['seasonality']:
+            return results['seasonality']
+        if parts == ['correlations']:
+            return results['correlations']
+        if parts == ['predictive']:
+            return results['predictive_summary']
+        if parts == ['rollup']:
+            return self.analysis.rollups.query(
+                query.get('group_by', ['year'])[0],
+                years=_parse_range(query['years'][0]) if 'years' in query else None,
+                months=[int(m) for m in query['months'][0].split(',')] if 'months' in query else None,
+                days=_parse_range(query['days'][0]) if 'days' in query else None,
+            )
+        raise LookupError(path)
+
+    def response(self, target: str) -> Tuple[bytes, str]:
+        """
+        Get the encoded body and ETag for a request target.
+
+        Args:
+            target: Request path including the query string
+
+        Returns:
+            Tuple of (JSON body, ETag)
+        """
+        cached = self._responses.get(target)
+        if cached is not None:
+            return cached
+
+        url = urlsplit(target)
+        body = encode_json(self._payload(url.path, parse_qs(url.query)))
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        with self._lock:
+            if len(self._responses) < MAX_CACHED_RESPONSES:
+                self._responses[target] = (body, etag)
+        return body, etag
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """Request handler serving QueryStore responses."""
+
+    store: QueryStore = None
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def _send(self, status: HTTPStatus, body: bytes = b'', etag: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        try:
+            body, etag = self.store.response(self.path)
+        except LookupError as e:
+            if isinstance(e, KeyError):
+                message = str(e.args[0]) if e.args else 'Not found'
+            else:
+                message = f"Unknown endpoint: {self.path}"
+            self._send(HTTPStatus.NOT_FOUND, encode_json({'error': message}))
+            return
+        except ValueError as e:
+            self._send(HTTPStatus.BAD_REQUEST, encode_json({'error': str(e)}))
+            return
+
+        if self.headers.get('If-None-Match') == etag:
+            self._send(HTTPStatus.NOT_MODIFIED, etag=etag)
+        else:
+            self._send(HTTPStatus.OK, body, etag)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def make_server(store: QueryStore, host: str = DEFAULT_HOST,
+                port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """
+    Create a threaded HTTP server bound to a store.
+
+    Args:
+        store: Warm query store
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+
+    Returns:
+        Server ready for serve_forever()
+    """
+    handler = type('BoundQueryHandler', (QueryHandler,), {'store': store})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(filename: str = 'events.json', host: str = DEFAULT_HOST,
+          port: int = DEFAULT_PORT) -> None:
+    """
+    Load the data, warm the store and serve until interrupted.
+
+    Args:
+        filename: JSON file in data/raw/ (or an absolute path), or a shard
+            directory or glob
+        host: Interface to bind
+        port: Port to bind
+    """
+    store = QueryStore.from_file(filename)
+    server = make_server(store, host, port)
+    logger.info(f"Serving {len(store.data_by_year)} years on http://{host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Server stopped")
+    finally:
+        server.server_close()
@@ -1,5 +1,5 @@
 """Statistics module."""
 
-from . import descriptive, advanced
+from . import descriptive, advanced, forecast, simulation, rolling, detection, similarity, clustering
 
-__all__ = ['descriptive', 'advanced']
+__all__ = ['descriptive', 'advanced', 'forecast', 'simulation', 'rolling', 'detection', 'similarity', 'clustering']
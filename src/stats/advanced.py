@@ -2,16 +2,18 @@
 
 import statistics
 from typing import Dict, List, Tuple, Optional
-from scipy import stats as scipy_stats
-from scipy.stats import linregress, f_oneway, mannwhitneyu
+from scipy import special, stats as scipy_stats
+from scipy.stats import linregress, mannwhitneyu
 import numpy as np
 
-from .descriptive import total_per_month, total_avg, total
+from ..data.loader import observed_mask
+from .descriptive import monthly_counts, total_per_month, total_avg, total
+from . import forecast
 
 
 def linear_trend(data: List[List[int]]) -> Dict:
     """
-    Calculate linear regression trend across months.
+    Calculate linear regression trend across the observed months.
     
     Args:
         data: List of 12 months with daily events
@@ -19,9 +21,9 @@ def linear_trend(data: List[List[int]]) -> Dict:
     Returns:
         Dictionary with slope, intercept, r-value, p-value
     """
-    counts = total_per_month(data)
-    x = np.arange(len(counts))
-    y = np.array(counts)
+    counts = monthly_counts(data)
+    x = np.flatnonzero(~np.ma.getmaskarray(counts))
+    y = counts.compressed()
     
     slope, intercept, r_value, p_value, std_err = linregress(x, y)
     
@@ -41,6 +43,10 @@ def year_over_year_trend(years_data: Dict[int, List[List[int]]]) -> Dict:
     """
     Calculate trend of total events across years.
     
+    Partial years enter the regression with their total annualized over
+    the observed months; 'totals' reports the recorded totals and
+    'annualized_totals' the values actually regressed.
+    
     Args:
         years_data: Dictionary with year -> data mapping
         
@@ -49,15 +55,19 @@ def year_over_year_trend(years_data: Dict[int, List[List[int]]]) -> Dict:
     """
     sorted_years = sorted(years_data.keys())
     totals = [total(years_data[year]) for year in sorted_years]
+    months = np.array([len(years_data[year]) for year in sorted_years])
+    observed = np.array([observed_mask(years_data[year]).sum() for year in sorted_years])
     
     x = np.arange(len(sorted_years))
-    y = np.array(totals)
+    y = np.array(totals) * months / observed
     
     slope, intercept, r_value, p_value, std_err = linregress(x, y)
     
     return {
         'years': sorted_years,
         'totals': totals,
+        'annualized_totals': [round(float(v), 2) for v in y],
+        'partial_years': [year for year, n, m in zip(sorted_years, observed, months) if n < m],
         'slope': round(slope, 4),
         'intercept': round(intercept, 4),
         'r_squared': round(r_value ** 2, 4),
@@ -76,6 +86,8 @@ def seasonality_anova(years_data: Dict[int, List[List[int]]]) -> Dict:
     H0: All months have the same mean
     H1: At least one month differs significantly
     
+    Each month's group holds the years in which that month was observed.
+    
     Args:
         years_data: Dictionary with year -> data mapping
         
@@ -85,27 +97,99 @@ def seasonality_anova(years_data: Dict[int, List[List[int]]]) -> Dict:
     if not years_data:
         return {}
     
-    # Collect events per month across all years
-    month_groups = [[] for _ in range(12)]
+    _, matrix = monthly_count_matrix(years_data)
+    return month_anova(month_moments(matrix))
+
+
+def month_moments(matrix: np.ma.MaskedArray) -> Dict[str, np.ndarray]:
+    """
+    Per-month summary moments of a (rows x 12) masked count matrix.
     
-    for year_data in years_data.values():
-        for month_idx, month_events in enumerate(year_data):
-            month_groups[month_idx].append(len(month_events))
+    Moments of disjoint row sets combine with merge_month_moments, so
+    month_anova can run over data seen in batches.
     
-    # Perform ANOVA
-    f_stat, p_value = f_oneway(*month_groups)
+    Args:
+        matrix: Masked count matrix (see monthly_count_matrix)
+        
+    Returns:
+        Dictionary of 12-value arrays: 'count', 'mean', 'm2' (sum of squared
+        deviations), 'min' and 'max' (+/-inf for months never observed)
+    """
+    observed = ~np.ma.getmaskarray(matrix)
+    values = np.ma.getdata(matrix).astype(float)
+    count = observed.sum(axis=0).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(count > 0, np.where(observed, values, 0.0).sum(axis=0) / count, 0.0)
+    return {
+        'count': count,
+        'mean': mean,
+        'm2': (np.where(observed, values - mean, 0.0) ** 2).sum(axis=0),
+        'min': np.where(observed, values, np.inf).min(axis=0, initial=np.inf),
+        'max': np.where(observed, values, -np.inf).max(axis=0, initial=-np.inf),
+    }
+
+
+def merge_month_moments(left: Dict[str, np.ndarray], right: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Combine month moments of two disjoint row sets (Chan et al. update).
+    
+    Args:
+        left: Output of month_moments
+        right: Output of month_moments
+        
+    Returns:
+        Moments of the union
+    """
+    count = left['count'] + right['count']
+    delta = right['mean'] - left['mean']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(count > 0, left['mean'] + delta * right['count'] / count, 0.0)
+        m2 = left['m2'] + right['m2'] + np.where(count > 0,
+                                                 delta ** 2 * left['count'] * right['count'] / count, 0.0)
+    return {
+        'count': count,
+        'mean': mean,
+        'm2': m2,
+        'min': np.minimum(left['min'], right['min']),
+        'max': np.maximum(left['max'], right['max']),
+    }
+
+
+def month_anova(moments: Dict[str, np.ndarray]) -> Dict:
+    """
+    One-way ANOVA across calendar months from per-month moments.
+    
+    Args:
+        moments: Output of month_moments (or merged moments)
+        
+    Returns:
+        Dictionary with 'f_statistic', 'p_value', 'significant',
+        'month_stats' (months with data) and 'interpretation'
+    """
+    count, mean, m2 = moments['count'], moments['mean'], moments['m2']
+    groups = int((count > 0).sum())
+    total_count = count.sum()
+    
+    if groups < 2 or total_count <= groups:
+        f_stat = p_value = float('nan')
+    else:
+        grand_mean = (count * mean).sum() / total_count
+        between = (count * (mean - grand_mean) ** 2).sum() / (groups - 1)
+        within = m2.sum() / (total_count - groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            f_stat = float(between / within)
+        p_value = float(scipy_stats.f.sf(f_stat, groups - 1, total_count - groups))
     
-    # Calculate statistics per month
     month_stats = []
-    for month_idx, group in enumerate(month_groups):
-        if group:
-            month_stats.append({
-                'month': month_idx + 1,
-                'mean': round(statistics.mean(group), 2),
-                'stdev': round(statistics.stdev(group), 2) if len(group) > 1 else 0.0,
-                'min': min(group),
-                'max': max(group),
-            })
+    for month_idx in np.flatnonzero(count > 0):
+        n = count[month_idx]
+        month_stats.append({
+            'month': int(month_idx) + 1,
+            'mean': round(float(mean[month_idx]), 2),
+            'stdev': round(float(np.sqrt(m2[month_idx] / (n - 1))), 2) if n > 1 else 0.0,
+            'min': int(moments['min'][month_idx]),
+            'max': int(moments['max'][month_idx]),
+        })
     
     return {
         'f_statistic': round(f_stat, 4),
@@ -121,24 +205,29 @@ def seasonality_anova(years_data: Dict[int, List[List[int]]]) -> Dict:
 
 def bootstrap_confidence_interval(data: List[List[int]], 
                                    n_bootstrap: int = 10000,
-                                   confidence: float = 0.95) -> Dict:
+                                   confidence: float = 0.95,
+                                   seed: Optional[int] = None) -> Dict:
     """
     Calculate bootstrap confidence interval for mean events per month.
     
+    Only observed months are resampled.
+    
     Args:
         data: List of 12 months with daily events
         n_bootstrap: Number of bootstrap samples
         confidence: Confidence level (0.95 for 95% CI)
+        seed: Seed for reproducible resampling (default: numpy's global state)
         
     Returns:
         Dictionary with CI bounds and original mean
     """
-    counts = total_per_month(data)
+    counts = monthly_counts(data).compressed()
     original_mean = total_avg(data)
     
+    sampler = np.random if seed is None else np.random.default_rng(seed)
     bootstrap_means = []
     for _ in range(n_bootstrap):
-        sample = np.random.choice(counts, size=len(counts), replace=True)
+        sample = sampler.choice(counts, size=len(counts), replace=True)
         bootstrap_means.append(np.mean(sample))
     
     alpha = 1 - confidence
@@ -200,13 +289,17 @@ def correlation_between_years(years_data: Dict[int, List[List[int]]]) -> Dict:
     """
     Calculate Pearson correlation between adjacent years' monthly patterns.
     
+    Each pair is compared over the months observed in both years.
+    
     Args:
         years_data: Dictionary with year -> data mapping
         
     Returns:
         Dictionary with correlation matrix and statistics
     """
-    sorted_years = sorted(years_data.keys())
+    sorted_years, matrix = monthly_count_matrix(years_data)
+    counts = np.ma.getdata(matrix)
+    observed = ~np.ma.getmaskarray(matrix)
     
     correlations = []
     
@@ -214,10 +307,8 @@ def correlation_between_years(years_data: Dict[int, List[List[int]]]) -> Dict:
         year1 = sorted_years[i]
         year2 = sorted_years[i + 1]
         
-        counts1 = np.array(total_per_month(years_data[year1]))
-        counts2 = np.array(total_per_month(years_data[year2]))
-        
-        corr = round(np.corrcoef(counts1, counts2)[0, 1], 4)
+        both = observed[i] & observed[i + 1]
+        corr = round(np.corrcoef(counts[i, both], counts[i + 1, both])[0, 1], 4)
         
         correlations.append({
             'pair': f'{year1}-{year2}',
@@ -259,10 +350,9 @@ def mann_whitney_test(data_a: List[List[int]],
     Returns:
         Dictionary with test results
     """
-    counts_a = np.array(total_per_month(data_a))
-    counts_b = np.array(total_per_month(data_b))
-    
-    statistic, p_value = mannwhitneyu(counts_a, counts_b, alternative='two-sided')
+    counts = np.ma.vstack([monthly_counts(data_a), monthly_counts(data_b)])
+    pairs = pairwise_mann_whitney(counts, correction='none')
+    statistic, p_value = pairs['statistic'][0, 1], pairs['p_value'][0, 1]
     
     return {
         'statistic': round(statistic, 4),
@@ -275,6 +365,312 @@ def mann_whitney_test(data_a: List[List[int]],
     }
 
 
+P_VALUE_CORRECTIONS = ('holm', 'bh', 'bonferroni', 'none')
+
+
+def adjust_p_values(p_values: np.ndarray, method: str = 'holm') -> np.ndarray:
+    """
+    Correct p-values for multiple comparisons.
+    
+    Args:
+        p_values: P-values of the comparisons (NaN entries are ignored and
+            do not count as comparisons)
+        method: 'holm' (family-wise error, step-down), 'bh' (Benjamini-
+            Hochberg false discovery rate), 'bonferroni' or 'none'
+        
+    Returns:
+        Adjusted p-values with the input's shape
+        
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method not in P_VALUE_CORRECTIONS:
+        raise ValueError(f"Unknown correction {method!r}, expected one of {P_VALUE_CORRECTIONS}")
+    
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = p_values.copy()
+    valid = np.flatnonzero(~np.isnan(p_values))
+    m = len(valid)
+    if method == 'none' or m == 0:
+        return adjusted
+    
+    order = valid[np.argsort(p_values.flat[valid], kind='stable')]
+    ranked = p_values.flat[order]
+    if method == 'holm':
+        ranked = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    elif method == 'bh':
+        ranked = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        ranked = ranked * m
+    adjusted.flat[order] = np.minimum(ranked, 1.0)
+    return adjusted
+
+
+def pairwise_mann_whitney(matrix: np.ndarray, labels: Optional[List] = None,
+                          correction: str = 'holm', alpha: float = 0.05) -> Dict:
+    """
+    Two-sided Mann-Whitney U tests between every pair of rows of a count matrix.
+    
+    All observed values are ranked once (shared dense ranks); each row
+    becomes a histogram over those ranks, so the U statistics and tie
+    corrections of all pairs are matrix products instead of one rank
+    computation per pair. P-values match scipy's mannwhitneyu with
+    method='auto': normal approximation with tie and continuity
+    corrections, or the exact distribution for small samples without ties.
+    Cost is O(rows^2 x distinct values), small for monthly counts.
+    
+    Args:
+        matrix: 2-D array with one series (e.g. year) per row; masked (or
+            NaN) entries are unobserved months
+        labels: Row labels (default: row indices)
+        correction: Multiple-testing correction over the distinct pairs
+            (see adjust_p_values)
+        alpha: Significance level for the 'significant' flags
+        
+    Returns:
+        Dictionary with 'labels', 'statistic' (U of the row sample against
+        the column sample), 'p_value', 'p_adjusted' and boolean
+        'significant' (rows x rows) matrices, plus 'correction', 'alpha' and
+        'n_comparisons'; diagonal entries and pairs with an empty row are NaN
+        
+    Raises:
+        ValueError: If the correction is unknown or the matrix is not 2-D
+    """
+    if correction not in P_VALUE_CORRECTIONS:
+        raise ValueError(f"Unknown correction {correction!r}, expected one of {P_VALUE_CORRECTIONS}")
+    matrix = np.ma.filled(np.ma.asarray(matrix, dtype=float), np.nan)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a 2-D matrix, got shape {matrix.shape}")
+    
+    n_rows = len(matrix)
+    observed = ~np.isnan(matrix)
+    sizes = observed.sum(axis=1)
+    _, ranks = np.unique(matrix[observed], return_inverse=True)
+    n_ranks = int(ranks.max()) + 1 if len(ranks) else 0
+    row_of = np.repeat(np.arange(n_rows), sizes)
+    hist = np.bincount(row_of * n_ranks + ranks, minlength=n_rows * n_ranks).reshape(n_rows, n_ranks)
+    hist = hist.astype(float)
+    
+    # U[i, j] = #(x_i > x_j) + 0.5 * #(x_i == x_j) over all cross pairs
+    below = np.cumsum(hist, axis=1) - hist
+    statistic = hist @ (below + 0.5 * hist).T
+    # Tie term sum(t^3 - t) of every pooled pair, with t = h_i + h_j per rank
+    own = (hist ** 3 - hist).sum(axis=1)
+    squared = hist ** 2
+    cross = squared @ hist.T
+    tie_term = own[:, None] + own[None, :] + 3 * (cross + cross.T)
+    
+    n1 = sizes[:, None].astype(float)
+    n2 = sizes[None, :].astype(float)
+    n = n1 + n2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+        z = (np.maximum(statistic, statistic.T) - n1 * n2 / 2 - 0.5) / s
+        p_value = np.clip(special.ndtr(-z) * 2, 0.0, 1.0)
+    
+    # scipy's 'auto' uses the exact null distribution for small tie-free pairs
+    exact = (np.minimum(n1, n2) <= 8) & (tie_term == 0) & (n1 > 0) & (n2 > 0)
+    for i, j in zip(*np.nonzero(np.triu(exact, k=1))):
+        x, y = matrix[i][observed[i]], matrix[j][observed[j]]
+        p_value[i, j] = p_value[j, i] = mannwhitneyu(x, y, alternative='two-sided', method='exact').pvalue
+    
+    undefined = (n1 == 0) | (n2 == 0) | np.eye(n_rows, dtype=bool)
+    statistic[undefined] = np.nan
+    p_value[undefined] = np.nan
+    
+    upper = np.triu_indices(n_rows, k=1)
+    p_adjusted = np.full_like(p_value, np.nan)
+    p_adjusted[upper] = adjust_p_values(p_value[upper], correction)
+    p_adjusted = np.fmin(p_adjusted, p_adjusted.T)
+    
+    return {
+        'labels': list(labels) if labels is not None else list(range(n_rows)),
+        'statistic': statistic,
+        'p_value': p_value,
+        'p_adjusted': p_adjusted,
+        'significant': p_adjusted < alpha,
+        'correction': correction,
+        'alpha': alpha,
+        'n_comparisons': int((~np.isnan(p_value[upper])).sum()),
+    }
+
+
+def monthly_count_matrix(years_data: Dict[int, List[List[int]]]) -> Tuple[List[int], np.ndarray]:
+    """
+    Build the (years x months) matrix of monthly event counts.
+    
+    Args:
+        years_data: Dictionary with year -> data mapping
+        
+    Returns:
+        Tuple of (sorted years, masked count matrix with one row per year);
+        unobserved months are masked
+    """
+    sorted_years = sorted(years_data.keys())
+    matrix = np.array([total_per_month(years_data[year]) for year in sorted_years], dtype=float)
+    mask = np.array([observed_mask(years_data[year]) for year in sorted_years], dtype=bool)
+    shape = (len(sorted_years), matrix.size // max(len(sorted_years), 1))
+    return sorted_years, np.ma.masked_array(matrix.reshape(shape), mask=~mask.reshape(shape))
+
+
+def _shapiro_coefficients(n: int) -> np.ndarray:
+    """Shapiro-Wilk weights for sample size n (Royston 1995, AS R94)."""
+    m = special.ndtri((np.arange(1, n + 1) - 0.375) / (n + 0.25))
+    mm = m @ m
+    u = 1 / np.sqrt(n)
+    c = m / np.sqrt(mm)
+    
+    an = c[-1] + 0.221157 * u - 0.147981 * u ** 2 - 2.071190 * u ** 3 + 4.434685 * u ** 4 - 2.706056 * u ** 5
+    if n > 5:
+        an1 = c[-2] + 0.042981 * u - 0.293762 * u ** 2 - 1.752461 * u ** 3 + 5.682633 * u ** 4 - 3.582633 * u ** 5
+        phi = (mm - 2 * m[-1] ** 2 - 2 * m[-2] ** 2) / (1 - 2 * an ** 2 - 2 * an1 ** 2)
+        a = m / np.sqrt(phi)
+        a[-1], a[-2], a[0], a[1] = an, an1, -an, -an1
+    else:
+        phi = (mm - 2 * m[-1] ** 2) / (1 - 2 * an ** 2)
+        a = m / np.sqrt(phi)
+        a[-1], a[0] = an, -an
+    return a
+
+
+def _shapiro_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Shapiro-Wilk per row.
+    
+    All rows share the sample size, so the weights and Royston's normalizing
+    transform are computed once and W is a single matrix-vector product.
+    Sizes outside the approximation's range (n < 4, n > 5000) fall back to
+    a per-row scipy loop.
+    """
+    n = matrix.shape[1]
+    if not 4 <= n <= 5000:
+        results = np.array([scipy_stats.shapiro(row) for row in matrix], dtype=float)
+        return results[:, 0], results[:, 1]
+    
+    ordered = np.sort(matrix, axis=1)
+    ssq = ((ordered - ordered.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    constant = ssq == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w = np.minimum((ordered @ _shapiro_coefficients(n)) ** 2 / ssq, 1.0)
+        if n >= 12:
+            log_n = np.log(n)
+            mu = -1.5861 - 0.31082 * log_n - 0.083751 * log_n ** 2 + 0.0038915 * log_n ** 3
+            sigma = np.exp(-0.4803 - 0.082676 * log_n + 0.0030302 * log_n ** 2)
+            z = (np.log1p(-w) - mu) / sigma
+        else:
+            gamma = -2.273 + 0.459 * n
+            mu = 0.5440 - 0.39978 * n + 0.025054 * n ** 2 - 0.0006714 * n ** 3
+            sigma = np.exp(1.3822 - 0.77857 * n + 0.062767 * n ** 2 - 0.0020322 * n ** 3)
+            z = (-np.log(gamma - np.log1p(-w)) - mu) / sigma
+        p_value = special.ndtr(-z)
+    
+    # scipy reports W = 1, p = 1 for zero-range input
+    return np.where(constant, 1.0, w), np.where(constant, 1.0, p_value)
+
+
+def _jarque_bera_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Jarque-Bera per row from axis-aware skewness and kurtosis."""
+    n = matrix.shape[1]
+    skewness = scipy_stats.skew(matrix, axis=1)
+    kurtosis = scipy_stats.kurtosis(matrix, axis=1)
+    statistic = n / 6 * (skewness ** 2 + kurtosis ** 2 / 4)
+    return statistic, scipy_stats.chi2.sf(statistic, 2)
+
+
+def _dagostino_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """D'Agostino-Pearson K^2 per row."""
+    statistic, p_value = scipy_stats.normaltest(matrix, axis=1)
+    return np.asarray(statistic), np.asarray(p_value)
+
+
+def _anderson_rows(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Anderson-Darling A^2 per row for a normal with estimated parameters.
+    
+    p-values use the D'Agostino & Stephens (1986) approximation on the
+    small-sample adjusted statistic.
+    """
+    n = matrix.shape[1]
+    ordered = np.sort(matrix, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (ordered - ordered.mean(axis=1, keepdims=True)) / ordered.std(axis=1, ddof=1, keepdims=True)
+    weights = 2 * np.arange(1, n + 1) - 1
+    log_cdf = special.log_ndtr(z)
+    log_sf = special.log_ndtr(-z[:, ::-1])
+    a2 = -n - (weights * (log_cdf + log_sf)).sum(axis=1) / n
+    
+    adjusted = a2 * (1 + 0.75 / n + 2.25 / n ** 2)
+    p_value = np.select(
+        [adjusted >= 0.6, adjusted >= 0.34, adjusted >= 0.2],
+        [
+            np.exp(1.2937 - 5.709 * adjusted + 0.0186 * adjusted ** 2),
+            np.exp(0.9177 - 4.279 * adjusted - 1.38 * adjusted ** 2),
+            1 - np.exp(-8.318 + 42.796 * adjusted - 59.938 * adjusted ** 2),
+        ],
+        default=1 - np.exp(-13.436 + 101.14 * adjusted - 223.73 * adjusted ** 2),
+    )
+    p_value = np.where(np.isnan(adjusted), np.nan, np.clip(p_value, 0.0, 1.0))
+    return a2, p_value
+
+
+NORMALITY_TESTS = {
+    'shapiro': _shapiro_rows,
+    'jarque_bera': _jarque_bera_rows,
+    'dagostino': _dagostino_rows,
+    'anderson': _anderson_rows,
+}
+
+
+def batch_normality_test(matrix: np.ndarray, method: str = 'shapiro',
+                         alpha: float = 0.05) -> Dict[str, np.ndarray]:
+    """
+    Test normality of every row of a (series x months) count matrix.
+    
+    Every method runs as array operations over all rows at once;
+    Shapiro-Wilk uses Royston's approximation with weights computed once
+    for the shared sample size. Masked (or NaN) entries are unobserved
+    months: rows are tested on their observed values, batched by the
+    number of observed months.
+    
+    Args:
+        matrix: 2-D array with one series (e.g. year) per row
+        method: 'shapiro', 'jarque_bera', 'dagostino' or 'anderson'
+        alpha: Significance level for the 'normal' flags
+        
+    Returns:
+        Dictionary with 'statistic', 'p_value' and boolean 'normal' arrays
+        (NaN statistic and p-value for rows with fewer than 3 observed
+        months)
+        
+    Raises:
+        ValueError: If the method is unknown or the matrix is not 2-D
+    """
+    if method not in NORMALITY_TESTS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {sorted(NORMALITY_TESTS)}")
+    
+    matrix = np.ma.filled(np.ma.asarray(matrix, dtype=float), np.nan)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a 2-D matrix, got shape {matrix.shape}")
+    
+    if matrix.shape[0] == 0:
+        empty = np.empty(0)
+        return {'statistic': empty, 'p_value': empty, 'normal': empty.astype(bool)}
+    
+    observed = ~np.isnan(matrix)
+    n_observed = observed.sum(axis=1)
+    statistic = np.full(len(matrix), np.nan)
+    p_value = np.full(len(matrix), np.nan)
+    for n in np.unique(n_observed[n_observed >= 3]):
+        rows = np.flatnonzero(n_observed == n)
+        compact = matrix[rows][observed[rows]].reshape(len(rows), n)
+        statistic[rows], p_value[rows] = NORMALITY_TESTS[method](compact)
+    return {
+        'statistic': statistic,
+        'p_value': p_value,
+        'normal': p_value > alpha,
+    }
+
+
 def normality_test(data: List[List[int]]) -> Dict:
     """
     Shapiro-Wilk test for normality of monthly event counts.
@@ -285,9 +681,10 @@ def normality_test(data: List[List[int]]) -> Dict:
     Returns:
         Dictionary with test results
     """
-    counts = np.array(total_per_month(data))
+    counts = np.array([monthly_counts(data).compressed()], dtype=float)
     
-    statistic, p_value = scipy_stats.shapiro(counts)
+    result = batch_normality_test(counts, method='shapiro')
+    statistic, p_value = result['statistic'][0], result['p_value'][0]
     
     return {
         'statistic': round(statistic, 4),
@@ -300,12 +697,19 @@ def normality_test(data: List[List[int]]) -> Dict:
     }
 
 
-def predictive_summary(years_data: Dict[int, List[List[int]]]) -> Dict:
+def predictive_summary(years_data: Dict[int, List[List[int]]],
+                       model: str = 'seasonal_naive', **model_options) -> Dict:
     """
     Generate summary statistics useful for prediction.
     
+    The next year is projected with a model from stats.forecast, fit on the
+    chronological monthly series. The default seasonal naive model averages
+    each month over the three most recent years.
+    
     Args:
         years_data: Dictionary with year -> data mapping
+        model: 'seasonal_naive', 'holt_winters' or 'sarima'
+        **model_options: Options passed to the forecasting model
         
     Returns:
         Dictionary with predictive metrics
@@ -313,22 +717,18 @@ def predictive_summary(years_data: Dict[int, List[List[int]]]) -> Dict:
     trend = year_over_year_trend(years_data)
     seasonality = seasonality_anova(years_data)
     
-    sorted_years = sorted(years_data.keys())
-    recent_years_data = list(years_data.values())[-3:] if len(years_data) >= 3 else list(years_data.values())
-    
-    # Calculate average monthly pattern from recent years
-    avg_per_month_recent = []
-    for month_idx in range(12):
-        month_totals = [len(year_data[month_idx]) for year_data in recent_years_data]
-        avg_per_month_recent.append(round(statistics.mean(month_totals), 2))
+    _, series = forecast.monthly_series(years_data)
+    projected = forecast.make_model(model, **model_options).fit(series).forecast(12)[0]
+    monthly_pattern = [round(float(v), 2) for v in projected]
     
     return {
         'trend_direction': trend['trend'],
         'trend_significance': trend['significant'],
         'trend_slope': trend['slope'],
         'seasonality_detected': seasonality['significant'],
-        'avg_monthly_pattern_recent': avg_per_month_recent,
-        'expected_annual_total': round(sum(avg_per_month_recent), 2),
+        'forecast_model': model,
+        'avg_monthly_pattern_recent': monthly_pattern,
+        'expected_annual_total': round(sum(monthly_pattern), 2),
     }
 
 
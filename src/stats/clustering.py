@@ -0,0 +1,276 @@
+"""
+Clustering of years and series by the shape of their monthly profile.
+
+Profiles are the monthly counts of every year (or (series, year) pair),
+centered and scaled to unit length (similarity.normalize_profiles with the
+'correlation' metric), so the squared Euclidean distance between two rows
+is 2 * (1 - Pearson r) and clusters group items with correlated seasonal
+shapes regardless of their volume.
+
+    kmeans        - mini-batch k-means (running-mean centroid updates);
+                    profiles are built batch by batch, so memory stays
+                    flat in the number of items
+    hierarchical  - agglomerative clustering of the precomputed
+                    correlation distance matrix (O(items^2) memory)
+
+Each cluster keeps per-month moments of its members' raw counts, so its
+seasonal summary is advanced.month_anova, and new items can be assigned
+(and folded in) incrementally.
+"""
+
+import logging
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.spatial.distance import squareform
+
+from ..data.loader import EXPECTED_MONTHS
+from .advanced import merge_month_moments, month_anova, month_moments
+from .descriptive import monthly_counts
+from .similarity import normalize_profiles, profile_items, profile_vector
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('kmeans', 'hierarchical')
+
+DEFAULT_BATCH_SIZE = 1024
+
+# Items above which hierarchical clustering warns about its O(n^2) matrix
+HIERARCHICAL_WARN_SIZE = 5000
+
+
+def profile_batches(items: Dict[Hashable, List[List[int]]], batch_size: int = DEFAULT_BATCH_SIZE
+                    ) -> Iterator[Tuple[List[Hashable], np.ndarray, np.ma.MaskedArray]]:
+    """
+    Build clustering profiles batch by batch.
+
+    Args:
+        items: Key -> months mapping (see similarity.profile_items)
+        batch_size: Items per batch
+
+    Yields:
+        Tuples of (keys, normalized profiles, masked raw monthly counts)
+    """
+    keys = list(items.keys())
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start:start + batch_size]
+        raw = np.array([profile_vector(items[key], 'monthly') for key in batch])
+        counts = np.ma.vstack([monthly_counts(items[key]) for key in batch])
+        yield batch, normalize_profiles(raw, 'correlation'), counts
+
+
+def _sq_distances(rows: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Squared Euclidean distances between rows and centers."""
+    return np.maximum((rows ** 2).sum(axis=1)[:, None] + (centers ** 2).sum(axis=1)[None, :]
+                      - 2 * rows @ centers.T, 0.0)
+
+
+def _kmeans_plus_plus(rows: np.ndarray, n_clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Initial centers drawn with k-means++ seeding."""
+    centers = [rows[rng.integers(len(rows))]]
+    closest = _sq_distances(rows, centers[0][np.newaxis, :])[:, 0]
+    for _ in range(1, n_clusters):
+        total = closest.sum()
+        index = rng.choice(len(rows), p=closest / total) if total > 0 else rng.integers(len(rows))
+        centers.append(rows[index])
+        closest = np.minimum(closest, _sq_distances(rows, rows[index][np.newaxis, :])[:, 0])
+    return np.array(centers)
+
+
+class SeasonalClusters:
+    """
+    Clusters of monthly profile shapes with per-cluster seasonal moments.
+
+    After fit(), `labels` maps every item to its cluster and summary()
+    describes each cluster. assign() places new items in the nearest
+    cluster; with update=True it also moves k-means centers and adds the
+    items to the cluster summaries.
+    """
+
+    def __init__(self, n_clusters: int = 8, method: str = 'kmeans',
+                 batch_size: int = DEFAULT_BATCH_SIZE, n_epochs: int = 5,
+                 linkage_method: str = 'average', seed: int = 0):
+        """
+        Args:
+            n_clusters: Number of clusters
+            method: 'kmeans' or 'hierarchical'
+            batch_size: Items per mini-batch (and per profile batch)
+            n_epochs: Passes over the data for mini-batch k-means
+            linkage_method: scipy linkage method for hierarchical clustering
+            seed: Seed for k-means initialization and batch order
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+        self.n_clusters = n_clusters
+        self.method = method
+        self.batch_size = batch_size
+        self.n_epochs = n_epochs
+        self.linkage_method = linkage_method
+        self.rng = np.random.default_rng(seed)
+        self.centers: Optional[np.ndarray] = None
+        self.labels: Dict[Hashable, int] = {}
+        self._center_counts = np.zeros(0)
+        self._moments: List[Dict[str, np.ndarray]] = []
+
+    def fit(self, store: Dict) -> 'SeasonalClusters':
+        """
+        Cluster every item of a store.
+
+        Args:
+            store: year -> months mapping, or series -> year -> months mapping
+
+        Returns:
+            self
+
+        Raises:
+            ValueError: If the store is empty
+        """
+        items = profile_items(store)
+        if not items:
+            raise ValueError("Cannot cluster an empty store")
+        n_clusters = min(self.n_clusters, len(items))
+
+        if self.method == 'kmeans':
+            self._fit_kmeans(items, n_clusters)
+            labels = None
+        else:
+            labels = self._fit_hierarchical(items, n_clusters)
+
+        self.labels = {}
+        self._moments = [month_moments(np.ma.masked_all((0, EXPECTED_MONTHS))) for _ in self.centers]
+        self._center_counts = np.zeros(len(self.centers))
+        self._assign_items(items, update_centers=False, labels=labels)
+        logger.info(f"Clustered {len(items)} items into {len(self.centers)} clusters ({self.method})")
+        return self
+
+    def _fit_kmeans(self, items: Dict[Hashable, List[List[int]]], n_clusters: int) -> None:
+        """Mini-batch k-means over shuffled profile batches."""
+        keys = list(items.keys())
+        self.centers = None
+        counts = np.zeros(n_clusters)
+        for _ in range(self.n_epochs):
+            order = self.rng.permutation(len(keys))
+            shuffled = {keys[i]: items[keys[i]] for i in order}
+            for _, rows, _ in profile_batches(shuffled, self.batch_size):
+                if self.centers is None:
+                    self.centers = _kmeans_plus_plus(rows, min(n_clusters, len(rows)), self.rng)
+                    if len(self.centers) < n_clusters:
+                        extra = self.rng.choice(len(rows), n_clusters - len(self.centers))
+                        self.centers = np.vstack([self.centers, rows[extra]])
+                counts = self._update_centers(rows, counts)
+
+    def _update_centers(self, rows: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Move each center to the running mean of the rows assigned to it."""
+        labels = _sq_distances(rows, self.centers).argmin(axis=1)
+        sizes = np.bincount(labels, minlength=len(self.centers)).astype(float)
+        sums = np.zeros_like(self.centers)
+        np.add.at(sums, labels, rows)
+        counts = counts + sizes
+        moved = sizes > 0
+        self.centers[moved] += (sums[moved] - sizes[moved, None] * self.centers[moved]) / counts[moved, None]
+        return counts
+
+    def _fit_hierarchical(self, items: Dict[Hashable, List[List[int]]], n_clusters: int) -> np.ndarray:
+        """Agglomerative clustering of the correlation distance matrix; returns item labels."""
+        if len(items) > HIERARCHICAL_WARN_SIZE:
+            logger.warning(f"Hierarchical clustering of {len(items)} items builds a "
+                           f"{len(items)}x{len(items)} distance matrix; consider method='kmeans'")
+        rows = np.vstack([batch for _, batch, _ in profile_batches(items, self.batch_size)])
+        if len(rows) < 2:
+            self.centers = rows.copy()
+            return np.zeros(len(rows), dtype=np.int64)
+        distances = np.clip(1.0 - rows @ rows.T, 0.0, 2.0)
+        np.fill_diagonal(distances, 0.0)
+        tree = linkage(squareform(distances, checks=False), method=self.linkage_method)
+        # fcluster may return fewer clusters than requested (ties)
+        clusters, labels = np.unique(fcluster(tree, n_clusters, criterion='maxclust'), return_inverse=True)
+        self.centers = np.array([rows[labels == c].mean(axis=0) for c in range(len(clusters))])
+        return labels
+
+    def assign(self, store: Dict, update: bool = True) -> Dict[Hashable, int]:
+        """
+        Place new items in their nearest cluster.
+
+        Args:
+            store: year -> months mapping, or series -> year -> months mapping
+            update: Also fold the items into the clusters (k-means centers
+                move, summaries include them)
+
+        Returns:
+            Dictionary item key -> cluster
+
+        Raises:
+            ValueError: If the model has not been fitted
+        """
+        if self.centers is None:
+            raise ValueError("SeasonalClusters.fit() must be called before assign()")
+        items = profile_items(store)
+        if not update:
+            return {key: int(label) for keys, rows, _ in profile_batches(items, self.batch_size)
+                    for key, label in zip(keys, _sq_distances(rows, self.centers).argmin(axis=1))}
+        return self._assign_items(items, update_centers=self.method == 'kmeans')
+
+    def _assign_items(self, items: Dict[Hashable, List[List[int]]], update_centers: bool,
+                      labels: Optional[np.ndarray] = None) -> Dict[Hashable, int]:
+        """Label items batch by batch (or use given labels) and accumulate cluster moments."""
+        assigned = {}
+        fixed = labels
+        for start, (keys, rows, counts) in zip(range(0, len(items), self.batch_size),
+                                                profile_batches(items, self.batch_size)):
+            if update_centers:
+                self._center_counts = self._update_centers(rows, self._center_counts)
+            if fixed is None:
+                labels = _sq_distances(rows, self.centers).argmin(axis=1)
+            else:
+                labels = fixed[start:start + len(keys)]
+            if not update_centers:
+                self._center_counts += np.bincount(labels, minlength=len(self.centers))
+            for cluster in np.unique(labels):
+                self._moments[cluster] = merge_month_moments(self._moments[cluster],
+                                                             month_moments(counts[labels == cluster]))
+            assigned.update(zip(keys, labels.tolist()))
+        self.labels.update(assigned)
+        return assigned
+
+    def summary(self) -> List[Dict]:
+        """
+        Per-cluster summaries.
+
+        Returns:
+            One dictionary per cluster with 'cluster', 'size', 'profile'
+            (centroid shape, unit scale), 'members' (first 10 keys) and
+            'seasonality' (advanced.month_anova of the members' counts)
+        """
+        members: Dict[int, List[Hashable]] = {}
+        for key, label in self.labels.items():
+            members.setdefault(label, []).append(key)
+        return [
+            {
+                'cluster': cluster,
+                'size': len(members.get(cluster, [])),
+                'profile': np.round(normalize_profiles(self.centers[cluster:cluster + 1], 'correlation')[0],
+                                    4).tolist(),
+                'members': members.get(cluster, [])[:10],
+                'seasonality': month_anova(self._moments[cluster]),
+            }
+            for cluster in range(len(self.centers))
+        ]
+
+
+def cluster_profiles(store: Dict, n_clusters: int = 8, method: str = 'kmeans', **kwargs) -> Dict:
+    """
+    Cluster a store by monthly profile shape.
+
+    Args:
+        store: year -> months mapping, or series -> year -> months mapping
+        n_clusters: Number of clusters
+        method: 'kmeans' or 'hierarchical'
+        **kwargs: Other SeasonalClusters options
+
+    Returns:
+        Dictionary with 'method', 'labels' (item key -> cluster) and
+        'clusters' (see SeasonalClusters.summary)
+    """
+    model = SeasonalClusters(n_clusters, method, **kwargs).fit(store)
+    return {'method': method, 'labels': dict(model.labels), 'clusters': model.summary()}
@@ -4,13 +4,18 @@ import collections
 import statistics
 from typing import Dict, List, Tuple
 
-from ..data.loader import MONTHS
+import numpy as np
+
+from ..data.loader import MONTHS, is_complete, observed_mask
 
 
 def total_per_month(data: List[List[int]]) -> List[int]:
     """
     Calculate total events per month.
     
+    Unobserved months of a partial year count as 0; use monthly_counts to
+    tell them apart.
+    
     Args:
         data: List of 12 months with daily events
         
@@ -20,6 +25,22 @@ def total_per_month(data: List[List[int]]) -> List[int]:
     return [len(m) for m in data]
 
 
+def monthly_counts(data: List[List[int]]) -> np.ma.MaskedArray:
+    """
+    Events per month as a masked array.
+    
+    Months that were not observed (see loader.YearEvents) are masked, so
+    reductions over the result only see recorded months.
+    
+    Args:
+        data: List of 12 months with daily events
+        
+    Returns:
+        Masked integer array with one count per month
+    """
+    return np.ma.masked_array(total_per_month(data), mask=~observed_mask(data))
+
+
 def total(data: List[List[int]]) -> int:
     """
     Calculate total events across all months.
@@ -35,7 +56,7 @@ def total(data: List[List[int]]) -> int:
 
 def total_avg(data: List[List[int]]) -> float:
     """
-    Calculate average events per month.
+    Calculate average events per observed month.
     
     Args:
         data: List of 12 months with daily events
@@ -43,38 +64,36 @@ def total_avg(data: List[List[int]]) -> float:
     Returns:
         Average rounded to 2 decimals
     """
-    counts = total_per_month(data)
+    counts = list(_observed_counts(data).values())
     return round(sum(counts) / len(counts), 2) if counts else 0.0
 
 
 def peak_month(data: List[List[int]]) -> str:
     """
-    Find month with highest events.
+    Find observed month with highest events.
     
     Args:
         data: List of 12 months with daily events
         
     Returns:
-        Month name with maximum events
+        Month name with maximum events (first one on ties)
     """
-    counts = total_per_month(data)
-    idx = max(range(len(counts)), key=lambda i: counts[i])
-    return MONTHS[idx]
+    counts = _observed_counts(data)
+    return MONTHS[max(counts, key=counts.get, default=0)]
 
 
 def lowest_month(data: List[List[int]]) -> str:
     """
-    Find month with lowest events.
+    Find observed month with lowest events.
     
     Args:
         data: List of 12 months with daily events
         
     Returns:
-        Month name with minimum events
+        Month name with minimum events (first one on ties)
     """
-    counts = total_per_month(data)
-    idx = min(range(len(counts)), key=lambda i: counts[i])
-    return MONTHS[idx]
+    counts = _observed_counts(data)
+    return MONTHS[min(counts, key=counts.get, default=0)]
 
 
 def top_repeated_days(data: List[List[int]], n: int = 3) -> List[Tuple[int, int]]:
@@ -138,7 +157,7 @@ def unique_days_total(data: List[List[int]]) -> int:
 
 def avg_unique_days(years_data: List[List[List[int]]]) -> float:
     """
-    Calculate average unique days per year across all years.
+    Calculate average unique days per observed month across all years.
     
     Args:
         years_data: List of yearly data
@@ -146,7 +165,7 @@ def avg_unique_days(years_data: List[List[List[int]]]) -> float:
     Returns:
         Average rounded to 2 decimals
     """
-    all_uniques = [u for data in years_data for u in unique_days_per_month(data)]
+    all_uniques = [u for data in years_data for u in _observed(unique_days_per_month(data), data).values()]
     return round(statistics.mean(all_uniques), 2) if all_uniques else 0.0
 
 
@@ -169,7 +188,7 @@ def common_days_across_years(years_data: List[List[List[int]]]) -> List[int]:
 
 def std_dev_events_per_month(data: List[List[int]]) -> float:
     """
-    Calculate standard deviation of events per month.
+    Calculate standard deviation of events per observed month.
     
     Args:
         data: List of 12 months with daily events
@@ -177,7 +196,7 @@ def std_dev_events_per_month(data: List[List[int]]) -> float:
     Returns:
         Standard deviation rounded to 2 decimals
     """
-    counts = total_per_month(data)
+    counts = list(_observed_counts(data).values())
     return round(statistics.stdev(counts), 2) if len(counts) > 1 else 0.0
 
 
@@ -214,12 +233,85 @@ def jaccard_similarity_days(a: List[List[int]], b: List[List[int]]) -> float:
     Returns:
         Similarity score 0.0-1.0, rounded to 2 decimals
     """
-    sa = {d for m in a for d in m}
-    sb = {d for m in b for d in m}
+    return _jaccard({d for m in a for d in m}, {d for m in b for d in m})
+
+
+def _observed(values: List, data: List[List[int]]) -> Dict[int, object]:
+    """
+    Per-month values of the observed months, keyed by month index in order.
+    
+    Every observed-months statistic reads its values through here; complete
+    years skip the mask entirely.
+    """
+    if is_complete(data):
+        return dict(enumerate(values))
+    return {i: value for i, (value, seen) in enumerate(zip(values, observed_mask(data))) if seen}
+
+
+def _observed_counts(data: List[List[int]]) -> Dict[int, int]:
+    """Event counts of the observed months, keyed by month index."""
+    return _observed(total_per_month(data), data)
+
+
+def _jaccard(sa, sb) -> float:
+    """Jaccard similarity of two day sets, rounded to 2 decimals."""
     union = sa | sb
     return round(len(sa & sb) / len(union), 2) if union else 0.0
 
 
+def year_summary(data: List[List[int]], n: int = 3) -> Dict:
+    """
+    Compute every per-year metric of view_data in a single pass.
+    
+    Each month is visited once to get its count, its unique days and to
+    feed one shared day Counter; everything else is derived from those.
+    Results match the individual functions exactly, including tie order.
+    Per-month statistics only use observed months; unobserved months are
+    None in 'per_month' and 'unique_per_month'.
+    
+    Args:
+        data: List of 12 months with daily events
+        n: Number of top/bottom days to return
+        
+    Returns:
+        Dictionary with total, avg_per_month, per_month, peak_month,
+        lowest_month, top_days, bottom_days, unique_per_month, unique_days,
+        std_dev, cv, observed_months and the set of days with events
+    """
+    per_month = []
+    unique_per_month = []
+    counter = collections.Counter()
+    for month in data:
+        per_month.append(len(month))
+        unique_per_month.append(len(set(month)))
+        counter.update(month)
+    
+    counts = _observed(per_month, data)
+    uniques = _observed(unique_per_month, data)
+    observed_counts = list(counts.values())
+    
+    total_events = sum(observed_counts)
+    avg = round(total_events / len(observed_counts), 2) if observed_counts else 0.0
+    stdev = round(statistics.stdev(observed_counts), 2) if len(observed_counts) > 1 else 0.0
+    bottom = sorted(((day, counter.get(day, 0)) for day in range(1, 32)), key=lambda x: (x[1], x[0]))
+    
+    return {
+        'total': total_events,
+        'avg_per_month': avg,
+        'per_month': [counts.get(i) for i in range(len(per_month))],
+        'peak_month': MONTHS[max(counts, key=counts.get, default=0)],
+        'lowest_month': MONTHS[min(counts, key=counts.get, default=0)],
+        'top_days': counter.most_common(n),
+        'bottom_days': bottom[:n],
+        'unique_per_month': [uniques.get(i) for i in range(len(unique_per_month))],
+        'unique_days': len(counter),
+        'std_dev': stdev,
+        'cv': round((stdev / avg) * 100, 2) if avg else 0.0,
+        'observed_months': len(observed_counts),
+        'days': frozenset(counter),
+    }
+
+
 def compare_years(a: List[List[int]], b: List[List[int]], 
                   ya: int, yb: int) -> Dict:
     """
@@ -234,22 +326,23 @@ def compare_years(a: List[List[int]], b: List[List[int]],
     Returns:
         Dictionary with comparison metrics
     """
+    sa, sb = year_summary(a), year_summary(b)
     return {
         'years': (ya, yb),
-        'total_events': (total(a), total(b)),
-        'avg_per_month': (total_avg(a), total_avg(b)),
-        'std_dev': (std_dev_events_per_month(a), std_dev_events_per_month(b)),
-        'cv': (coefficient_of_variation(a), coefficient_of_variation(b)),
-        'jaccard_days': jaccard_similarity_days(a, b),
+        'total_events': (sa['total'], sb['total']),
+        'avg_per_month': (sa['avg_per_month'], sb['avg_per_month']),
+        'std_dev': (sa['std_dev'], sb['std_dev']),
+        'cv': (sa['cv'], sb['cv']),
+        'jaccard_days': _jaccard(sa['days'], sb['days']),
         ya: {
-            'top3': top_repeated_days(a),
-            'bottom3': least_repeated_days(a),
-            'unique_days': unique_days_total(a),
+            'top3': sa['top_days'],
+            'bottom3': sa['bottom_days'],
+            'unique_days': sa['unique_days'],
         },
         yb: {
-            'top3': top_repeated_days(b),
-            'bottom3': least_repeated_days(b),
-            'unique_days': unique_days_total(b),
+            'top3': sb['top_days'],
+            'bottom3': sb['bottom_days'],
+            'unique_days': sb['unique_days'],
         },
     }
 
@@ -263,13 +356,14 @@ def view_data(data: List[List[int]], year: int = None) -> None:
         year: Year number (for display)
     """
     year_str = f" ({year})" if year else ""
-    print(f'Total: {total(data)}{year_str}')
-    print(f'Total AVG: {total_avg(data)}/month')
-    print(f'Total per months: {total_per_month(data)}')
-    print(f'Highest month: {peak_month(data)}')
-    print(f'Lowest month: {lowest_month(data)}')
-    print(f'Top 3 repeated days: {top_repeated_days(data)}')
-    print(f'Bottom 3 least frequent days: {least_repeated_days(data)}')
-    print(f'Unique days per month: {unique_days_per_month(data)}')
-    print(f'Standard deviation: {std_dev_events_per_month(data)}')
-    print(f'Coefficient of variation: {coefficient_of_variation(data)}%')
+    summary = year_summary(data)
+    print(f'Total: {summary["total"]}{year_str}')
+    print(f'Total AVG: {summary["avg_per_month"]}/month')
+    print(f'Total per months: {summary["per_month"]}')
+    print(f'Highest month: {summary["peak_month"]}')
+    print(f'Lowest month: {summary["lowest_month"]}')
+    print(f'Top 3 repeated days: {summary["top_days"]}')
+    print(f'Bottom 3 least frequent days: {summary["bottom_days"]}')
+    print(f'Unique days per month: {summary["unique_per_month"]}')
+    print(f'Standard deviation: {summary["std_dev"]}')
+    print(f'Coefficient of variation: {summary["cv"]}%')
@@ -0,0 +1,440 @@
+"""
+Change-point and anomaly detection over monthly event counts.
+
+Change points are found with PELT or binary segmentation on segment
+costs evaluated in O(1) from prefix sums. Anomalies are robust z-scores
+(median/MAD) of raw counts or of the residuals of a robust seasonal
+decomposition, computed for a whole (series x months) matrix at once.
+StreamingDetector scores new months as they arrive.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .forecast import SEASON_LENGTH, monthly_series
+from .rolling import window_view
+
+DEFAULT_THRESHOLD = 3.5
+DEFAULT_MIN_SIZE = 3
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+SCALE_EPS = 1e-9
+
+
+class SegmentCost:
+    """
+    Segment cost (twice the negative log-likelihood, up to constants) of a
+    constant-rate model, evaluated from prefix sums.
+
+    'poisson' suits raw counts; 'normal' assumes a shared variance estimated
+    robustly from first differences.
+    """
+
+    def __init__(self, values, cost: str = 'poisson'):
+        """
+        Args:
+            values: 1-D series
+            cost: 'poisson' or 'normal'
+        """
+        if cost not in ('poisson', 'normal'):
+            raise ValueError(f"Unknown cost {cost!r}, expected 'poisson' or 'normal'")
+        values = np.asarray(values, dtype=float)
+        self.cost = cost
+        self.n = len(values)
+        self.s1 = np.concatenate([[0.0], np.cumsum(values)])
+        self.s2 = np.concatenate([[0.0], np.cumsum(values ** 2)])
+        if cost == 'normal':
+            diffs = np.diff(values)
+            sigma = MAD_SCALE * np.median(np.abs(diffs - np.median(diffs))) / np.sqrt(2) if len(diffs) else 0.0
+            self.variance = sigma ** 2 if sigma > 0 else (values.var() or 1.0)
+
+    def __call__(self, start, stop) -> np.ndarray:
+        """Cost of the segments [start, stop) (array arguments broadcast)."""
+        start = np.asarray(start)
+        stop = np.asarray(stop)
+        length = (stop - start).astype(float)
+        total = self.s1[stop] - self.s1[start]
+        if self.cost == 'normal':
+            return (self.s2[stop] - self.s2[start] - total ** 2 / length) / self.variance
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, -2 * total * np.log(total / length), 0.0)
+
+    def default_penalty(self) -> float:
+        """BIC-style penalty for one extra change point."""
+        return 2 * np.log(max(self.n, 2))
+
+
+def pelt(values, penalty: Optional[float] = None, cost: str = 'poisson',
+         min_size: int = DEFAULT_MIN_SIZE) -> List[int]:
+    """
+    Optimal change points under a linear penalty (PELT with pruning).
+
+    Args:
+        values: 1-D series
+        penalty: Cost added per change point (default: 2 log n)
+        cost: 'poisson' or 'normal'
+        min_size: Minimum segment length
+
+    Returns:
+        Sorted indices where a new segment starts
+    """
+    segment_cost = SegmentCost(values, cost)
+    n = segment_cost.n
+    penalty = segment_cost.default_penalty() if penalty is None else penalty
+    if n < 2 * min_size:
+        return []
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    last = np.zeros(n + 1, dtype=int)
+    candidates = np.array([0])
+    # A candidate dominated at time t can still be optimal until a segment
+    # starting at t is long enough, so pruning takes effect min_size later.
+    pruned: Dict[int, np.ndarray] = {}
+
+    for t in range(min_size, n + 1):
+        if t - min_size in pruned:
+            candidates = candidates[~np.isin(candidates, pruned.pop(t - min_size))]
+        partial = best[candidates] + segment_cost(candidates, t)
+        idx = np.argmin(partial)
+        best[t] = partial[idx] + penalty
+        last[t] = candidates[idx]
+        pruned[t] = candidates[partial > best[t]]
+        if t + 1 - min_size >= min_size:
+            candidates = np.append(candidates, t + 1 - min_size)
+
+    changepoints = []
+    t = last[n]
+    while t > 0:
+        changepoints.append(int(t))
+        t = last[t]
+    return changepoints[::-1]
+
+
+def binary_segmentation(values, penalty: Optional[float] = None, cost: str = 'poisson',
+                        min_size: int = DEFAULT_MIN_SIZE,
+                        max_changepoints: Optional[int] = None) -> List[int]:
+    """
+    Greedy change points: repeatedly split the segment with the largest gain.
+
+    Args:
+        values: 1-D series
+        penalty: Minimum cost reduction to accept a split (default: 2 log n)
+        cost: 'poisson' or 'normal'
+        min_size: Minimum segment length
+        max_changepoints: Stop after this many change points (optional)
+
+    Returns:
+        Sorted indices where a new segment starts
+    """
+    segment_cost = SegmentCost(values, cost)
+    penalty = segment_cost.default_penalty() if penalty is None else penalty
+
+    def best_split(start: int, stop: int):
+        splits = np.arange(start + min_size, stop - min_size + 1)
+        if len(splits) == 0:
+            return None
+        gains = segment_cost(start, stop) - segment_cost(start, splits) - segment_cost(splits, stop)
+        idx = np.argmax(gains)
+        return float(gains[idx]), int(splits[idx]), start, stop
+
+    pending = [split for split in [best_split(0, segment_cost.n)] if split]
+    changepoints = []
+    while pending and (max_changepoints is None or len(changepoints) < max_changepoints):
+        pending.sort()
+        gain, split, start, stop = pending.pop()
+        if gain <= penalty:
+            break
+        changepoints.append(split)
+        pending.extend(s for s in (best_split(start, split), best_split(split, stop)) if s)
+    return sorted(changepoints)
+
+
+CHANGEPOINT_METHODS = {
+    'pelt': pelt,
+    'binseg': binary_segmentation,
+}
+
+
+def detect_changepoints(values, method: str = 'pelt', **kwargs):
+    """
+    Change points of one series or of every row of a matrix.
+
+    Args:
+        values: 1-D series or (series x months) matrix
+        method: 'pelt' or 'binseg'
+        **kwargs: Passed to the method (penalty, cost, min_size, ...)
+
+    Returns:
+        List of change points, or one list per row for a matrix
+    """
+    if method not in CHANGEPOINT_METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {sorted(CHANGEPOINT_METHODS)}")
+    func = CHANGEPOINT_METHODS[method]
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        return func(values, **kwargs)
+    return [func(row, **kwargs) for row in values]
+
+
+def _robust_scale(deviations: np.ndarray) -> np.ndarray:
+    """MAD-based scale per row, falling back to the mean absolute deviation."""
+    abs_dev = np.abs(deviations)
+    scale = MAD_SCALE * np.median(abs_dev, axis=-1, keepdims=True)
+    fallback = MEAN_AD_SCALE * abs_dev.mean(axis=-1, keepdims=True)
+    scale = np.where(scale > SCALE_EPS, scale, fallback)
+    return np.where(scale > SCALE_EPS, scale, 0.0)
+
+
+def robust_zscores(values) -> np.ndarray:
+    """
+    Robust z-scores (x - median) / (1.4826 * MAD) along the last axis.
+
+    Rows with zero MAD use the scaled mean absolute deviation; constant
+    rows score 0.
+
+    Args:
+        values: 1-D series or (series x months) matrix
+
+    Returns:
+        Array of scores with the input's shape
+    """
+    values = np.asarray(values, dtype=float)
+    deviations = values - np.median(values, axis=-1, keepdims=True)
+    scale = _robust_scale(deviations)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(scale > 0, deviations / scale, 0.0)
+
+
+def seasonal_decompose(values, season: int = SEASON_LENGTH) -> Dict[str, np.ndarray]:
+    """
+    Robust additive decomposition into trend, seasonal and residual parts.
+
+    The trend is a centered moving median over season + 1 months (edges
+    reflected); the seasonal part is the per-position median of the
+    detrended series, centered to zero. Needs two full seasons for a
+    seasonal part (otherwise it is zero).
+
+    Args:
+        values: 1-D series or (series x months) matrix
+        season: Season length
+
+    Returns:
+        Dictionary with 'trend', 'seasonal' and 'resid' arrays
+    """
+    values = np.asarray(values, dtype=float)
+    squeeze = values.ndim == 1
+    matrix = np.atleast_2d(values)
+    n_series, n_obs = matrix.shape
+
+    half = min(season // 2, n_obs - 1)
+    padded = np.pad(matrix, ((0, 0), (half, half)), mode='reflect') if half else matrix
+    trend = np.median(window_view(padded, 2 * half + 1), axis=-1)
+
+    seasonal = np.zeros_like(matrix)
+    if n_obs >= 2 * season:
+        detrended = matrix - trend
+        n_cycles = -(-n_obs // season)
+        cycles = np.full((n_series, n_cycles * season), np.nan)
+        cycles[:, :n_obs] = detrended
+        profile = np.nanmedian(cycles.reshape(n_series, n_cycles, season), axis=1)
+        profile -= profile.mean(axis=1, keepdims=True)
+        seasonal = np.tile(profile, n_cycles)[:, :n_obs]
+
+    result = {'trend': trend, 'seasonal': seasonal, 'resid': matrix - trend - seasonal}
+    if squeeze:
+        result = {k: v[0] for k, v in result.items()}
+    return result
+
+
+def detect_anomalies(values, method: str = 'seasonal', threshold: float = DEFAULT_THRESHOLD,
+                     season: int = SEASON_LENGTH) -> Dict[str, np.ndarray]:
+    """
+    Flag anomalous months in one series or every row of a matrix.
+
+    Args:
+        values: 1-D series or (series x months) matrix
+        method: 'seasonal' (robust z-scores of decomposition residuals) or
+            'zscore' (robust z-scores of the raw counts)
+        threshold: Absolute score above which a month is anomalous
+        season: Season length for the decomposition
+
+    Returns:
+        Dictionary with 'expected', 'score' and boolean 'anomaly' arrays
+    """
+    values = np.asarray(values, dtype=float)
+    if method == 'seasonal':
+        parts = seasonal_decompose(values, season)
+        expected = parts['trend'] + parts['seasonal']
+        score = robust_zscores(parts['resid'])
+    elif method == 'zscore':
+        expected = np.broadcast_to(np.median(values, axis=-1, keepdims=True), values.shape)
+        score = robust_zscores(values)
+    else:
+        raise ValueError(f"Unknown method {method!r}, expected 'seasonal' or 'zscore'")
+    return {'expected': expected, 'score': score, 'anomaly': np.abs(score) > threshold}
+
+
+def detection_summary(years_data: Dict[int, List[List[int]]], method: str = 'pelt',
+                      cost: str = 'poisson', threshold: float = DEFAULT_THRESHOLD) -> Dict:
+    """
+    Change points and anomalous months of the chronological monthly series.
+
+    Args:
+        years_data: Dictionary with year -> data mapping
+        method: Change-point method ('pelt' or 'binseg')
+        cost: Segment cost ('poisson' or 'normal')
+        threshold: Anomaly score threshold
+
+    Returns:
+        Dictionary with 'changepoints' (year, month and mean rate before and
+        after) and 'anomalies' (year, month, count, expected count, score)
+    """
+    years, series = monthly_series(years_data)
+    label = lambda idx: (years[idx // SEASON_LENGTH], int(idx % SEASON_LENGTH) + 1)
+
+    changepoints = detect_changepoints(series, method=method, cost=cost)
+    bounds = [0] + changepoints + [len(series)]
+    segment_means = [series[a:b].mean() for a, b in zip(bounds[:-1], bounds[1:])]
+
+    flags = detect_anomalies(series, threshold=threshold)
+    return {
+        'changepoints': [
+            {'year': label(idx)[0], 'month': label(idx)[1],
+             'mean_before': round(float(segment_means[i]), 2),
+             'mean_after': round(float(segment_means[i + 1]), 2)}
+            for i, idx in enumerate(changepoints)
+        ],
+        'anomalies': [
+            {'year': label(idx)[0], 'month': label(idx)[1], 'count': int(series[idx]),
+             'expected': round(float(flags['expected'][idx]), 2),
+             'score': round(float(flags['score'][idx]), 2)}
+            for idx in np.flatnonzero(flags['anomaly'])
+        ],
+    }
+
+
+class StreamingDetector:
+    """
+    Score new months against a rolling history as they arrive.
+
+    Each new month is compared with the trend plus seasonal expectation of
+    the last `history` months. Scores are scaled by the robust spread of
+    the detector's own recent one-step prediction errors, which (unlike
+    in-sample residuals) stays honest with only a few seasons of history.
+    A two-sided CUSUM over the (clipped) scores signals sustained rate
+    shifts.
+    """
+
+    def __init__(self, n_series: int = 1, season: int = SEASON_LENGTH,
+                 history: int = 3 * SEASON_LENGTH, threshold: float = DEFAULT_THRESHOLD,
+                 drift: float = 0.5, shift_threshold: float = 5.0):
+        """
+        Args:
+            n_series: Number of series scored together
+            season: Season length
+            history: Number of recent months (and prediction errors) kept
+            threshold: Absolute score above which a month is anomalous
+            drift: CUSUM allowance per month (in score units)
+            shift_threshold: CUSUM level that signals a rate shift
+        """
+        self.n_series = n_series
+        self.season = season
+        self.history = history
+        self.threshold = threshold
+        self.drift = drift
+        self.shift_threshold = shift_threshold
+        self.buffer = np.empty((n_series, 0))
+        self.errors = np.empty((n_series, 0))
+        self.cusum_pos = np.zeros(n_series)
+        self.cusum_neg = np.zeros(n_series)
+
+    @classmethod
+    def from_values(cls, values, **kwargs) -> 'StreamingDetector':
+        """
+        Build a detector primed with existing history.
+
+        The last two histories' worth of months are replayed to fill the
+        baseline and the prediction errors; the CUSUM starts from zero.
+
+        Args:
+            values: 1-D series or (series x months) matrix
+            **kwargs: Passed to the constructor
+
+        Returns:
+            Primed detector
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        detector = cls(n_series=values.shape[0], **kwargs)
+        detector.score_many(values[:, -2 * detector.history:])
+        detector.cusum_pos[:] = 0.0
+        detector.cusum_neg[:] = 0.0
+        return detector
+
+    def _expected(self) -> np.ndarray:
+        """Expected value of the next month, per series."""
+        n_obs = self.buffer.shape[1]
+        if n_obs >= 2 * self.season:
+            parts = seasonal_decompose(self.buffer, self.season)
+            return parts['trend'][:, -1] + parts['seasonal'][:, n_obs - self.season]
+        return np.median(self.buffer, axis=1)
+
+    def update(self, new_values) -> Dict[str, np.ndarray]:
+        """
+        Score one new month (one value per series) and add it to the history.
+
+        Scores are NaN until a season of history and of prediction errors
+        is available.
+
+        Args:
+            new_values: Scalar or array with one value per series
+
+        Returns:
+            Dictionary with 'expected', 'score', boolean 'anomaly' and
+            'shift' (+1 upward, -1 downward, 0 none) per series
+        """
+        y = np.broadcast_to(np.asarray(new_values, dtype=float), (self.n_series,))
+        expected = np.full(self.n_series, np.nan)
+        score = np.full(self.n_series, np.nan)
+
+        if self.buffer.shape[1] >= self.season:
+            expected = self._expected()
+            error = y - expected
+            if self.errors.shape[1] >= self.season:
+                centered = self.errors - np.median(self.errors, axis=1, keepdims=True)
+                scale = _robust_scale(centered)[:, 0]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    score = np.where(scale > 0, error / scale, 0.0)
+            self.errors = np.concatenate([self.errors, error[:, None]], axis=1)[:, -self.history:]
+
+        clipped = np.nan_to_num(np.clip(score, -self.threshold, self.threshold))
+        self.cusum_pos = np.maximum(0.0, self.cusum_pos + clipped - self.drift)
+        self.cusum_neg = np.maximum(0.0, self.cusum_neg - clipped - self.drift)
+        shift = np.where(self.cusum_pos > self.shift_threshold, 1,
+                         np.where(self.cusum_neg > self.shift_threshold, -1, 0))
+        self.cusum_pos[shift != 0] = 0.0
+        self.cusum_neg[shift != 0] = 0.0
+
+        self.buffer = np.concatenate([self.buffer, y[:, None]], axis=1)[:, -self.history:]
+        return {
+            'expected': expected,
+            'score': score,
+            'anomaly': np.abs(np.nan_to_num(score)) > self.threshold,
+            'shift': shift,
+        }
+
+    def score_many(self, values: Sequence) -> List[Dict[str, np.ndarray]]:
+        """
+        Score several months in order.
+
+        Args:
+            values: (series x months) matrix, or a 1-D sequence of months
+                for a single-series detector
+
+        Returns:
+            One update result per month
+        """
+        matrix = np.asarray(values, dtype=float)
+        matrix = matrix[None, :] if matrix.ndim == 1 else matrix
+        return [self.update(matrix[:, t]) for t in range(matrix.shape[1])]
@@ -0,0 +1,459 @@
+"""
+Batched monthly forecasting models with incremental updates.
+
+All models work on a (series x months) matrix, fit every series at once
+and keep their fitted state, so ``update()`` with a new month of data
+refreshes the forecast without refitting from scratch.
+"""
+
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .descriptive import monthly_counts
+
+logger = logging.getLogger(__name__)
+
+SEASON_LENGTH = 12
+
+
+def monthly_series(years_data: Dict[int, List[List[int]]]) -> Tuple[List[int], np.ndarray]:
+    """
+    Flatten a year -> months mapping into one chronological monthly series.
+
+    Unobserved months of partial years are filled with the mean of the same
+    calendar month over the years that observed it (the overall mean if no
+    year did), so the series keeps one value per calendar month.
+
+    Args:
+        years_data: Dictionary with year -> data mapping
+
+    Returns:
+        Tuple of (sorted years, 1-D array of monthly counts)
+    """
+    sorted_years = sorted(years_data.keys())
+    if not sorted_years:
+        return sorted_years, np.empty(0)
+    matrix = np.ma.vstack([monthly_counts(years_data[year]) for year in sorted_years]).astype(float)
+    seasonal = matrix.mean(axis=0).filled(matrix.mean())
+    return sorted_years, np.where(np.ma.getmaskarray(matrix), seasonal, np.ma.getdata(matrix)).ravel()
+
+
+def series_matrix(store: Dict[str, Dict[int, List[List[int]]]]
+                  ) -> Tuple[List[str], List[int], np.ndarray]:
+    """
+    Stack the monthly series of many series into a matrix.
+
+    Only the years present in every series are kept.
+
+    Args:
+        store: Series -> year -> monthly data mapping
+
+    Returns:
+        Tuple of (series names, common years, (series x months) matrix)
+    """
+    names = sorted(store.keys())
+    if not names:
+        return [], [], np.empty((0, 0))
+    common = sorted(set.intersection(*(set(store[name]) for name in names)))
+    dropped = set().union(*(set(store[name]) for name in names)) - set(common)
+    if dropped:
+        logger.warning(f"Dropping years not present in every series: {sorted(dropped)}")
+    rows = [monthly_series({y: store[name][y] for y in common})[1] for name in names]
+    return names, common, np.vstack(rows)
+
+
+def _as_matrix(values) -> np.ndarray:
+    """Promote a single series to a one-row matrix."""
+    values = np.asarray(values, dtype=float)
+    return values[np.newaxis, :] if values.ndim == 1 else values
+
+
+class SeasonalNaive:
+    """
+    Seasonal naive forecast: each month is the mean of the same month over
+    the last ``n_seasons`` seasons.
+    """
+
+    name = 'seasonal_naive'
+
+    def __init__(self, season: int = SEASON_LENGTH, n_seasons: int = 3):
+        self.season = season
+        self.n_seasons = n_seasons
+
+    def fit(self, values) -> 'SeasonalNaive':
+        """
+        Fit on a (series x months) matrix or a single series.
+
+        Args:
+            values: Monthly counts, oldest first
+
+        Returns:
+            The fitted model
+        """
+        values = _as_matrix(values)
+        n_avail = min(self.n_seasons, values.shape[1] // self.season)
+        if n_avail == 0:
+            raise ValueError(f"Need at least {self.season} observations, got {values.shape[1]}")
+        self.history = values[:, -n_avail * self.season:].copy()
+        self.n_obs = values.shape[1]
+        return self
+
+    def update(self, new_values) -> 'SeasonalNaive':
+        """
+        Append one month of observations (one value per series).
+
+        Args:
+            new_values: Array with one value per series
+
+        Returns:
+            The updated model
+        """
+        new_values = np.asarray(new_values, dtype=float).reshape(-1, 1)
+        self.history = np.hstack([self.history, new_values])
+        if self.history.shape[1] > self.n_seasons * self.season:
+            self.history = self.history[:, -self.n_seasons * self.season:]
+        self.n_obs += 1
+        return self
+
+    def forecast(self, horizon: int = SEASON_LENGTH) -> np.ndarray:
+        """
+        Forecast the next months.
+
+        Args:
+            horizon: Number of months ahead
+
+        Returns:
+            (series x horizon) array of forecasts
+        """
+        n_seasons = self.history.shape[1] // self.season
+        recent = self.history[:, -n_seasons * self.season:]
+        # Phase of each column relative to the first observation of the series
+        start_phase = (self.n_obs - recent.shape[1]) % self.season
+        by_phase = np.roll(recent.reshape(-1, n_seasons, self.season).mean(axis=1),
+                           start_phase, axis=1)
+        phases = (self.n_obs + np.arange(horizon)) % self.season
+        return by_phase[:, phases]
+
+
+class HoltWinters:
+    """
+    Additive Holt-Winters (level, trend, seasonality).
+
+    Smoothing parameters are chosen per series by a vectorized grid search
+    minimizing the one-step-ahead squared error; series are processed in
+    blocks to bound memory.
+    """
+
+    name = 'holt_winters'
+
+    def __init__(self, season: int = SEASON_LENGTH,
+                 alphas: Sequence[float] = (0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9),
+                 betas: Sequence[float] = (0.0, 0.01, 0.05, 0.1, 0.2),
+                 gammas: Sequence[float] = (0.01, 0.05, 0.1, 0.3, 0.5),
+                 block_size: int = 1024):
+        self.season = season
+        self.grid = np.array(list(itertools.product(alphas, betas, gammas)))
+        self.block_size = block_size
+
+    def _filter(self, values: np.ndarray, params: np.ndarray):
+        """
+        Run the smoothing recursion for every (series, parameter set).
+
+        Args:
+            values: (series x months) matrix
+            params: (series x candidates x 3) array of alpha, beta, gamma
+
+        Returns:
+            Tuple of (sse, level, trend, seasonal) for every candidate
+        """
+        m = self.season
+        n_obs = values.shape[1]
+        alpha, beta, gamma = params[..., 0], params[..., 1], params[..., 2]
+
+        first = values[:, :m]
+        level = np.broadcast_to(first.mean(axis=1, keepdims=True), alpha.shape).copy()
+        if n_obs >= 2 * m:
+            slope = (values[:, m:2 * m].mean(axis=1) - first.mean(axis=1)) / m
+        else:
+            slope = np.zeros(values.shape[0])
+        trend = np.broadcast_to(slope[:, np.newaxis], alpha.shape).copy()
+        seasonal = np.broadcast_to((first - first.mean(axis=1, keepdims=True))[:, np.newaxis, :],
+                                   alpha.shape + (m,)).copy()
+        sse = np.zeros(alpha.shape)
+
+        for t in range(m, n_obs):
+            y = values[:, t:t + 1]
+            s_prev = seasonal[..., t % m]
+            err = y - (level + trend + s_prev)
+            sse += err ** 2
+            new_level = alpha * (y - s_prev) + (1 - alpha) * (level + trend)
+            trend = beta * (new_level - level) + (1 - beta) * trend
+            seasonal[..., t % m] = gamma * (y - new_level) + (1 - gamma) * s_prev
+            level = new_level
+
+        return sse, level, trend, seasonal
+
+    def fit(self, values) -> 'HoltWinters':
+        """
+        Fit on a (series x months) matrix or a single series.
+
+        Args:
+            values: Monthly counts, oldest first (at least one full season)
+
+        Returns:
+            The fitted model
+        """
+        values = _as_matrix(values)
+        if values.shape[1] < self.season + 1:
+            raise ValueError(f"Need more than {self.season} observations, got {values.shape[1]}")
+
+        n_series = values.shape[0]
+        self.params = np.empty((n_series, 3))
+        for start in range(0, n_series, self.block_size):
+            block = values[start:start + self.block_size]
+            candidates = np.broadcast_to(self.grid, (len(block),) + self.grid.shape)
+            sse = self._filter(block, candidates)[0]
+            self.params[start:start + len(block)] = self.grid[np.argmin(sse, axis=1)]
+
+        _, level, trend, seasonal = self._filter(values, self.params[:, np.newaxis, :])
+        self.level, self.trend, self.seasonal = level[:, 0], trend[:, 0], seasonal[:, 0, :]
+        self.n_obs = values.shape[1]
+        return self
+
+    def update(self, new_values) -> 'HoltWinters':
+        """
+        Apply one smoothing step with the fitted parameters.
+
+        Args:
+            new_values: Array with one value per series
+
+        Returns:
+            The updated model
+        """
+        y = np.asarray(new_values, dtype=float).reshape(-1)
+        alpha, beta, gamma = self.params.T
+        phase = self.n_obs % self.season
+        s_prev = self.seasonal[:, phase]
+        new_level = alpha * (y - s_prev) + (1 - alpha) * (self.level + self.trend)
+        self.trend = beta * (new_level - self.level) + (1 - beta) * self.trend
+        self.seasonal[:, phase] = gamma * (y - new_level) + (1 - gamma) * s_prev
+        self.level = new_level
+        self.n_obs += 1
+        return self
+
+    def forecast(self, horizon: int = SEASON_LENGTH) -> np.ndarray:
+        """
+        Forecast the next months.
+
+        Args:
+            horizon: Number of months ahead
+
+        Returns:
+            (series x horizon) array of forecasts
+        """
+        steps = np.arange(1, horizon + 1)
+        phases = (self.n_obs + steps - 1) % self.season
+        return (self.level[:, np.newaxis] + self.trend[:, np.newaxis] * steps
+                + self.seasonal[:, phases])
+
+
+class SeasonalARIMA:
+    """
+    Seasonal ARIMA(1,0,0)(0,1,0)[12] with drift.
+
+    The seasonally differenced series d_t = y_t - y_{t-12} follows
+    d_t = c + phi * d_{t-1} + e_t. Parameters come from closed-form least
+    squares on running sums, so every series is fit at once and a new month
+    updates the sums and parameters in O(1).
+    """
+
+    name = 'sarima'
+
+    def __init__(self, season: int = SEASON_LENGTH, max_phi: float = 0.99):
+        self.season = season
+        self.max_phi = max_phi
+
+    def _solve(self) -> None:
+        """Recompute c and phi from the running least-squares sums."""
+        n, sx, sy, sxx, sxy = self.sums
+        denom = n * sxx - sx ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            phi = np.where(denom > 0, (n * sxy - sx * sy) / denom, 0.0)
+        self.phi = np.clip(phi, -self.max_phi, self.max_phi)
+        self.const = (sy - self.phi * sx) / n
+
+    def fit(self, values) -> 'SeasonalARIMA':
+        """
+        Fit on a (series x months) matrix or a single series.
+
+        Args:
+            values: Monthly counts, oldest first (at least season + 2 values)
+
+        Returns:
+            The fitted model
+        """
+        values = _as_matrix(values)
+        if values.shape[1] < self.season + 2:
+            raise ValueError(f"Need at least {self.season + 2} observations, got {values.shape[1]}")
+
+        diffs = values[:, self.season:] - values[:, :-self.season]
+        x, y = diffs[:, :-1], diffs[:, 1:]
+        self.sums = [np.full(len(values), x.shape[1], dtype=float),
+                     x.sum(axis=1), y.sum(axis=1), (x * x).sum(axis=1), (x * y).sum(axis=1)]
+        self._solve()
+        self.recent = values[:, -self.season:].copy()
+        self.last_diff = diffs[:, -1].copy()
+        self.n_obs = values.shape[1]
+        return self
+
+    def update(self, new_values, refresh_params: bool = True) -> 'SeasonalARIMA':
+        """
+        Append one month of observations.
+
+        Args:
+            new_values: Array with one value per series
+            refresh_params: Re-solve c and phi from the updated sums
+
+        Returns:
+            The updated model
+        """
+        y = np.asarray(new_values, dtype=float).reshape(-1)
+        diff = y - self.recent[:, 0]
+        n, sx, sy, sxx, sxy = self.sums
+        self.sums = [n + 1, sx + self.last_diff, sy + diff,
+                     sxx + self.last_diff ** 2, sxy + self.last_diff * diff]
+        if refresh_params:
+            self._solve()
+        self.recent = np.hstack([self.recent[:, 1:], y[:, np.newaxis]])
+        self.last_diff = diff
+        self.n_obs += 1
+        return self
+
+    def forecast(self, horizon: int = SEASON_LENGTH) -> np.ndarray:
+        """
+        Forecast the next months.
+
+        Args:
+            horizon: Number of months ahead
+
+        Returns:
+            (series x horizon) array of forecasts
+        """
+        window = list(self.recent.T)
+        diff = self.last_diff
+        out = []
+        for _ in range(horizon):
+            diff = self.const + self.phi * diff
+            value = window[-self.season] + diff
+            window.append(value)
+            out.append(value)
+        return np.column_stack(out)
+
+
+MODELS = {
+    SeasonalNaive.name: SeasonalNaive,
+    HoltWinters.name: HoltWinters,
+    SeasonalARIMA.name: SeasonalARIMA,
+}
+
+
+def make_model(name: str, **kwargs):
+    """
+    Instantiate a forecasting model by name.
+
+    Args:
+        name: 'seasonal_naive', 'holt_winters' or 'sarima'
+        **kwargs: Model options
+
+    Returns:
+        Unfitted model
+    """
+    if name not in MODELS:
+        raise ValueError(f"Unknown model {name!r}, expected one of {sorted(MODELS)}")
+    return MODELS[name](**kwargs)
+
+
+def forecast_series(values, model: str = 'holt_winters', horizon: int = SEASON_LENGTH,
+                    **kwargs) -> np.ndarray:
+    """
+    Fit a model on every series and forecast.
+
+    Args:
+        values: (series x months) matrix or a single series
+        model: Model name
+        horizon: Number of months ahead
+        **kwargs: Model options
+
+    Returns:
+        (series x horizon) array of forecasts
+    """
+    return make_model(model, **kwargs).fit(values).forecast(horizon)
+
+
+def _backtest_origin(task: Tuple) -> Tuple[int, np.ndarray]:
+    """Fit on data before one origin and return the forecast errors after it."""
+    origin, train, actual, model, kwargs = task
+    predicted = make_model(model, **kwargs).fit(train).forecast(actual.shape[1])
+    return origin, actual - predicted
+
+
+def rolling_origin_backtest(values, model: str = 'holt_winters', horizon: int = SEASON_LENGTH,
+                            min_train: int = 2 * SEASON_LENGTH, step: int = 1,
+                            workers: Optional[int] = None, **kwargs) -> Dict:
+    """
+    Evaluate a model with rolling-origin (time series cross-validation) backtests.
+
+    For every origin the model is refit on all data before it and scored on
+    the next ``horizon`` months. Origins are evaluated in a process pool.
+
+    Args:
+        values: (series x months) matrix or a single series
+        model: Model name
+        horizon: Months forecast from each origin
+        min_train: Observations before the first origin
+        step: Months between origins
+        workers: Worker processes (default: in-process when 1 or None)
+        **kwargs: Model options
+
+    Returns:
+        Dictionary with per-origin and overall MAE, RMSE and sMAPE
+    """
+    values = _as_matrix(values)
+    origins = list(range(min_train, values.shape[1] - horizon + 1, step))
+    if not origins:
+        raise ValueError("Series too short for the requested min_train and horizon")
+
+    tasks = [(o, values[:, :o], values[:, o:o + horizon], model, kwargs) for o in origins]
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_backtest_origin, tasks))
+    else:
+        results = [_backtest_origin(task) for task in tasks]
+
+    def scores(errors: np.ndarray, actual: np.ndarray) -> Dict:
+        denom = np.abs(actual) + np.abs(actual - errors)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            smape = np.where(denom > 0, 2 * np.abs(errors) / denom, 0.0)
+        return {
+            'mae': round(float(np.abs(errors).mean()), 4),
+            'rmse': round(float(np.sqrt((errors ** 2).mean())), 4),
+            'smape': round(float(smape.mean() * 100), 2),
+        }
+
+    per_origin = []
+    for (origin, errors), task in zip(results, tasks):
+        per_origin.append(dict(origin=origin, **scores(errors, task[2])))
+
+    all_errors = np.concatenate([errors for _, errors in results], axis=1)
+    all_actual = np.concatenate([task[2] for task in tasks], axis=1)
+    return {
+        'model': model,
+        'horizon': horizon,
+        'origins': len(origins),
+        'per_origin': per_origin,
+        'overall': scores(all_errors, all_actual),
+    }
@@ -0,0 +1,319 @@
+"""
+Out-of-core aggregates over memory-mapped event stores.
+
+The store (see data.shared.MappedStore) is scanned in chunks of
+consecutive (year, month) cells sized to a memory budget. Each chunk
+produces partial aggregates that are merged into the running result:
+
+    - day histograms per year and per calendar month (summed)
+    - per-calendar-month moments of the monthly counts, merged with
+      Chan's parallel update (advanced.merge_month_moments)
+    - 12 x 12 co-moments of complete years (month-by-month correlation)
+
+Totals and per-month counts come from the store's offsets without touching
+the events. Pages of each processed chunk are released, so the resident
+set stays near the budget however large the store is.
+
+Run from the repository root:
+
+    python -m src.stats.outofcore events.store --from-json events.json --memory-budget-mb 64
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from ..data.loader import EXPECTED_MONTHS, load_events_data
+from ..data.shared import MappedStore, write_mapped_store
+from .advanced import merge_month_moments, month_anova, month_moments
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MB = 256
+
+N_DAYS = 31
+
+# Working memory per event in a chunk: the mapped day (uint8), its
+# histogram key (int32) and bincount's intp copy of the keys
+_BYTES_PER_EVENT = 13
+
+# RSS growth beyond the budget tolerated before warning (allocator arenas,
+# per-year histograms, mapped pages not yet released)
+_RSS_SLACK_MB = 32
+
+
+def rss_bytes() -> int:
+    """Current resident set size of the process (peak RSS where unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size since the process started or reset_peak_rss()."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def reset_peak_rss() -> bool:
+    """
+    Reset the peak RSS to the current RSS (Linux only).
+
+    Returns:
+        False if the peak cannot be reset, so it covers the whole process
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def chunk_bounds(offsets: np.ndarray, budget_bytes: int) -> List[Tuple[int, int]]:
+    """
+    Split the cells of a store into chunks that fit a memory budget.
+
+    Args:
+        offsets: Store offsets (one entry per cell plus the end)
+        budget_bytes: Working memory per chunk
+
+    Returns:
+        List of (first cell, end cell) ranges; a cell larger than the
+        budget gets a chunk of its own
+    """
+    max_events = max(1, budget_bytes // _BYTES_PER_EVENT)
+    n_cells = len(offsets) - 1
+    bounds, start = [], 0
+    while start < n_cells:
+        stop = int(np.searchsorted(offsets, offsets[start] + max_events, side='right')) - 1
+        stop = min(max(stop, start + 1), n_cells)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def merge_comoments(a: Tuple[int, np.ndarray, np.ndarray],
+                    b: Tuple[int, np.ndarray, np.ndarray]) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Merge co-moments (count, mean vector, co-moment matrix) of two samples.
+
+    Args:
+        a: Co-moments of the first sample
+        b: Co-moments of the second sample
+
+    Returns:
+        Co-moments of the union
+    """
+    n_a, mean_a, c_a = a
+    n_b, mean_b, c_b = b
+    n = n_a + n_b
+    if n == 0:
+        return a
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, c_a + c_b + np.outer(delta, delta) * n_a * n_b / n
+
+
+class ChunkedAggregates:
+    """
+    Mergeable partial aggregates of an event store.
+
+    add_chunk() folds one range of cells in; merge() combines aggregates
+    built independently (e.g. by workers over disjoint year ranges of the
+    same store).
+    """
+
+    def __init__(self, n_years: int):
+        """
+        Args:
+            n_years: Years in the store
+        """
+        self.day_histogram = np.zeros((n_years, N_DAYS), dtype=np.int64)
+        self.month_day_histogram = np.zeros((EXPECTED_MONTHS, N_DAYS), dtype=np.int64)
+        self.moments = month_moments(np.ma.masked_all((0, EXPECTED_MONTHS)))
+        self.comoments = (0, np.zeros(EXPECTED_MONTHS), np.zeros((EXPECTED_MONTHS, EXPECTED_MONTHS)))
+
+    def add_chunk(self, store: MappedStore, start: int, stop: int) -> None:
+        """
+        Add the cells [start, stop) of a store.
+
+        Day histograms use the events of those cells; count moments use the
+        years whose last month lies in the range.
+
+        Args:
+            store: Store handle
+            start: First cell
+            stop: End cell (exclusive)
+        """
+        offsets = store.arrays['offsets']
+        bounds = np.asarray(offsets[start:stop + 1])
+        days = store.arrays['days'][bounds[0]:bounds[-1]]
+        if len(days):
+            # Key of (cell, day) built in place: cell * 31 + day - 1
+            keys = np.repeat(np.arange(stop - start, dtype=np.int32) * N_DAYS - 1, np.diff(bounds))
+            keys += days
+            hist = np.bincount(keys, minlength=(stop - start) * N_DAYS).reshape(-1, N_DAYS)
+            del keys
+            cell_ids = np.arange(start, stop)
+            np.add.at(self.day_histogram, cell_ids // EXPECTED_MONTHS, hist)
+            np.add.at(self.month_day_histogram, cell_ids % EXPECTED_MONTHS, hist)
+
+        last = EXPECTED_MONTHS - 1
+        first_year = max(0, -(-(start - last) // EXPECTED_MONTHS))
+        end_year = -(-(stop - last) // EXPECTED_MONTHS)
+        if end_year > first_year:
+            rows = np.diff(offsets[first_year * EXPECTED_MONTHS:end_year * EXPECTED_MONTHS + 1])
+            counts = rows.reshape(-1, EXPECTED_MONTHS).astype(float)
+            observed = np.asarray(store.arrays['observed'][first_year:end_year])
+            self.moments = merge_month_moments(self.moments,
+                                               month_moments(np.ma.masked_array(counts, mask=~observed)))
+
+            complete = counts[observed.all(axis=1)]
+            if len(complete):
+                mean = complete.mean(axis=0)
+                centered = complete - mean
+                self.comoments = merge_comoments(self.comoments,
+                                                 (len(complete), mean, centered.T @ centered))
+
+    def merge(self, other: 'ChunkedAggregates') -> 'ChunkedAggregates':
+        """
+        Fold in aggregates of disjoint cells of the same store.
+
+        Args:
+            other: Aggregates to merge
+
+        Returns:
+            self
+        """
+        self.day_histogram += other.day_histogram
+        self.month_day_histogram += other.month_day_histogram
+        self.moments = merge_month_moments(self.moments, other.moments)
+        self.comoments = merge_comoments(self.comoments, other.comoments)
+        return self
+
+    def result(self, store: MappedStore) -> Dict:
+        """
+        Final statistics.
+
+        Args:
+            store: Store the aggregates were built from
+
+        Returns:
+            Dictionary with 'years', 'totals', 'monthly_counts' (None for
+            unobserved months), 'day_histogram', 'month_day_histogram',
+            'overall', 'seasonality' (advanced.month_anova across calendar
+            months) and 'month_correlation' (complete years)
+        """
+        observed = np.asarray(store.arrays['observed'])
+        counts = store.monthly_counts()
+        n, mean, m2 = self.moments['count'], self.moments['mean'], self.moments['m2']
+        total = int(n.sum())
+        grand = float((n * mean).sum() / total) if total else 0.0
+        spread = float(m2.sum() + (n * (mean - grand) ** 2).sum())
+
+        return {
+            'years': store.years,
+            'totals': counts.sum(axis=1).tolist(),
+            'monthly_counts': np.where(observed, counts, None).tolist(),
+            'day_histogram': self.day_histogram.tolist(),
+            'month_day_histogram': self.month_day_histogram.tolist(),
+            'overall': {
+                'n': total,
+                'mean': round(grand, 4),
+                'stdev': round(float(np.sqrt(spread / (total - 1))), 4) if total > 1 else 0.0,
+            },
+            'seasonality': month_anova(self.moments),
+            'month_correlation': _correlation(self.comoments),
+        }
+
+
+def _correlation(comoments: Tuple[int, np.ndarray, np.ndarray]) -> Optional[List[List[float]]]:
+    """Month-by-month Pearson correlation from co-moments (None if undefined)."""
+    n, _, c = comoments
+    if n < 2:
+        return None
+    scale = np.sqrt(np.diag(c))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        corr = c / np.outer(scale, scale)
+    return np.round(np.where(np.isfinite(corr), corr, np.nan), 4).tolist()
+
+
+def chunked_summary(store: MappedStore, memory_budget_mb: float = DEFAULT_BUDGET_MB) -> Dict:
+    """
+    Aggregate a store chunk by chunk within a memory budget.
+
+    Args:
+        store: Mapped store
+        memory_budget_mb: Working memory per chunk in MiB
+
+    Returns:
+        ChunkedAggregates.result() plus an 'execution' entry with the number
+        of chunks, the budget and the RSS at start and peak (MiB); the peak
+        covers this call where the platform can reset it ('rss_peak_scope')
+    """
+    budget = int(memory_budget_mb * 2 ** 20)
+    offsets = store.arrays['offsets']
+    bounds = chunk_bounds(offsets, budget)
+    aggregates = ChunkedAggregates(len(store.arrays['years']))
+
+    scope = 'run' if reset_peak_rss() else 'process'
+    start_rss = rss_bytes()
+    for start, stop in bounds:
+        aggregates.add_chunk(store, start, stop)
+        store.release(int(offsets[start]), int(offsets[stop]))
+    peak_rss = peak_rss_bytes()
+
+    result = aggregates.result(store)
+    result['execution'] = {
+        'chunks': len(bounds),
+        'events': int(offsets[-1]),
+        'memory_budget_mib': memory_budget_mb,
+        'rss_start_mib': round(start_rss / 2 ** 20, 1),
+        'rss_peak_mib': round(peak_rss / 2 ** 20, 1),
+        'rss_peak_scope': scope,
+    }
+    if peak_rss - start_rss > budget + _RSS_SLACK_MB * 2 ** 20:
+        logger.warning(f"Peak RSS grew {(peak_rss - start_rss) / 2 ** 20:.1f} MiB, "
+                       f"over the {memory_budget_mb:g} MiB budget")
+    logger.info(f"Aggregated {int(offsets[-1])} events in {len(bounds)} chunks "
+                f"(peak RSS {peak_rss / 2 ** 20:.1f} MiB)")
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description='Chunked aggregates over a memory-mapped event store.')
+    parser.add_argument('store', help='Store file (see data.shared.write_mapped_store)')
+    parser.add_argument('--from-json', metavar='FILE',
+                        help='Build the store from an events file in data/raw/ first')
+    parser.add_argument('--memory-budget-mb', type=float, default=DEFAULT_BUDGET_MB)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        force=True)
+    if args.from_json:
+        write_mapped_store(args.store, load_events_data(args.from_json))
+    with MappedStore.open(args.store) as store:
+        print(json.dumps(chunked_summary(store, args.memory_budget_mb), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
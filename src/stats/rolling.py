@@ -0,0 +1,227 @@
+"""
+Rolling-window statistics over the full multi-year monthly series.
+
+Windows span calendar-year boundaries. Sums, means, standard deviations
+and trend slopes come from prefix sums of y, y^2 and t*y, so every window
+costs O(1) regardless of its length, and appending a month extends the
+prefix sums without recomputing earlier windows.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .forecast import monthly_series
+
+DEFAULT_WINDOWS = (3, 6, 12)
+
+
+def window_view(values, window: int) -> np.ndarray:
+    """
+    Zero-copy view of all windows of a series (or of every row of a matrix).
+
+    Args:
+        values: 1-D series or (series x months) matrix
+        window: Window length
+
+    Returns:
+        Read-only view with the window as the last axis
+    """
+    return sliding_window_view(np.asarray(values), window, axis=-1)
+
+
+def _window_stats(prefix: Tuple[np.ndarray, np.ndarray, np.ndarray], window: int,
+                  start: int, stop: int) -> Dict[str, np.ndarray]:
+    """
+    Statistics of the windows ending at positions start..stop-1.
+
+    Args:
+        prefix: Prefix sums (s1, s2, sty) with a leading zero column, where
+            sty accumulates t * y for the absolute position t
+        window: Window length
+        start: First window end position (>= window - 1)
+        stop: One past the last window end position
+
+    Returns:
+        Dictionary with 'sum', 'mean', 'std' and 'slope' arrays
+    """
+    s1, s2, sty = prefix
+    hi = np.arange(start, stop) + 1
+    lo = hi - window
+
+    total = s1[..., hi] - s1[..., lo]
+    sq = s2[..., hi] - s2[..., lo]
+    # Shift t*y to window-local positions k = t - lo to avoid cancellation
+    ky = (sty[..., hi] - sty[..., lo]) - lo * total
+
+    w = float(window)
+    sum_k = w * (w - 1) / 2
+    sum_k2 = (w - 1) * w * (2 * w - 1) / 6
+    denom = w * sum_k2 - sum_k ** 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = np.maximum(sq - total ** 2 / w, 0.0) / (w - 1) if window > 1 else np.zeros_like(total)
+        slope = (w * ky - sum_k * total) / denom if denom else np.zeros_like(total)
+
+    return {
+        'sum': total,
+        'mean': total / w,
+        'std': np.sqrt(var),
+        'slope': slope,
+    }
+
+
+def _prefix_sums(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Prefix sums of y, y^2 and t*y with a leading zero column."""
+    t = np.arange(values.shape[-1], dtype=float)
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    return (
+        np.pad(np.cumsum(values, axis=-1), pad),
+        np.pad(np.cumsum(values ** 2, axis=-1), pad),
+        np.pad(np.cumsum(t * values, axis=-1), pad),
+    )
+
+
+def rolling_stats(values, windows: Sequence[int] = DEFAULT_WINDOWS) -> Dict[int, Dict[str, np.ndarray]]:
+    """
+    Rolling sums, means, standard deviations and trend slopes.
+
+    Args:
+        values: 1-D monthly series or (series x months) matrix, oldest first
+        windows: Window lengths in months
+
+    Returns:
+        Dictionary window -> {'end', 'sum', 'mean', 'std', 'slope'}, where
+        'end' holds the index of the last month of every window
+    """
+    values = np.asarray(values, dtype=float)
+    prefix = _prefix_sums(values)
+    n_obs = values.shape[-1]
+
+    result = {}
+    for window in windows:
+        if window > n_obs:
+            continue
+        stats = _window_stats(prefix, window, window - 1, n_obs)
+        stats['end'] = np.arange(window - 1, n_obs)
+        result[window] = stats
+    return result
+
+
+def rolling_by_year(years_data: Dict[int, List[List[int]]],
+                    windows: Sequence[int] = DEFAULT_WINDOWS) -> Dict[int, Dict]:
+    """
+    Rolling statistics over the chronological monthly series of a store.
+
+    Args:
+        years_data: Dictionary with year -> data mapping
+        windows: Window lengths in months
+
+    Returns:
+        Same as rolling_stats, plus 'end_labels' with (year, month) of the
+        last month of every window
+    """
+    years, series = monthly_series(years_data)
+    months_per_year = len(series) // len(years) if years else 12
+    result = rolling_stats(series, windows)
+    for stats in result.values():
+        stats['end_labels'] = [
+            (years[end // months_per_year], int(end % months_per_year) + 1) for end in stats['end']
+        ]
+    return result
+
+
+class RollingStats:
+    """
+    Incrementally maintained rolling statistics.
+
+    Prefix sums live in growable buffers (capacity doubles when full), so
+    append() is amortized O(1) and latest() is O(1) per window.
+    """
+
+    def __init__(self, windows: Sequence[int] = DEFAULT_WINDOWS, n_series: int = 1,
+                 capacity: int = 64):
+        """
+        Args:
+            windows: Window lengths in months
+            n_series: Number of parallel series updated together
+            capacity: Initial number of months to reserve
+        """
+        self.windows = tuple(windows)
+        self.n_series = n_series
+        self.n_obs = 0
+        self._buffers = [np.zeros((n_series, capacity + 1)) for _ in range(3)]
+
+    @classmethod
+    def from_values(cls, values, windows: Sequence[int] = DEFAULT_WINDOWS) -> 'RollingStats':
+        """
+        Build from existing history.
+
+        Args:
+            values: 1-D series or (series x months) matrix
+            windows: Window lengths in months
+
+        Returns:
+            Rolling statistics covering the history
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        stats = cls(windows, n_series=values.shape[0], capacity=max(64, values.shape[1]))
+        for buffer, prefix in zip(stats._buffers, _prefix_sums(values)):
+            buffer[:, :prefix.shape[1]] = prefix
+        stats.n_obs = values.shape[1]
+        return stats
+
+    def append(self, new_values) -> Dict[int, Dict[str, np.ndarray]]:
+        """
+        Add one month (one value per series) and update every window.
+
+        Args:
+            new_values: Scalar or array with one value per series
+
+        Returns:
+            Statistics of the windows ending at the new month (see latest)
+        """
+        y = np.broadcast_to(np.asarray(new_values, dtype=float), (self.n_series,))
+        if self.n_obs + 1 >= self._buffers[0].shape[1]:
+            self._buffers = [
+                np.concatenate([b, np.zeros_like(b)], axis=1) for b in self._buffers
+            ]
+        s1, s2, sty = self._buffers
+        t = self.n_obs
+        s1[:, t + 1] = s1[:, t] + y
+        s2[:, t + 1] = s2[:, t] + y ** 2
+        sty[:, t + 1] = sty[:, t] + t * y
+        self.n_obs += 1
+        return self.latest()
+
+    def latest(self) -> Dict[int, Dict[str, np.ndarray]]:
+        """
+        Statistics of the most recent complete window for every window length.
+
+        Returns:
+            Dictionary window -> {'sum', 'mean', 'std', 'slope'}, each an
+            array with one value per series
+        """
+        prefix = tuple(b[:, :self.n_obs + 1] for b in self._buffers)
+        return {
+            window: {k: v[:, 0] for k, v in _window_stats(prefix, window, self.n_obs - 1, self.n_obs).items()}
+            for window in self.windows
+            if window <= self.n_obs
+        }
+
+    def stats(self, window: int) -> Dict[str, np.ndarray]:
+        """
+        Statistics of every complete window of one length.
+
+        Args:
+            window: Window length in months
+
+        Returns:
+            Dictionary with 'end', 'sum', 'mean', 'std' and 'slope'
+            ((series x windows) arrays)
+        """
+        prefix = tuple(b[:, :self.n_obs + 1] for b in self._buffers)
+        result = _window_stats(prefix, window, window - 1, self.n_obs)
+        result['end'] = np.arange(window - 1, self.n_obs)
+        return result
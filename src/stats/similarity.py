@@ -0,0 +1,336 @@
+"""
+Top-k similarity search over monthly and day-of-month profiles.
+
+Every indexed item (a year, or a (series, year) pair) is reduced to a
+profile vector:
+
+    monthly  - events per month (12 values)
+    days     - events per day of the month over the year (31 values)
+
+and stored pre-normalized for its metric, so scoring the whole index is
+one matrix product:
+
+    cosine       - rows scaled to unit length
+    correlation  - rows centered, then scaled (Pearson r)
+    jaccard      - rows reduced to 0/1 presence; |A & B| / |A | B| from the
+                   dot product and the row sums
+
+Exact queries scan the index in blocks and keep a running top-k. The
+approximate mode adds random-hyperplane LSH tables and re-ranks only the
+items sharing a bucket with the query. Items can be added at any time.
+"""
+
+import logging
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..data.loader import observed_mask
+from .descriptive import total_per_month
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('cosine', 'correlation', 'jaccard')
+PROFILES = ('monthly', 'days')
+
+DEFAULT_BLOCK_SIZE = 8192
+
+N_DAYS = 31
+
+
+def profile_vector(data: List[List[int]], profile: str = 'monthly') -> np.ndarray:
+    """
+    Profile vector of one year.
+
+    Unobserved months of a partial year take the mean of its observed
+    months in the monthly profile, so they do not pull the shape to zero.
+
+    Args:
+        data: List of 12 months with daily events
+        profile: 'monthly' or 'days'
+
+    Returns:
+        1-D float array (12 or 31 values)
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile == 'monthly':
+        counts = np.asarray(total_per_month(data), dtype=float)
+        observed = observed_mask(data)
+        fill = counts[observed].mean() if observed.any() else 0.0
+        return np.where(observed, counts, fill)
+    if profile == 'days':
+        days = [day for month in data for day in month]
+        return np.bincount(np.asarray(days, dtype=np.int64), minlength=N_DAYS + 1)[1:].astype(float)
+    raise ValueError(f"Unknown profile {profile!r}, expected one of {PROFILES}")
+
+
+def profile_items(store: Dict) -> Dict[Hashable, List[List[int]]]:
+    """
+    Flatten a store into indexable items.
+
+    Args:
+        store: year -> months mapping, or series -> year -> months mapping
+
+    Returns:
+        Dictionary keyed by year, or by (series, year) for nested stores
+    """
+    items = {}
+    for key, value in store.items():
+        if isinstance(value, dict):
+            items.update({(key, year): months for year, months in value.items()})
+        else:
+            items[key] = value
+    return items
+
+
+def normalize_profiles(vectors: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Prepare profile rows so that the metric's score is a dot product.
+
+    Args:
+        vectors: (items x width) raw profiles
+        metric: 'cosine', 'correlation' or 'jaccard'
+
+    Returns:
+        Normalized float rows (all-zero rows stay zero)
+    """
+    vectors = np.asarray(vectors, dtype=float)
+    if metric == 'jaccard':
+        return (vectors > 0).astype(float)
+    if metric == 'correlation':
+        vectors = vectors - vectors.mean(axis=1, keepdims=True)
+    elif metric != 'cosine':
+        raise ValueError(f"Unknown metric {metric!r}, expected one of {METRICS}")
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class SimilarityIndex:
+    """
+    Incrementally built top-k similarity index.
+
+    Normalized profiles live in a growable buffer (capacity doubles when
+    full), so add() is amortized O(new items). Exact scans are a few
+    milliseconds per query up to ~10^5-10^6 items; the approximate mode is
+    only faster on large indexes, trading recall (lower with more bits,
+    higher with more tables) for speed.
+    """
+
+    def __init__(self, metric: str = 'correlation', profile: str = 'monthly',
+                 approximate: bool = False, n_bits: int = 12, n_tables: int = 8,
+                 block_size: int = DEFAULT_BLOCK_SIZE, seed: int = 0):
+        """
+        Args:
+            metric: 'cosine', 'correlation' or 'jaccard'
+            profile: 'monthly' or 'days'
+            approximate: Answer queries from LSH candidates instead of a full scan
+            n_bits: Hyperplanes per LSH table (more bits, smaller buckets)
+            n_tables: LSH tables (more tables, better recall)
+            block_size: Rows scored per block in exact scans
+            seed: Seed of the LSH hyperplanes
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {METRICS}")
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile {profile!r}, expected one of {PROFILES}")
+        self.metric = metric
+        self.profile = profile
+        self.approximate = approximate
+        self.block_size = block_size
+        self.keys: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+
+        width = 12 if profile == 'monthly' else N_DAYS
+        self._vectors = np.zeros((64, width))
+        self._sizes = np.zeros(64)
+
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((n_tables, width, n_bits))
+        self._weights = 1 << np.arange(n_bits)
+        self._codes_buffer = np.zeros((64, n_tables), dtype=np.int64)
+        # Per table: (sorted codes, positions in that order); rebuilt lazily after add()
+        self._tables: Optional[List[Tuple[np.ndarray, np.ndarray]]] = None
+
+    @classmethod
+    def from_data(cls, store: Dict, **kwargs) -> 'SimilarityIndex':
+        """
+        Build an index over a store.
+
+        Args:
+            store: year -> months mapping, or series -> year -> months mapping
+            **kwargs: SimilarityIndex options
+
+        Returns:
+            Index holding every year (or (series, year) pair) of the store
+        """
+        index = cls(**kwargs)
+        index.add(profile_items(store))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def add(self, items: Dict[Hashable, List[List[int]]]) -> None:
+        """
+        Index new items.
+
+        Args:
+            items: Key -> months mapping (see profile_items)
+
+        Raises:
+            ValueError: If a key is already indexed
+        """
+        keys = list(items.keys())
+        vectors = np.array([profile_vector(items[key], self.profile) for key in keys])
+        self.add_vectors(keys, vectors.reshape(len(keys), self._vectors.shape[1]))
+
+    def add_vectors(self, keys: Sequence[Hashable], vectors: np.ndarray) -> None:
+        """
+        Index precomputed profile vectors.
+
+        Args:
+            keys: One key per row
+            vectors: (items x profile width) raw profiles
+
+        Raises:
+            ValueError: If a key is already indexed or repeated
+        """
+        duplicates = [key for key in keys if key in self._positions]
+        if duplicates or len(set(keys)) != len(keys):
+            raise ValueError(f"Keys already indexed or repeated: {duplicates or list(keys)}")
+        start, stop = len(self.keys), len(self.keys) + len(keys)
+        while stop > len(self._vectors):
+            self._vectors = np.concatenate([self._vectors, np.zeros_like(self._vectors)])
+            self._sizes = np.concatenate([self._sizes, np.zeros_like(self._sizes)])
+            self._codes_buffer = np.concatenate([self._codes_buffer, np.zeros_like(self._codes_buffer)])
+
+        normalized = normalize_profiles(vectors, self.metric)
+        self._vectors[start:stop] = normalized
+        self._sizes[start:stop] = normalized.sum(axis=1)
+        for position, key in enumerate(keys, start):
+            self._positions[key] = position
+        self.keys.extend(keys)
+        self._codes_buffer[start:stop] = self._codes(normalized)
+        self._tables = None
+
+    def _codes(self, normalized: np.ndarray) -> np.ndarray:
+        """(items x tables) LSH bucket codes."""
+        if self.metric == 'jaccard':
+            # Presence vectors are all non-negative; center them so the
+            # hyperplanes split them evenly
+            normalized = normalized - 0.5
+        bits = np.einsum('nd,tdb->ntb', normalized, self._planes) > 0
+        return bits @ self._weights
+
+    def _lsh_tables(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Sorted bucket codes of every table."""
+        if self._tables is None:
+            codes = self._codes_buffer[:len(self.keys)]
+            orders = np.argsort(codes, axis=0, kind='stable').T
+            self._tables = [(codes[order, t], order) for t, order in enumerate(orders)]
+        return self._tables
+
+    def _scores(self, queries: np.ndarray, rows) -> np.ndarray:
+        """Metric scores of normalized queries against indexed rows."""
+        products = queries @ self._vectors[rows].T
+        if self.metric != 'jaccard':
+            return products
+        union = queries.sum(axis=1)[:, None] + self._sizes[rows][None, :] - products
+        return np.divide(products, union, out=np.zeros_like(products), where=union > 0)
+
+    def _prepare(self, queries: Sequence) -> Tuple[np.ndarray, List[Optional[int]]]:
+        """Normalized query rows and the index position of indexed keys."""
+        rows, positions = [], []
+        for query in queries:
+            if not isinstance(query, list) and query in self._positions:
+                position = self._positions[query]
+                rows.append(self._vectors[position])
+                positions.append(position)
+            else:
+                vector = profile_vector(query, self.profile)[np.newaxis, :]
+                rows.append(normalize_profiles(vector, self.metric)[0])
+                positions.append(None)
+        return np.array(rows).reshape(len(rows), self._vectors.shape[1]), positions
+
+    def query(self, query, k: int = 5, exclude_self: bool = True) -> List[Tuple[Hashable, float]]:
+        """
+        The k indexed items most similar to a query.
+
+        Args:
+            query: Indexed key, or a year's months (List[List[int]])
+            k: Number of neighbours
+            exclude_self: Skip the query's own entry when it is indexed
+
+        Returns:
+            List of (key, score) pairs, best first
+        """
+        return self.query_many([query], k, exclude_self)[0]
+
+    def query_many(self, queries: Sequence, k: int = 5,
+                   exclude_self: bool = True) -> List[List[Tuple[Hashable, float]]]:
+        """
+        Top-k neighbours of several queries at once.
+
+        Args:
+            queries: Indexed keys and/or months lists
+            k: Number of neighbours per query
+            exclude_self: Skip each query's own entry when it is indexed
+
+        Returns:
+            One list of (key, score) pairs per query, best first
+        """
+        normalized, positions = self._prepare(queries)
+        if self.approximate:
+            codes = self._codes(normalized)
+            return [self._query_candidates(row, row_codes, position, k, exclude_self)
+                    for row, row_codes, position in zip(normalized, codes, positions)]
+
+        n_queries, n_items = len(normalized), len(self.keys)
+        best_scores = np.full((n_queries, 0), -np.inf)
+        best_index = np.zeros((n_queries, 0), dtype=np.int64)
+        for start in range(0, n_items, self.block_size):
+            stop = min(start + self.block_size, n_items)
+            scores = self._scores(normalized, slice(start, stop))
+            if exclude_self:
+                for q, position in enumerate(positions):
+                    if position is not None and start <= position < stop:
+                        scores[q, position - start] = -np.inf
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_index = np.concatenate([best_index, np.broadcast_to(np.arange(start, stop),
+                                                                     scores.shape)], axis=1)
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_index = np.take_along_axis(best_index, keep, axis=1)
+
+        return [self._ranked(best_index[q], best_scores[q], k) for q in range(n_queries)]
+
+    def _query_candidates(self, row: np.ndarray, codes: np.ndarray, position: Optional[int], k: int,
+                          exclude_self: bool) -> List[Tuple[Hashable, float]]:
+        """Approximate top-k: exact scores of the items sharing an LSH bucket."""
+        buckets = []
+        for (sorted_codes, order), code in zip(self._lsh_tables(), codes):
+            lo, hi = np.searchsorted(sorted_codes, [code, code + 1])
+            buckets.append(order[lo:hi])
+        index = np.unique(np.concatenate(buckets))
+        if exclude_self and position is not None:
+            index = index[index != position]
+        if len(index) < k:
+            logger.debug(f"{len(index)} LSH candidates for k={k}; scanning the index")
+            index = np.arange(len(self.keys))
+            if exclude_self and position is not None:
+                index = index[index != position]
+
+        scores = self._scores(row[np.newaxis, :], index)[0]
+        return self._ranked(index, scores, k)
+
+    def _ranked(self, index: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[Hashable, float]]:
+        """Best k (key, score) pairs, best first."""
+        order = np.argsort(-scores, kind='stable')[:k]
+        return [(self.keys[int(index[i])], round(float(scores[i]), 4))
+                for i in order if np.isfinite(scores[i])]
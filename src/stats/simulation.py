@@ -0,0 +1,221 @@
+"""
+Monte Carlo simulation of next-year event counts.
+
+Each month's count is modelled as Poisson, or negative binomial when the
+historical counts are overdispersed. Simulated years are drawn in
+vectorized chunks and accumulated as integer histograms, so millions of
+draws run in flat memory and quantiles are exact for the drawn sample.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .advanced import monthly_count_matrix
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+DEFAULT_CHUNK_SIZE = 250_000
+
+
+def fit_count_model(counts, family: str = 'auto') -> Dict:
+    """
+    Fit per-month count distributions from historical counts.
+
+    Args:
+        counts: (years x months) array of monthly counts; masked or NaN
+            entries (unobserved months) are left out of their month's fit
+        family: 'auto' (negative binomial for months whose sample variance
+            exceeds the mean, Poisson otherwise) or 'poisson'
+
+    Returns:
+        Dictionary with per-month 'mean', 'var', 'family' and the negative
+        binomial 'n'/'p' parameters (NaN for Poisson months)
+
+    Raises:
+        ValueError: If the array is not a non-empty matrix, the family is
+            unknown or a month was never observed
+    """
+    counts = np.ma.filled(np.ma.asarray(counts, dtype=float), np.nan)
+    if counts.ndim != 2 or counts.shape[0] == 0:
+        raise ValueError(f"Expected a non-empty (years x months) array, got shape {counts.shape}")
+    if family not in ('auto', 'poisson'):
+        raise ValueError(f"Unknown family {family!r}, expected 'auto' or 'poisson'")
+
+    n_observed = (~np.isnan(counts)).sum(axis=0)
+    if not n_observed.all():
+        raise ValueError(f"Months never observed: {(np.flatnonzero(n_observed == 0) + 1).tolist()}")
+
+    mean = np.nanmean(counts, axis=0)
+    squared = np.nansum((counts - mean) ** 2, axis=0)
+    var = np.where(n_observed > 1, squared / np.maximum(n_observed - 1, 1), mean)
+
+    negbin = (var > mean) if family == 'auto' else np.zeros(mean.shape, dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n = np.where(negbin, mean ** 2 / (var - mean), np.nan)
+        p = np.where(negbin, mean / var, np.nan)
+
+    return {
+        'mean': mean,
+        'var': var,
+        'family': np.where(negbin, 'negbin', 'poisson'),
+        'n': n,
+        'p': p,
+    }
+
+
+def _draw(rng: np.random.Generator, model: Dict, size: int) -> np.ndarray:
+    """Draw (size x months) monthly counts from a fitted model."""
+    negbin = model['family'] == 'negbin'
+    draws = np.empty((size, len(negbin)), dtype=np.int64)
+    if (~negbin).any():
+        draws[:, ~negbin] = rng.poisson(model['mean'][~negbin], size=(size, int((~negbin).sum())))
+    if negbin.any():
+        draws[:, negbin] = rng.negative_binomial(model['n'][negbin], model['p'][negbin],
+                                                 size=(size, int(negbin.sum())))
+    return draws
+
+
+def _add_histogram(hist: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Add value counts to a growable integer histogram."""
+    counts = np.bincount(values)
+    if len(counts) > len(hist):
+        hist = np.concatenate([hist, np.zeros(len(counts) - len(hist), dtype=hist.dtype)])
+    hist[:len(counts)] += counts
+    return hist
+
+
+def _histogram_quantiles(hist: np.ndarray, quantiles: Sequence[float]) -> List[int]:
+    """Inverse empirical CDF of an integer histogram."""
+    cumulative = np.cumsum(hist)
+    targets = np.asarray(quantiles) * cumulative[-1]
+    return np.searchsorted(cumulative, targets, side='left').clip(0, len(hist) - 1).tolist()
+
+
+def simulate_counts(counts, n_sims: int = 1_000_000,
+                    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                    seed=None, family: str = 'auto',
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+    """
+    Simulate next-year monthly and annual totals for one series.
+
+    Draws are reproducible for a given seed and chunk size: each chunk uses
+    its own stream spawned from the seed.
+
+    Args:
+        counts: (years x months) array of historical monthly counts
+        n_sims: Number of simulated years
+        quantiles: Quantiles to report (0-1)
+        seed: Seed or np.random.SeedSequence
+        family: 'auto' or 'poisson'
+        chunk_size: Simulated years drawn per chunk (bounds memory)
+
+    Returns:
+        Dictionary with fitted families, annual and per-month means and quantiles
+    """
+    model = fit_count_model(counts, family)
+    n_months = len(model['mean'])
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    n_chunks = -(-n_sims // chunk_size)
+
+    annual_hist = np.zeros(1, dtype=np.int64)
+    monthly_hists = [np.zeros(1, dtype=np.int64) for _ in range(n_months)]
+    annual_sum = 0
+    monthly_sum = np.zeros(n_months)
+
+    for chunk_idx, chunk_seed in enumerate(seed_seq.spawn(n_chunks)):
+        size = min(chunk_size, n_sims - chunk_idx * chunk_size)
+        draws = _draw(np.random.default_rng(chunk_seed), model, size)
+        totals = draws.sum(axis=1)
+        annual_hist = _add_histogram(annual_hist, totals)
+        annual_sum += int(totals.sum())
+        monthly_sum += draws.sum(axis=0)
+        for month in range(n_months):
+            monthly_hists[month] = _add_histogram(monthly_hists[month], draws[:, month])
+
+    quantile_keys = [f'q{round(q * 100, 2):g}' for q in quantiles]
+    return {
+        'n_sims': n_sims,
+        'family': model['family'].tolist(),
+        'annual': {
+            'mean': round(annual_sum / n_sims, 2),
+            'quantiles': dict(zip(quantile_keys, _histogram_quantiles(annual_hist, quantiles))),
+        },
+        'monthly': [
+            {
+                'month': month + 1,
+                'mean': round(float(monthly_sum[month] / n_sims), 2),
+                'quantiles': dict(zip(quantile_keys, _histogram_quantiles(monthly_hists[month], quantiles))),
+            }
+            for month in range(n_months)
+        ],
+    }
+
+
+def simulate_next_year(years_data: Dict[int, List[List[int]]], n_sims: int = 1_000_000,
+                       quantiles: Sequence[float] = DEFAULT_QUANTILES, seed=None,
+                       recent_years: Optional[int] = None, family: str = 'auto',
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict:
+    """
+    Simulate next-year event counts from historical data.
+
+    Args:
+        years_data: Dictionary with year -> data mapping
+        n_sims: Number of simulated years
+        quantiles: Quantiles to report (0-1)
+        seed: Seed for reproducible draws
+        recent_years: Fit on the last N years only (default: all years)
+        family: 'auto' or 'poisson'
+        chunk_size: Simulated years drawn per chunk
+
+    Returns:
+        Dictionary with simulation results (see simulate_counts) plus the
+        years used for fitting
+    """
+    years, counts = monthly_count_matrix(years_data)
+    if recent_years:
+        years, counts = years[-recent_years:], counts[-recent_years:]
+    result = simulate_counts(counts, n_sims=n_sims, quantiles=quantiles, seed=seed,
+                             family=family, chunk_size=chunk_size)
+    result['fitted_years'] = years
+    return result
+
+
+def _simulate_task(task) -> Dict:
+    counts, kwargs = task
+    return simulate_counts(counts, **kwargs)
+
+
+def simulate_many(counts, n_sims: int = 100_000,
+                  quantiles: Sequence[float] = DEFAULT_QUANTILES, seed=None,
+                  family: str = 'auto', chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  workers: Optional[int] = None) -> List[Dict]:
+    """
+    Simulate next-year totals for many series.
+
+    Every series gets its own stream spawned from the seed in series order,
+    so results do not depend on the number of workers.
+
+    Args:
+        counts: (series x years x months) array of historical counts
+        n_sims: Number of simulated years per series
+        quantiles: Quantiles to report (0-1)
+        seed: Seed for reproducible draws
+        family: 'auto' or 'poisson'
+        chunk_size: Simulated years drawn per chunk
+        workers: Worker processes (default: in-process when 1 or None)
+
+    Returns:
+        One simulation result per series
+    """
+    counts = np.asarray(counts, dtype=float)
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    tasks = [
+        (series_counts, {'n_sims': n_sims, 'quantiles': quantiles, 'seed': series_seed,
+                         'family': family, 'chunk_size': chunk_size})
+        for series_counts, series_seed in zip(counts, seeds)
+    ]
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_simulate_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    return [_simulate_task(task) for task in tasks]
@@ -1,5 +1,5 @@
 """Visualization module."""
 
-from . import basic, advanced
+from . import basic, advanced, prepare, render
 
-__all__ = ['basic', 'advanced']
+__all__ = ['basic', 'advanced', 'prepare', 'render']
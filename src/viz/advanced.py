@@ -1,14 +1,18 @@
 """Advanced visualizations for event data."""
 
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from pathlib import Path
 
 from ..data.loader import MONTHS
-from ..stats.descriptive import total_per_month
 from ..stats import advanced
+from .prepare import PlotData, prepare_plot_data
+from . import render
+from .render import save_figure
+from .scaling import (RenderTimer, bin_labels, bin_matrix, bin_rows, draw_quantile_bands, quantile_bands,
+                      resolve_thresholds, sparse_ticks, use_scaled)
 
 # Set default style
 sns.set_style("whitegrid")
@@ -16,28 +20,48 @@ plt.rcParams['figure.figsize'] = (14, 8)
 
 
 def plot_heatmap_days_vs_years(years_data: Dict[int, List[List[int]]], 
-                               save_path: str = None, show: bool = True) -> None:
+                               save_path: str = None, show: bool = True,
+                               prepared: Optional[PlotData] = None,
+                               mode: str = 'auto', thresholds: Optional[Dict[str, int]] = None) -> None:
     """
     Plot heatmap showing intensity of events across months and years.
     
+    Above the 'max_annotated_cells' threshold (or with mode='scaled') the
+    heatmap is drawn as one image without per-cell annotations, with years
+    averaged into at most 'max_matrix_size' rows.
+    
     Args:
         years_data: Dictionary with year -> data mapping
         save_path: Path to save figure
         show: Whether to display plot
+        prepared: Precomputed plot data (built from years_data if omitted)
+        mode: 'auto', 'full' (annotated cells) or 'scaled' (binned image)
+        thresholds: Overrides of scaling.DEFAULT_THRESHOLDS
     """
-    sorted_years = sorted(years_data.keys())
-    months_range = list(range(1, 13))
+    prepared = prepared if prepared is not None else prepare_plot_data(years_data)
+    limits = resolve_thresholds(thresholds)
+    sorted_years = prepared.years
     
-    # Create data matrix (years x months)
-    data_matrix = []
-    for year in sorted_years:
-        data_matrix.append(total_per_month(years_data[year]))
+    # Data matrix (years x months)
+    data_matrix = prepared.monthly
     
     fig, ax = plt.subplots(figsize=(14, 6))
     
-    im = sns.heatmap(data_matrix, xticklabels=MONTHS, yticklabels=sorted_years,
-                     cmap='YlOrRd', cbar_kws={'label': 'Events'}, ax=ax,
-                     annot=True, fmt='d', linewidths=0.5)
+    if use_scaled(mode, data_matrix.size, limits['max_annotated_cells']):
+        binned, row_labels = bin_rows(prepared.monthly_observed, sorted_years, limits['max_matrix_size'])
+        im = ax.imshow(binned, cmap='YlOrRd', aspect='auto', interpolation='nearest')
+        ax.grid(False)
+        fig.colorbar(im, ax=ax, label='Events' if len(binned) == len(sorted_years) else 'Mean events')
+        ax.set_xticks(range(len(MONTHS)))
+        ax.set_xticklabels(MONTHS)
+        positions, tick_labels = sparse_ticks(row_labels)
+        ax.set_yticks(positions)
+        ax.set_yticklabels(tick_labels)
+    else:
+        sns.heatmap(data_matrix, xticklabels=MONTHS, yticklabels=sorted_years,
+                    cmap='YlOrRd', cbar_kws={'label': 'Events'}, ax=ax,
+                    annot=True, fmt='d', linewidths=0.5,
+                    mask=None if prepared.complete else ~prepared.observed)
     
     ax.set_title('Event Intensity Heatmap: Years vs Months', fontsize=14, fontweight='bold')
     ax.set_xlabel('Month', fontsize=11)
@@ -47,7 +71,7 @@ def plot_heatmap_days_vs_years(years_data: Dict[int, List[List[int]]],
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        save_figure(save_path)
     
     if show:
         plt.show()
@@ -56,19 +80,29 @@ def plot_heatmap_days_vs_years(years_data: Dict[int, List[List[int]]],
 
 
 def plot_trend_with_regression(years_data: Dict[int, List[List[int]]], 
-                               save_path: str = None, show: bool = True) -> None:
+                               save_path: str = None, show: bool = True,
+                               mode: str = 'auto', thresholds: Optional[Dict[str, int]] = None) -> None:
     """
     Plot year-over-year totals with linear regression line.
     
+    With more years than the 'max_boxes' threshold (or mode='scaled') only
+    a subset of year ticks is labelled and markers shrink. Partial years are
+    drawn at their annualized total, the value the regression used, with a
+    hollow marker.
+    
     Args:
         years_data: Dictionary with year -> data mapping
         save_path: Path to save figure
         show: Whether to display plot
+        mode: 'auto', 'full' or 'scaled'
+        thresholds: Overrides of scaling.DEFAULT_THRESHOLDS
     """
+    scaled = use_scaled(mode, len(years_data), resolve_thresholds(thresholds)['max_boxes'])
     trend = advanced.year_over_year_trend(years_data)
     
     years = np.array(trend['years'])
-    totals = np.array(trend['totals'])
+    totals = np.array(trend['annualized_totals'])
+    partial = np.isin(years, trend['partial_years'])
     x = np.arange(len(years))
     
     # Calculate fitted line
@@ -76,11 +110,20 @@ def plot_trend_with_regression(years_data: Dict[int, List[List[int]]],
     
     fig, ax = plt.subplots(figsize=(12, 6))
     
-    ax.scatter(x, totals, s=100, alpha=0.7, label='Actual', color='steelblue')
+    size = 10 if scaled else 100
+    ax.scatter(x[~partial], totals[~partial], s=size, alpha=0.7, label='Actual', color='steelblue')
+    if partial.any():
+        ax.scatter(x[partial], totals[partial], s=size, alpha=0.9, label='Partial year (annualized)',
+                   facecolors='none', edgecolors='steelblue', linewidths=1.5)
     ax.plot(x, fitted, 'r--', linewidth=2, label=f'Trend (slope={trend["slope"]:.3f})')
     
-    ax.set_xticks(x)
-    ax.set_xticklabels(years)
+    if scaled:
+        positions, tick_labels = sparse_ticks(years)
+        ax.set_xticks(positions)
+        ax.set_xticklabels(tick_labels, rotation=45)
+    else:
+        ax.set_xticks(x)
+        ax.set_xticklabels(years)
     ax.set_title(f'Annual Events Trend (p-value: {trend["p_value"]:.4f})', 
                  fontsize=14, fontweight='bold')
     ax.set_xlabel('Year', fontsize=11)
@@ -96,7 +139,7 @@ def plot_trend_with_regression(years_data: Dict[int, List[List[int]]],
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        save_figure(save_path)
     
     if show:
         plt.show()
@@ -105,7 +148,8 @@ def plot_trend_with_regression(years_data: Dict[int, List[List[int]]],
 
 
 def plot_day_distribution(data: List[List[int]], year: int = None,
-                         save_path: str = None, show: bool = True) -> None:
+                         save_path: str = None, show: bool = True,
+                         prepared: Optional[PlotData] = None) -> None:
     """
     Plot bar chart showing which days of month are most common.
     
@@ -114,22 +158,20 @@ def plot_day_distribution(data: List[List[int]], year: int = None,
         year: Year number for title
         save_path: Path to save figure
         show: Whether to display plot
+        prepared: Precomputed plot data containing this year (optional)
     """
-    day_dist = advanced.day_distribution_analysis(data)
-    
-    all_days = [d for m in data for d in m]
-    day_counts = {}
-    for day in range(1, 32):
-        count = all_days.count(day)
-        if count > 0:
-            day_counts[day] = count
+    if prepared is not None and year is not None:
+        day_counts = prepared.day_counts(year)
+    else:
+        day_counts = np.bincount([d for m in data for d in m], minlength=32)[1:]
     
-    days = sorted(day_counts.keys())
-    counts = [day_counts[d] for d in days]
+    days = np.flatnonzero(day_counts) + 1
+    counts = day_counts[days - 1]
+    most_common_day = days[np.argmax(counts)] if len(days) else None
     
     fig, ax = plt.subplots(figsize=(14, 6))
     
-    colors = ['red' if d == day_dist['most_common_day'] else 'steelblue' for d in days]
+    colors = ['red' if d == most_common_day else 'steelblue' for d in days]
     ax.bar(days, counts, color=colors, alpha=0.7, edgecolor='navy')
     
     year_str = f' - {year}' if year else ''
@@ -143,7 +185,7 @@ def plot_day_distribution(data: List[List[int]], year: int = None,
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        save_figure(save_path)
     
     if show:
         plt.show()
@@ -152,32 +194,46 @@ def plot_day_distribution(data: List[List[int]], year: int = None,
 
 
 def plot_correlation_matrix(years_data: Dict[int, List[List[int]]], 
-                            save_path: str = None, show: bool = True) -> None:
+                            save_path: str = None, show: bool = True,
+                            prepared: Optional[PlotData] = None,
+                            mode: str = 'auto', thresholds: Optional[Dict[str, int]] = None) -> None:
     """
     Plot correlation matrix between monthly patterns of years.
     
+    Above the 'max_annotated_cells' threshold (or with mode='scaled') the
+    matrix is drawn as one image without annotations, block-averaged to at
+    most 'max_matrix_size' rows and columns.
+    
     Args:
         years_data: Dictionary with year -> data mapping
         save_path: Path to save figure
         show: Whether to display plot
+        prepared: Precomputed plot data (built from years_data if omitted)
+        mode: 'auto', 'full' (annotated cells) or 'scaled' (binned image)
+        thresholds: Overrides of scaling.DEFAULT_THRESHOLDS
     """
-    sorted_years = sorted(years_data.keys())
-    
-    # Create correlation matrix
-    corr_matrix = np.zeros((len(sorted_years), len(sorted_years)))
-    
-    for i, year1 in enumerate(sorted_years):
-        for j, year2 in enumerate(sorted_years):
-            data1 = np.array(total_per_month(years_data[year1]))
-            data2 = np.array(total_per_month(years_data[year2]))
-            corr_matrix[i, j] = np.corrcoef(data1, data2)[0, 1]
+    prepared = prepared if prepared is not None else prepare_plot_data(years_data)
+    limits = resolve_thresholds(thresholds)
+    sorted_years = prepared.years
+    corr_matrix = prepared.correlation
     
     fig, ax = plt.subplots(figsize=(10, 8))
     
-    sns.heatmap(corr_matrix, annot=True, fmt='.2f', cmap='coolwarm', 
-                xticklabels=sorted_years, yticklabels=sorted_years,
-                center=0, vmin=-1, vmax=1, square=True, ax=ax,
-                cbar_kws={'label': 'Correlation'})
+    if use_scaled(mode, corr_matrix.size, limits['max_annotated_cells']):
+        binned = bin_matrix(corr_matrix, limits['max_matrix_size'])
+        im = ax.imshow(binned, cmap='coolwarm', vmin=-1, vmax=1, interpolation='nearest')
+        ax.grid(False)
+        fig.colorbar(im, ax=ax, label='Correlation')
+        positions, tick_labels = sparse_ticks(bin_labels(sorted_years, limits['max_matrix_size']))
+        ax.set_xticks(positions)
+        ax.set_xticklabels(tick_labels, rotation=90)
+        ax.set_yticks(positions)
+        ax.set_yticklabels(tick_labels)
+    else:
+        sns.heatmap(corr_matrix, annot=True, fmt='.2f', cmap='coolwarm', 
+                    xticklabels=sorted_years, yticklabels=sorted_years,
+                    center=0, vmin=-1, vmax=1, square=True, ax=ax,
+                    cbar_kws={'label': 'Correlation'})
     
     ax.set_title('Correlation Matrix: Monthly Patterns Between Years', 
                  fontsize=14, fontweight='bold')
@@ -185,7 +241,7 @@ def plot_correlation_matrix(years_data: Dict[int, List[List[int]]],
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        save_figure(save_path)
     
     if show:
         plt.show()
@@ -193,26 +249,58 @@ def plot_correlation_matrix(years_data: Dict[int, List[List[int]]],
         plt.close()
 
 
+def _kde_rows(matrix: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """Gaussian KDE (Scott's rule, as scipy's gaussian_kde) of every row on a shared grid; NaN entries are skipped."""
+    matrix = np.asarray(matrix, dtype=float)
+    present = ~np.isnan(matrix)
+    n = present.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(present, matrix, 0.0).sum(axis=1) / n
+        var = np.where(present, (matrix - mean[:, None]) ** 2, 0.0).sum(axis=1) / (n - 1)
+        bandwidth = np.sqrt(var) * n ** (-1 / 5)
+        z = (grid[None, None, :] - matrix[:, :, None]) / bandwidth[:, None, None]
+        kernels = np.where(present[:, :, None], np.exp(-0.5 * z ** 2), 0.0)
+        return kernels.sum(axis=1) / ((n * bandwidth)[:, None] * np.sqrt(2 * np.pi))
+
+
 def plot_kde_comparison(years_data: Dict[int, List[List[int]]], 
-                       save_path: str = None, show: bool = True) -> None:
+                       save_path: str = None, show: bool = True,
+                       prepared: Optional[PlotData] = None,
+                       mode: str = 'auto', thresholds: Optional[Dict[str, int]] = None) -> None:
     """
     Plot KDE (kernel density estimation) comparing monthly event distributions.
     
+    With more years than the 'max_lines' threshold (or mode='scaled') the
+    per-year curves are replaced by quantile bands of all years' densities
+    on a shared grid.
+    
     Args:
         years_data: Dictionary with year -> data mapping
         save_path: Path to save figure
         show: Whether to display plot
+        prepared: Precomputed plot data (built from years_data if omitted)
+        mode: 'auto', 'full' (one curve per year) or 'scaled' (quantile bands)
+        thresholds: Overrides of scaling.DEFAULT_THRESHOLDS
     """
+    prepared = prepared if prepared is not None else prepare_plot_data(years_data)
+    limits = resolve_thresholds(thresholds)
+    from scipy import stats as scipy_stats
+    
     fig, ax = plt.subplots(figsize=(12, 6))
     
-    for year in sorted(years_data.keys()):
-        counts = total_per_month(years_data[year])
-        # Plot KDE
-        data = np.array(counts)
-        from scipy import stats as scipy_stats
-        kde = scipy_stats.gaussian_kde(data)
-        x_range = np.linspace(min(data) - 2, max(data) + 2, 100)
-        ax.plot(x_range, kde(x_range), label=str(year), linewidth=2)
+    if use_scaled(mode, len(prepared.years), limits['max_lines']):
+        values = prepared.monthly_values()
+        grid = np.linspace(values.min() - 2, values.max() + 2, 200)
+        densities = _kde_rows(prepared.monthly_observed, grid)
+        densities = densities[np.isfinite(densities).all(axis=1)]
+        draw_quantile_bands(ax, grid, quantile_bands(densities, axis=0),
+                            label=f'Median density ({len(densities)} years)')
+    else:
+        for year, data in zip(prepared.years, prepared.observed_rows()):
+            # Plot KDE
+            kde = scipy_stats.gaussian_kde(data)
+            x_range = np.linspace(min(data) - 2, max(data) + 2, 100)
+            ax.plot(x_range, kde(x_range), label=str(year), linewidth=2)
     
     ax.set_title('Distribution Density: Monthly Events Across Years', 
                  fontsize=14, fontweight='bold')
@@ -224,7 +312,7 @@ def plot_kde_comparison(years_data: Dict[int, List[List[int]]],
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        save_figure(save_path)
     
     if show:
         plt.show()
@@ -233,71 +321,140 @@ def plot_kde_comparison(years_data: Dict[int, List[List[int]]],
 
 
 def generate_all_plots(years_data: Dict[int, List[List[int]]], 
-                      output_dir: str = 'outputs') -> None:
+                      output_dir: str = 'outputs',
+                      years: Optional[Iterable[int]] = None,
+                      include_comparisons: bool = True,
+                      mode: str = 'auto',
+                      thresholds: Optional[Dict[str, int]] = None,
+                      budgets: Optional[Dict[str, float]] = None,
+                      profile: Optional[str] = None,
+                      small_multiples: bool = False) -> Dict:
     """
     Generate all visualizations and save to output directory.
     
+    Writes a render manifest (render.MANIFEST_NAME) with the size and save
+    time of every file next to the plots.
+    
     Args:
         years_data: Dictionary with year -> data mapping
         output_dir: Directory to save plots
+        years: Years whose per-year plots are generated (default: all)
+        include_comparisons: Whether to generate the cross-year plots
+        mode: Rendering mode of the scalable plots ('auto', 'full' or 'scaled')
+        thresholds: Overrides of scaling.DEFAULT_THRESHOLDS
+        budgets: Render-time budget in seconds per file name (optional)
+        profile: Render profile (see render.PROFILES, default: the active one)
+        small_multiples: Render the monthly totals of all years into one
+            figure (monthly_totals_all) instead of one file per year
+        
+    Returns:
+        Render-time report (see scaling.RenderTimer.report) with the
+        'profile' used and the 'manifest' path
     """
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
     
     print("Generating visualizations...")
     
-    # Basic plots per year
-    for year in sorted(years_data.keys()):
-        from ..viz.basic import plot_monthly_totals
-        plot_monthly_totals(years_data[year], year, 
-                          save_path=str(output_path / f'monthly_totals_{year}.png'),
-                          show=False)
-        print(f"✓ monthly_totals_{year}.png")
+    plot_years = sorted(years_data.keys()) if years is None else sorted(years)
+    timer = RenderTimer(budgets)
+    scaling = {'mode': mode, 'thresholds': thresholds}
+    
+    with render.use_profile(profile) as settings, render.collect() as records:
+        _render_plots(years_data, output_path, plot_years, include_comparisons,
+                      small_multiples, timer, scaling, settings['format'])
+        report = timer.report()
+        report['profile'] = settings['name']
+        report['manifest'] = str(render.write_manifest(output_path, records, {'render': report}))
+    
+    print(f"\nAll visualizations saved to {output_path}/ "
+          f"({settings['name']} profile, render time {report['total_s']:.2f}s, "
+          f"{sum(r['bytes'] for r in records) / 1024:.0f} KiB)")
+    for name in report['over_budget']:
+        print(f"⚠ {name} exceeded its render-time budget")
+    return report
+
+
+def _render_plots(years_data: Dict[int, List[List[int]]], output_path: Path,
+                  plot_years: List[int], include_comparisons: bool, small_multiples: bool,
+                  timer: RenderTimer, scaling: Dict, ext: str) -> None:
+    """Render every plot of generate_all_plots with the active profile."""
+    # Scan the raw events once for every plot below
+    prepared = prepare_plot_data(years_data)
+    
+    # Basic plots per year, drawn into one reused figure
+    from ..viz.basic import MonthlyTotalsTemplate, plot_monthly_totals, plot_monthly_totals_grid
+    if small_multiples:
+        with timer.track(f'monthly_totals_all.{ext}'):
+            plot_monthly_totals_grid({year: years_data[year] for year in plot_years},
+                                     save_path=str(output_path / f'monthly_totals_all.{ext}'),
+                                     show=False, **scaling)
+        print(f"✓ monthly_totals_all.{ext}")
+    elif plot_years:
+        template = MonthlyTotalsTemplate()
+        try:
+            for year in plot_years:
+                with timer.track(f'monthly_totals_{year}.{ext}'):
+                    plot_monthly_totals(years_data[year], year, 
+                                      save_path=str(output_path / f'monthly_totals_{year}.{ext}'),
+                                      show=False, prepared=prepared, template=template)
+                print(f"✓ monthly_totals_{year}.{ext}")
+        finally:
+            template.close()
+    
+    if not include_comparisons:
+        return
     
     # Comparison plots
     from ..viz.basic import plot_year_comparison, plot_distribution_histogram, plot_box_comparison
     from ..viz.advanced import plot_heatmap_days_vs_years, plot_trend_with_regression
     from ..viz.advanced import plot_day_distribution, plot_correlation_matrix, plot_kde_comparison
     
-    plot_year_comparison(years_data, 
-                        save_path=str(output_path / 'year_comparison.png'),
-                        show=False)
-    print("✓ year_comparison.png")
-    
-    plot_distribution_histogram(years_data,
-                               save_path=str(output_path / 'distribution_histogram.png'),
-                               show=False)
-    print("✓ distribution_histogram.png")
-    
-    plot_box_comparison(years_data,
-                       save_path=str(output_path / 'box_comparison.png'),
-                       show=False)
-    print("✓ box_comparison.png")
-    
-    plot_heatmap_days_vs_years(years_data,
-                              save_path=str(output_path / 'heatmap_intensity.png'),
-                              show=False)
-    print("✓ heatmap_intensity.png")
-    
-    plot_trend_with_regression(years_data,
-                              save_path=str(output_path / 'trend_analysis.png'),
-                              show=False)
-    print("✓ trend_analysis.png")
-    
-    plot_day_distribution(years_data[sorted(years_data.keys())[-1]],
-                         year=sorted(years_data.keys())[-1],
-                         save_path=str(output_path / 'day_distribution_recent.png'),
-                         show=False)
-    print("✓ day_distribution_recent.png")
-    
-    plot_correlation_matrix(years_data,
-                           save_path=str(output_path / 'correlation_matrix.png'),
-                           show=False)
-    print("✓ correlation_matrix.png")
-    
-    plot_kde_comparison(years_data,
-                       save_path=str(output_path / 'kde_comparison.png'),
-                       show=False)
-    print("✓ kde_comparison.png")
-    
-    print(f"\nAll visualizations saved to {output_path}/")
+    with timer.track(f'year_comparison.{ext}'):
+        plot_year_comparison(years_data, 
+                            save_path=str(output_path / f'year_comparison.{ext}'),
+                            show=False, prepared=prepared, **scaling)
+    print(f"✓ year_comparison.{ext}")
+    
+    with timer.track(f'distribution_histogram.{ext}'):
+        plot_distribution_histogram(years_data,
+                                   save_path=str(output_path / f'distribution_histogram.{ext}'),
+                                   show=False, prepared=prepared)
+    print(f"✓ distribution_histogram.{ext}")
+    
+    with timer.track(f'box_comparison.{ext}'):
+        plot_box_comparison(years_data,
+                           save_path=str(output_path / f'box_comparison.{ext}'),
+                           show=False, prepared=prepared, **scaling)
+    print(f"✓ box_comparison.{ext}")
+    
+    with timer.track(f'heatmap_intensity.{ext}'):
+        plot_heatmap_days_vs_years(years_data,
+                                  save_path=str(output_path / f'heatmap_intensity.{ext}'),
+                                  show=False, prepared=prepared, **scaling)
+    print(f"✓ heatmap_intensity.{ext}")
+    
+    with timer.track(f'trend_analysis.{ext}'):
+        plot_trend_with_regression(years_data,
+                                  save_path=str(output_path / f'trend_analysis.{ext}'),
+                                  show=False, **scaling)
+    print(f"✓ trend_analysis.{ext}")
+    
+    with timer.track(f'day_distribution_recent.{ext}'):
+        plot_day_distribution(years_data[sorted(years_data.keys())[-1]],
+                             year=sorted(years_data.keys())[-1],
+                             save_path=str(output_path / f'day_distribution_recent.{ext}'),
+                             show=False, prepared=prepared)
+    print(f"✓ day_distribution_recent.{ext}")
+    
+    with timer.track(f'correlation_matrix.{ext}'):
+        plot_correlation_matrix(years_data,
+                               save_path=str(output_path / f'correlation_matrix.{ext}'),
+                               show=False, prepared=prepared, **scaling)
+    print(f"✓ correlation_matrix.{ext}")
+    
+    with timer.track(f'kde_comparison.{ext}'):
+        plot_kde_comparison(years_data,
+                           save_path=str(output_path / f'kde_comparison.{ext}'),
+                           show=False, prepared=prepared, **scaling)
+    print(f"✓ kde_comparison.{ext}")
@@ -1,75 +1,247 @@
 """Basic visualizations for event data."""
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 import matplotlib.pyplot as plt
+import numpy as np
 import seaborn as sns
+from matplotlib.collections import PolyCollection
 from pathlib import Path
 
-from ..data.loader import MONTHS
+from ..data.loader import MONTHS, observed_mask
 from ..stats.descriptive import total_per_month
+from .prepare import PlotData, prepare_plot_data
+from .render import save_figure
+from .scaling import (bin_rows, binned_quantile_bands, draw_quantile_bands, quantile_bands, resolve_thresholds,
+                      sparse_ticks, use_scaled)
 
 # Set default style
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (12, 6)
 
+# Monthly totals grid: horizontal gap between panels (in bar widths) and
+# room above each panel for its title (fraction of the shared y range)
+GRID_GAP = 1.5
+GRID_HEADROOM = 0.3
+
+
+class MonthlyTotalsTemplate:
+    """
+    Reusable figure for the per-year monthly totals bar chart.
+    
+    The figure, axes, bars, value labels and layout are built once; each
+    render only updates bar heights, labels, y-limits and the title before
+    saving, so repeated per-year plots skip the figure setup.
+    """
+    
+    def __init__(self, n_months: int = 12):
+        """
+        Args:
+            n_months: Number of bars (months) in the chart
+        """
+        self.fig, self.ax = plt.subplots(figsize=(12, 5))
+        self.bars = self.ax.bar(MONTHS[:n_months], [0] * n_months,
+                                color='steelblue', alpha=0.8, edgecolor='navy')
+        self.labels = [self.ax.text(bar.get_x() + bar.get_width()/2., 0, '',
+                                    ha='center', va='bottom', fontsize=9)
+                       for bar in self.bars]
+        
+        self.title = self.ax.set_title('', fontsize=14, fontweight='bold')
+        self.ax.set_xlabel('Month', fontsize=11)
+        self.ax.set_ylabel('Number of Events', fontsize=11)
+        self.ax.tick_params(axis='x', rotation=45)
+        self._label_width = 0
+    
+    def render(self, totals, year: int, save_path: str = None) -> None:
+        """
+        Draw one year into the template and optionally save it.
+        
+        Args:
+            totals: Events per month, NaN for unobserved months (those bars
+                and bars past its length are left empty)
+            year: Year number for title
+            save_path: Path to save figure (optional)
+        """
+        for i, (bar, label) in enumerate(zip(self.bars, self.labels)):
+            drawn = i < len(totals) and not np.isnan(totals[i])
+            height = totals[i] if drawn else 0
+            bar.set_height(height)
+            label.set_y(height)
+            label.set_text(f'{int(height)}' if drawn else '')
+        
+        self.title.set_text(f'Total Events per Month - {year}')
+        self.ax.relim()
+        self.ax.autoscale_view()
+        
+        # Re-layout only when the y tick labels get wider than the laid-out ones
+        width = len(str(int(self.ax.get_ylim()[1])))
+        if width > self._label_width:
+            self.fig.tight_layout()
+            self._label_width = width
+        
+        if save_path:
+            save_figure(save_path, self.fig)
+    
+    def close(self) -> None:
+        """Release the figure."""
+        plt.close(self.fig)
+
 
 def plot_monthly_totals(data: List[List[int]], year: int, 
-                       save_path: str = None, show: bool = True) -> None:
+                       save_path: str = None, show: bool = True,
+                       prepared: Optional[PlotData] = None,
+                       template: Optional[MonthlyTotalsTemplate] = None) -> None:
     """
     Plot bar chart of total events per month.
     
+    Unobserved months of a partial year are left without a bar or label.
+    
     Args:
         data: List of 12 months with daily events
         year: Year number for title
         save_path: Path to save figure (optional)
         show: Whether to display plot
+        prepared: Precomputed plot data containing this year (optional)
+        template: Figure reused across calls (optional); it is left open
+            for the next year and closed by its owner
     """
-    totals = total_per_month(data)
-    months = MONTHS[:len(data)]
+    if prepared is not None:
+        totals = prepared.monthly_observed[prepared.year_index(year)]
+    else:
+        totals = np.where(observed_mask(data), total_per_month(data), np.nan)
     
-    fig, ax = plt.subplots(figsize=(12, 5))
-    bars = ax.bar(months, totals, color='steelblue', alpha=0.8, edgecolor='navy')
+    if template is not None:
+        template.render(totals, year, save_path)
+        return
     
-    # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{int(height)}',
-                ha='center', va='bottom', fontsize=9)
+    template = MonthlyTotalsTemplate(len(data))
+    template.render(totals, year, save_path)
     
-    ax.set_title(f'Total Events per Month - {year}', fontsize=14, fontweight='bold')
-    ax.set_xlabel('Month', fontsize=11)
-    ax.set_ylabel('Number of Events', fontsize=11)
-    ax.tick_params(axis='x', rotation=45)
+    if show:
+        plt.show()
+    else:
+        template.close()
+
+
+def plot_monthly_totals_grid(years_data: Dict[int, List[List[int]]],
+                             save_path: str = None, show: bool = True,
+                             prepared: Optional[PlotData] = None, ncols: int = 4,
+                             mode: str = 'auto', thresholds: Optional[Dict[str, int]] = None) -> None:
+    """
+    Plot the monthly totals of every year as small multiples in one figure.
     
-    plt.tight_layout()
+    With more years than the 'max_panels' threshold (or mode='scaled')
+    consecutive years are averaged into at most that many panels. All
+    panels share one axes and one bar collection, so large grids stay
+    within the render budget.
+    
+    Args:
+        years_data: Dictionary with year -> data mapping
+        save_path: Path to save figure
+        show: Whether to display plot
+        prepared: Precomputed plot data (built from years_data if omitted)
+        ncols: Panels per row
+        mode: 'auto', 'full' (one panel per year) or 'scaled' (binned years)
+        thresholds: Overrides of scaling.DEFAULT_THRESHOLDS
+    """
+    prepared = prepared if prepared is not None else prepare_plot_data(years_data)
+    limit = resolve_thresholds(thresholds)['max_panels']
+    
+    if use_scaled(mode, len(prepared.years), limit):
+        panels, titles = bin_rows(prepared.monthly_observed, prepared.years, limit)
+        titles = [f'{title} (mean)' if '-' in title else title for title in titles]
+    else:
+        panels, titles = prepared.monthly_observed, [str(year) for year in prepared.years]
+    
+    ncols = max(1, min(ncols, len(panels)))
+    nrows = -(-len(panels) // ncols)
+    fig_w, fig_h = 3.5 * ncols, 2.2 * nrows + 0.8
+    # Fixed margins in inches for the suptitle and the shared axis labels
+    fig = plt.figure(figsize=(fig_w, fig_h))
+    ax = fig.add_axes((0.6 / fig_w, 0.1 / fig_h, 1 - 0.7 / fig_w, (fig_h - 0.8) / fig_h))
+    ax.set_axis_off()
+    
+    # All panels share one axes: panel i sits in cell (row, col) of a grid of
+    # width n_months + GRID_GAP and height ymax * (1 + GRID_HEADROOM), and
+    # every bar and frame goes into one collection, so the render cost does
+    # not grow with a layout pass and tick update per panel.
+    panels = np.asarray(panels, dtype=float)
+    n_months = panels.shape[1]
+    ymax = max(float(np.nanmax(panels, initial=0.0)), 1.0)
+    cell_w = n_months + GRID_GAP
+    cell_h = ymax * (1 + GRID_HEADROOM)
+    index = np.arange(len(panels))
+    x0 = (index % ncols) * cell_w
+    y0 = (nrows - 1 - index // ncols) * cell_h
+    
+    left = (x0[:, None] + np.arange(n_months) + 0.1).ravel()
+    bottom = np.repeat(y0, n_months)
+    height = panels.ravel()
+    drawn = ~np.isnan(height)
+    left, bottom, height = left[drawn], bottom[drawn], height[drawn]
+    bars = np.stack([np.column_stack([left, bottom]), np.column_stack([left, bottom + height]),
+                     np.column_stack([left + 0.8, bottom + height]), np.column_stack([left + 0.8, bottom])], axis=1)
+    ax.add_collection(PolyCollection(bars, facecolors='steelblue', edgecolors='navy',
+                                     alpha=0.8, linewidths=0.5))
+    frames = [[(x, y), (x, y + ymax), (x + n_months, y + ymax), (x + n_months, y)] for x, y in zip(x0, y0)]
+    ax.add_collection(PolyCollection(frames, facecolors='none', edgecolors='lightgray', linewidths=0.8))
+    
+    for x, y, title in zip(x0, y0, titles):
+        ax.text(x + n_months / 2, y + ymax * (1 + GRID_HEADROOM / 4), title,
+                ha='center', va='bottom', fontsize=10, fontweight='bold')
+    # Shared y scale at the left of every row
+    for y in y0[::ncols]:
+        ax.text(-0.3, y, '0', ha='right', va='center', fontsize=8)
+        ax.text(-0.3, y + ymax, f'{ymax:.4g}', ha='right', va='center', fontsize=8)
+    # Shared x axis: label the lowest panel of every column
+    for col in range(ncols):
+        last = col + (len(panels) - 1 - col) // ncols * ncols
+        for month in range(n_months):
+            ax.text(x0[last] + month + 0.5, y0[last] - ymax * 0.04, MONTHS[month][0],
+                    ha='center', va='top', fontsize=8)
+    ax.set_xlim(-1.5, ncols * cell_w - GRID_GAP + 0.5)
+    ax.set_ylim(-ymax * 0.15, nrows * cell_h)
+    fig.suptitle('Total Events per Month by Year', fontsize=14, fontweight='bold')
+    fig.supylabel('Number of Events', fontsize=11)
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        save_figure(save_path, fig)
     
     if show:
         plt.show()
     else:
-        plt.close()
+        plt.close(fig)
 
 
 def plot_year_comparison(years_data: Dict[int, List[List[int]]], 
-                        save_path: str = None, show: bool = True) -> None:
+                        save_path: str = None, show: bool = True,
+                        prepared: Optional[PlotData] = None,
+                        mode: str = 'auto', thresholds: Optional[Dict[str, int]] = None) -> None:
     """
     Plot line chart comparing monthly patterns across years.
     
+    With more years than the 'max_lines' threshold (or mode='scaled') the
+    per-year lines are replaced by monthly quantile bands across years.
+    
     Args:
         years_data: Dictionary with year -> data mapping
         save_path: Path to save figure
         show: Whether to display plot
+        prepared: Precomputed plot data (built from years_data if omitted)
+        mode: 'auto', 'full' (one line per year) or 'scaled' (quantile bands)
+        thresholds: Overrides of scaling.DEFAULT_THRESHOLDS
     """
+    prepared = prepared if prepared is not None else prepare_plot_data(years_data)
+    limits = resolve_thresholds(thresholds)
     fig, ax = plt.subplots(figsize=(14, 6))
     
     months_range = range(1, 13)
     
-    for year in sorted(years_data.keys()):
-        totals = total_per_month(years_data[year])
-        ax.plot(months_range, totals, marker='o', label=str(year), linewidth=2)
+    if use_scaled(mode, len(prepared.years), limits['max_lines']):
+        draw_quantile_bands(ax, months_range, quantile_bands(prepared.monthly_observed, axis=0),
+                            label=f'Median ({prepared.years[0]}-{prepared.years[-1]})')
+    else:
+        for year, totals in zip(prepared.years, prepared.monthly_observed):
+            ax.plot(months_range, totals, marker='o', label=str(year), linewidth=2)
     
     ax.set_title('Monthly Events Trend Across Years', fontsize=14, fontweight='bold')
     ax.set_xlabel('Month', fontsize=11)
@@ -82,7 +254,7 @@ def plot_year_comparison(years_data: Dict[int, List[List[int]]],
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        save_figure(save_path)
     
     if show:
         plt.show()
@@ -91,7 +263,8 @@ def plot_year_comparison(years_data: Dict[int, List[List[int]]],
 
 
 def plot_distribution_histogram(years_data: Dict[int, List[List[int]]], 
-                               save_path: str = None, show: bool = True) -> None:
+                               save_path: str = None, show: bool = True,
+                               prepared: Optional[PlotData] = None) -> None:
     """
     Plot histogram of events per month distribution.
     
@@ -99,11 +272,10 @@ def plot_distribution_histogram(years_data: Dict[int, List[List[int]]],
         years_data: Dictionary with year -> data mapping
         save_path: Path to save figure
         show: Whether to display plot
+        prepared: Precomputed plot data (built from years_data if omitted)
     """
-    all_counts = []
-    
-    for year_data in years_data.values():
-        all_counts.extend(total_per_month(year_data))
+    prepared = prepared if prepared is not None else prepare_plot_data(years_data)
+    all_counts = prepared.monthly_values()
     
     fig, ax = plt.subplots(figsize=(10, 6))
     
@@ -121,7 +293,7 @@ def plot_distribution_histogram(years_data: Dict[int, List[List[int]]],
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        save_figure(save_path)
     
     if show:
         plt.show()
@@ -130,30 +302,44 @@ def plot_distribution_histogram(years_data: Dict[int, List[List[int]]],
 
 
 def plot_box_comparison(years_data: Dict[int, List[List[int]]], 
-                       save_path: str = None, show: bool = True) -> None:
+                       save_path: str = None, show: bool = True,
+                       prepared: Optional[PlotData] = None,
+                       mode: str = 'auto', thresholds: Optional[Dict[str, int]] = None) -> None:
     """
     Plot box plot comparing distributions across years.
     
+    With more years than the 'max_boxes' threshold (or mode='scaled') the
+    boxes are replaced by quantile bands of the monthly counts, with years
+    pooled into at most 'max_matrix_size' bins.
+    
     Args:
         years_data: Dictionary with year -> data mapping
         save_path: Path to save figure
         show: Whether to display plot
+        prepared: Precomputed plot data (built from years_data if omitted)
+        mode: 'auto', 'full' (one box per year) or 'scaled' (quantile bands)
+        thresholds: Overrides of scaling.DEFAULT_THRESHOLDS
     """
-    data_list = []
-    labels = []
-    
-    for year in sorted(years_data.keys()):
-        data_list.append(total_per_month(years_data[year]))
-        labels.append(str(year))
+    prepared = prepared if prepared is not None else prepare_plot_data(years_data)
+    limits = resolve_thresholds(thresholds)
+    labels = [str(year) for year in prepared.years]
     
     fig, ax = plt.subplots(figsize=(12, 6))
     
-    bp = ax.boxplot(data_list, labels=labels, patch_artist=True)
-    
-    # Color boxes
-    for patch in bp['boxes']:
-        patch.set_facecolor('lightblue')
-        patch.set_alpha(0.7)
+    if use_scaled(mode, len(labels), limits['max_boxes']):
+        bands, bin_names = binned_quantile_bands(prepared.monthly_observed, labels, limits['max_matrix_size'])
+        draw_quantile_bands(ax, range(len(bin_names)), bands)
+        positions, tick_labels = sparse_ticks(bin_names)
+        ax.set_xticks(positions)
+        ax.set_xticklabels(tick_labels, rotation=45)
+        ax.legend(loc='best')
+    else:
+        bp = ax.boxplot(prepared.observed_rows(), labels=labels, patch_artist=True)
+        
+        # Color boxes
+        for patch in bp['boxes']:
+            patch.set_facecolor('lightblue')
+            patch.set_alpha(0.7)
     
     ax.set_title('Distribution Comparison Across Years', fontsize=14, fontweight='bold')
     ax.set_xlabel('Year', fontsize=11)
@@ -163,7 +349,7 @@ def plot_box_comparison(years_data: Dict[int, List[List[int]]],
     plt.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        save_figure(save_path)
     
     if show:
         plt.show()
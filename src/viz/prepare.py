@@ -0,0 +1,115 @@
+"""
+Shared data preparation for the plotting functions.
+
+The raw events are scanned once into a (years x 12 x 31) count tensor.
+Every plot input (monthly totals, day-of-month counts, histogram values,
+correlation matrix) is a reduction of that tensor computed at most once
+and handed out as zero-copy views. Unobserved months (see
+loader.YearEvents) are NaN in `monthly_observed` and left out of the
+histogram values, correlations and densities.
+"""
+
+from functools import cached_property
+from typing import Dict, List
+
+import numpy as np
+
+from ..data.calendar import flatten_store
+from ..data.loader import EXPECTED_MONTHS, VALID_DAYS_RANGE, observed_mask
+
+N_DAYS = VALID_DAYS_RANGE[1]
+
+
+class PlotData:
+    """
+    Precomputed count tensor and derived plot matrices for one store.
+
+    Attributes:
+        years: Sorted years of the store
+        counts: (years x 12 x 31) event counts per year, month and day
+        observed: (years x 12) observed-months mask
+    """
+
+    def __init__(self, years_data: Dict[int, List[List[int]]]):
+        """
+        Args:
+            years_data: Dictionary with year -> data mapping
+        """
+        self.years = sorted(years_data.keys())
+        self._index = {year: i for i, year in enumerate(self.years)}
+
+        years, months, days = flatten_store(years_data)
+        cells = (np.searchsorted(self.years, years) * EXPECTED_MONTHS + months - 1) * N_DAYS + days - 1
+        flat = np.bincount(cells, minlength=len(self.years) * EXPECTED_MONTHS * N_DAYS)
+        self.counts = flat.reshape(len(self.years), EXPECTED_MONTHS, N_DAYS)
+        self.observed = np.array([observed_mask(years_data[year]) for year in self.years],
+                                 dtype=bool).reshape(len(self.years), EXPECTED_MONTHS)
+        self.complete = bool(self.observed.all())
+
+    def year_index(self, year: int) -> int:
+        """Position of a year in the tensor (raises KeyError if missing)."""
+        return self._index[year]
+
+    @cached_property
+    def monthly(self) -> np.ndarray:
+        """(years x 12) events per month (0 for unobserved months)."""
+        return self.counts.sum(axis=2)
+
+    @cached_property
+    def monthly_observed(self) -> np.ndarray:
+        """(years x 12) events per month as floats, NaN for unobserved months."""
+        if self.complete:
+            return self.monthly.astype(float)
+        return np.where(self.observed, self.monthly, np.nan)
+
+    @cached_property
+    def day_totals(self) -> np.ndarray:
+        """(years x 31) events per day of month, all months pooled."""
+        return self.counts.sum(axis=1)
+
+    @cached_property
+    def correlation(self) -> np.ndarray:
+        """(years x years) correlation of the monthly patterns, over the months observed in both years."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.complete:
+                return np.corrcoef(self.monthly)
+            # Pairwise sums over the months both rows observed
+            mask = self.observed.astype(float)
+            values = np.where(self.observed, self.monthly, 0).astype(float)
+            n = mask @ mask.T
+            sums = values @ mask.T
+            squares = (values ** 2) @ mask.T
+            cov = values @ values.T - sums * sums.T / n
+            var = squares - sums ** 2 / n
+            return cov / np.sqrt(var * var.T)
+
+    def monthly_totals(self, year: int) -> np.ndarray:
+        """Events per month of one year (view)."""
+        return self.monthly[self._index[year]]
+
+    def day_counts(self, year: int) -> np.ndarray:
+        """Events per day of month (index 0 = day 1) of one year (view)."""
+        return self.day_totals[self._index[year]]
+
+    def monthly_values(self) -> np.ndarray:
+        """All observed monthly counts of all years as one flat array (a view for complete stores)."""
+        if self.complete:
+            return self.monthly.reshape(-1)
+        return self.monthly[self.observed]
+
+    def observed_rows(self) -> List[np.ndarray]:
+        """Observed monthly counts of every year, one array per year."""
+        return [row[mask] for row, mask in zip(self.monthly, self.observed)]
+
+
+def prepare_plot_data(years_data: Dict[int, List[List[int]]]) -> PlotData:
+    """
+    Scan a store once and precompute the inputs of every plot.
+
+    Args:
+        years_data: Dictionary with year -> data mapping
+
+    Returns:
+        PlotData to pass as `prepared` to the plotting functions
+    """
+    return PlotData(years_data)
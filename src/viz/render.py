@@ -0,0 +1,155 @@
+"""
+Render profiles and the central figure-saving function.
+
+Every plot saves through save_figure, which applies the active profile
+(format, dpi, tight bounding box) and, while a manifest is being
+collected, records the output size and save time of each file.
+
+Profiles:
+    draft    - 72 dpi PNG, no tight bbox (fast, small; dashboards)
+    publish  - 300 dpi PNG with tight bbox (default, previous behaviour)
+    svg/pdf  - vector output with tight bbox
+"""
+
+import contextlib
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import matplotlib.pyplot as plt
+
+logger = logging.getLogger(__name__)
+
+PROFILES = {
+    'draft': {'format': 'png', 'dpi': 72, 'bbox_inches': None},
+    'publish': {'format': 'png', 'dpi': 300, 'bbox_inches': 'tight'},
+    'svg': {'format': 'svg', 'dpi': 72, 'bbox_inches': 'tight'},
+    'pdf': {'format': 'pdf', 'dpi': 72, 'bbox_inches': 'tight'},
+}
+
+DEFAULT_PROFILE = 'publish'
+MANIFEST_NAME = 'render_manifest.json'
+
+_active = DEFAULT_PROFILE
+_records: Optional[List[Dict]] = None
+
+
+def get_profile(name: Optional[str] = None) -> Dict:
+    """
+    Settings of a render profile.
+
+    Args:
+        name: Profile name (default: the active profile)
+
+    Returns:
+        Dictionary with 'name', 'format', 'dpi' and 'bbox_inches'
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    name = name or _active
+    if name not in PROFILES:
+        raise ValueError(f"Unknown render profile {name!r}, expected one of {sorted(PROFILES)}")
+    return dict(PROFILES[name], name=name)
+
+
+def extension(name: Optional[str] = None) -> str:
+    """File extension of a profile (default: the active profile)."""
+    return get_profile(name)['format']
+
+
+@contextlib.contextmanager
+def use_profile(name: Optional[str]):
+    """
+    Make a profile active for the enclosed plotting calls.
+
+    Args:
+        name: Profile name (None keeps the current profile)
+    """
+    global _active
+    previous = _active
+    _active = get_profile(name)['name'] if name else previous
+    try:
+        yield get_profile()
+    finally:
+        _active = previous
+
+
+@contextlib.contextmanager
+def collect():
+    """
+    Record every figure saved in the enclosed block.
+
+    Yields:
+        List receiving one record per saved file
+    """
+    global _records
+    previous = _records
+    _records = []
+    try:
+        yield _records
+    finally:
+        _records = previous
+
+
+def save_figure(save_path: str, fig=None) -> Path:
+    """
+    Save a figure with the active render profile.
+
+    The file suffix is replaced by the profile's format.
+
+    Args:
+        save_path: Output path
+        fig: Figure to save (default: the current figure)
+
+    Returns:
+        Path actually written
+    """
+    profile = get_profile()
+    path = Path(save_path).with_suffix(f".{profile['format']}")
+    fig = fig or plt.gcf()
+
+    start = time.perf_counter()
+    fig.savefig(path, format=profile['format'], dpi=profile['dpi'],
+                bbox_inches=profile['bbox_inches'])
+    elapsed = time.perf_counter() - start
+
+    if _records is not None:
+        _records.append({
+            'file': path.name,
+            'profile': profile['name'],
+            'format': profile['format'],
+            'dpi': profile['dpi'],
+            'bytes': path.stat().st_size,
+            'save_s': round(elapsed, 4),
+        })
+    return path
+
+
+def write_manifest(output_dir: str, records: List[Dict], extra: Optional[Dict] = None) -> Path:
+    """
+    Write the render manifest of one batch.
+
+    Args:
+        output_dir: Directory of the rendered files
+        records: Records collected by collect()
+        extra: Additional top-level entries (e.g. render-time report)
+
+    Returns:
+        Path of the manifest file
+    """
+    manifest = {
+        'profile': get_profile()['name'],
+        'files': records,
+        'total_bytes': sum(r['bytes'] for r in records),
+        'total_save_s': round(sum(r['save_s'] for r in records), 4),
+    }
+    manifest.update(extra or {})
+
+    path = Path(output_dir) / MANIFEST_NAME
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    logger.info(f"Render manifest written to {path}")
+    return path
@@ -0,0 +1,266 @@
+"""
+Scalable rendering helpers for plots over many years or series.
+
+Above configurable size thresholds the plots switch from one artist per
+year (lines, boxes, annotated cells) to aggregated representations whose
+artist count does not grow with the input: quantile bands, binned
+heatmaps and un-annotated imshow matrices. RenderTimer records render
+times against per-plot budgets.
+"""
+
+import contextlib
+import logging
+import time
+import warnings
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLDS = {
+    # Lines per year in plot_year_comparison before switching to quantile bands
+    'max_lines': 15,
+    # Boxes in plot_box_comparison before switching to quantile bands
+    'max_boxes': 40,
+    # Heatmap cells annotated with their value before annotations are dropped
+    'max_annotated_cells': 400,
+    # Rows/columns drawn in a heatmap before rows are binned
+    'max_matrix_size': 120,
+    # Panels in plot_monthly_totals_grid before years are binned
+    'max_panels': 48,
+}
+
+DEFAULT_BUDGET_S = 5.0
+
+BAND_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def resolve_thresholds(overrides: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """
+    Merge threshold overrides with the defaults.
+
+    Args:
+        overrides: Thresholds to change (optional)
+
+    Returns:
+        Complete threshold dictionary
+
+    Raises:
+        KeyError: If an override names an unknown threshold
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for key, value in (overrides or {}).items():
+        if key not in thresholds:
+            raise KeyError(f"Unknown threshold {key!r}, expected one of {sorted(thresholds)}")
+        thresholds[key] = value
+    return thresholds
+
+
+def use_scaled(mode: str, size: int, limit: int) -> bool:
+    """
+    Decide whether a plot renders in scaled mode.
+
+    Args:
+        mode: 'auto' (scaled above the limit), 'full' or 'scaled'
+        size: Number of items (years, series, cells) to draw
+        limit: Threshold for 'auto'
+
+    Returns:
+        True for the aggregated representation
+    """
+    if mode not in ('auto', 'full', 'scaled'):
+        raise ValueError(f"Unknown mode {mode!r}, expected 'auto', 'full' or 'scaled'")
+    return mode == 'scaled' or (mode == 'auto' and size > limit)
+
+
+def quantile_bands(matrix: np.ndarray, axis: int = 0,
+                   quantiles: Sequence[float] = BAND_QUANTILES) -> Dict[float, np.ndarray]:
+    """
+    Quantiles of a matrix along one axis, ignoring NaN entries.
+
+    Args:
+        matrix: 2-D array (NaN for missing values)
+        axis: Axis reduced (0: across rows, 1: within each row)
+        quantiles: Quantiles to compute (0-1)
+
+    Returns:
+        Dictionary quantile -> 1-D array
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns give NaN
+        values = np.nanquantile(np.asarray(matrix, dtype=float), quantiles, axis=axis)
+    return dict(zip(quantiles, values))
+
+
+def draw_quantile_bands(ax, x, bands: Dict[float, np.ndarray], color: str = 'steelblue',
+                        label: str = 'Median') -> None:
+    """
+    Draw 5-95% and 25-75% bands with a median line.
+
+    Args:
+        ax: Matplotlib axes
+        x: X positions
+        bands: Output of quantile_bands with the default quantiles
+        color: Band and line color
+        label: Median line label
+    """
+    ax.fill_between(x, bands[0.05], bands[0.95], color=color, alpha=0.2, label='5-95%')
+    ax.fill_between(x, bands[0.25], bands[0.75], color=color, alpha=0.4, label='25-75%')
+    ax.plot(x, bands[0.5], color=color, linewidth=2, label=label)
+
+
+def _bin_edges(n_items: int, max_bins: int) -> np.ndarray:
+    """Start offsets of at most max_bins near-equal consecutive bins."""
+    return np.unique(np.linspace(0, n_items, min(n_items, max_bins) + 1).astype(int)[:-1])
+
+
+def bin_labels(labels: Sequence, max_bins: int) -> List[str]:
+    """
+    Labels of the bins used by bin_rows and bin_matrix.
+
+    Args:
+        labels: One label per item
+        max_bins: Maximum number of bins
+
+    Returns:
+        One 'first-last' label per bin (the item label for single-item bins)
+    """
+    starts = _bin_edges(len(labels), max_bins)
+    stops = np.append(starts[1:], len(labels))
+    return [f'{labels[a]}-{labels[b - 1]}' if b - a > 1 else str(labels[a])
+            for a, b in zip(starts, stops)]
+
+
+def bin_rows(matrix: np.ndarray, labels: Sequence, max_rows: int
+             ) -> Tuple[np.ndarray, List[str]]:
+    """
+    Average consecutive rows into at most max_rows bins, ignoring NaN entries.
+
+    Args:
+        matrix: 2-D array (NaN for missing values)
+        labels: One label per row
+        max_rows: Maximum number of output rows
+
+    Returns:
+        Tuple of (binned matrix, bin labels)
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    starts = _bin_edges(len(matrix), max_rows)
+    present = ~np.isnan(matrix)
+    sums = np.add.reduceat(np.where(present, matrix, 0.0), starts, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return sums / np.add.reduceat(present, starts, axis=0), bin_labels(labels, max_rows)
+
+
+def binned_quantile_bands(matrix: np.ndarray, labels: Sequence, max_bins: int,
+                          quantiles: Sequence[float] = BAND_QUANTILES
+                          ) -> Tuple[Dict[float, np.ndarray], List[str]]:
+    """
+    Quantiles of the values pooled from consecutive rows, at most max_bins bins.
+
+    Args:
+        matrix: 2-D array (one row per year or series, NaN for missing values)
+        labels: One label per row
+        max_bins: Maximum number of bins
+        quantiles: Quantiles to compute (0-1)
+
+    Returns:
+        Tuple of (quantile -> 1-D array over bins, bin labels)
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    starts = _bin_edges(len(matrix), max_bins)
+    stops = np.append(starts[1:], len(matrix))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN bins give NaN
+        values = np.array([np.nanquantile(matrix[a:b], quantiles) for a, b in zip(starts, stops)])
+    return dict(zip(quantiles, values.T)), bin_labels(labels, max_bins)
+
+
+def bin_matrix(matrix: np.ndarray, max_size: int) -> np.ndarray:
+    """
+    Block-average a matrix down to at most max_size x max_size, ignoring NaN entries.
+
+    Args:
+        matrix: 2-D array (NaN for missing values)
+        max_size: Maximum number of rows and columns
+
+    Returns:
+        Binned matrix
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    rows = _bin_edges(matrix.shape[0], max_size)
+    cols = _bin_edges(matrix.shape[1], max_size)
+    present = ~np.isnan(matrix)
+    sums = np.add.reduceat(np.add.reduceat(np.where(present, matrix, 0.0), rows, axis=0), cols, axis=1)
+    counts = np.add.reduceat(np.add.reduceat(present.astype(int), rows, axis=0), cols, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return sums / counts
+
+
+def sparse_ticks(labels: Sequence, max_ticks: int = 20) -> Tuple[np.ndarray, List[str]]:
+    """
+    Evenly spaced subset of tick positions and labels.
+
+    Args:
+        labels: One label per position
+        max_ticks: Maximum number of ticks
+
+    Returns:
+        Tuple of (positions, labels)
+    """
+    step = max(1, -(-len(labels) // max_ticks))
+    positions = np.arange(0, len(labels), step)
+    return positions, [str(labels[i]) for i in positions]
+
+
+class RenderTimer:
+    """
+    Wall-clock render times per plot, checked against budgets.
+
+    Budgets map plot names to seconds; plots without an entry use the
+    default budget.
+    """
+
+    def __init__(self, budgets: Optional[Dict[str, float]] = None,
+                 default_budget: float = DEFAULT_BUDGET_S):
+        """
+        Args:
+            budgets: Plot name -> budget in seconds (optional)
+            default_budget: Budget for plots without an entry
+        """
+        self.budgets = budgets or {}
+        self.default_budget = default_budget
+        self.records: List[Dict] = []
+
+    @contextlib.contextmanager
+    def track(self, name: str):
+        """Time the enclosed rendering of one plot."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            budget = self.budgets.get(name, self.default_budget)
+            self.records.append({
+                'plot': name,
+                'seconds': round(elapsed, 4),
+                'budget_s': budget,
+                'over_budget': elapsed > budget,
+            })
+            if elapsed > budget:
+                logger.warning(f"{name} took {elapsed:.2f}s (budget {budget:.2f}s)")
+
+    def report(self) -> Dict:
+        """
+        Summarize the recorded plots.
+
+        Returns:
+            Dictionary with per-plot 'plots' records, 'total_s' and the
+            names of plots 'over_budget'
+        """
+        return {
+            'plots': list(self.records),
+            'total_s': round(sum(r['seconds'] for r in self.records), 4),
+            'over_budget': [r['plot'] for r in self.records if r['over_budget']],
+        }
@@ -0,0 +1,227 @@
+"""Watch mode: recompute only the years affected by changes to the data file."""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .data.loader import get_data_path, load_events_data, observed_mask
+from .data.rollups import Rollups
+from .stats import descriptive, advanced
+from .viz import advanced as viz_advanced, render
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 2.0
+
+
+def year_fingerprints(data_by_year: Dict[int, List[List[int]]]) -> Dict[int, str]:
+    """
+    Hash each year's monthly data.
+
+    The observed-months mask is part of the hash, so a month going from
+    unobserved (null) to observed with no events ([]) counts as a change.
+
+    Args:
+        data_by_year: Dictionary with year -> data mapping
+
+    Returns:
+        Dictionary with year -> SHA-1 hex digest of its content
+    """
+    return {
+        year: hashlib.sha1(json.dumps(data, separators=(',', ':')).encode('utf-8')
+                           + observed_mask(data).tobytes()).hexdigest()
+        for year, data in data_by_year.items()
+    }
+
+
+def diff_years(old: Dict[int, str], new: Dict[int, str]) -> Dict[str, List[int]]:
+    """
+    Compare two sets of year fingerprints.
+
+    Args:
+        old: Fingerprints from the previous cycle
+        new: Fingerprints from the current cycle
+
+    Returns:
+        Dictionary with sorted 'added', 'removed', 'changed' and 'unchanged' years
+    """
+    return {
+        'added': sorted(set(new) - set(old)),
+        'removed': sorted(set(old) - set(new)),
+        'changed': sorted(y for y in set(old) & set(new) if old[y] != new[y]),
+        'unchanged': sorted(y for y in set(old) & set(new) if old[y] == new[y]),
+    }
+
+
+def year_stats(data: List[List[int]]) -> Dict:
+    """
+    Compute the per-year statistics shown in the reports.
+
+    Args:
+        data: List of 12 months with daily events
+
+    Returns:
+        Dictionary with descriptive metrics, day distribution and normality test
+    """
+    summary = descriptive.year_summary(data)
+    return {
+        'total': summary['total'],
+        'avg_per_month': summary['avg_per_month'],
+        'per_month': summary['per_month'],
+        'peak_month': summary['peak_month'],
+        'lowest_month': summary['lowest_month'],
+        'top3': summary['top_days'],
+        'bottom3': summary['bottom_days'],
+        'std_dev': summary['std_dev'],
+        'cv': summary['cv'],
+        'day_distribution': advanced.day_distribution_analysis(data),
+        'normality': advanced.normality_test(data),
+    }
+
+
+class IncrementalAnalysis:
+    """
+    Cache of per-year, per-pair and cross-year results between watch cycles.
+
+    Per-year statistics, rollups and plots are recomputed only for added or
+    changed years, and year comparisons only for pairs involving them. Cross-year
+    results (trend, seasonality, correlations, prediction and comparison
+    plots) depend on every year and are recomputed whenever anything changes.
+    """
+
+    def __init__(self, output_dir: Optional[str] = 'outputs',
+                 render_profile: Optional[str] = None):
+        """
+        Args:
+            output_dir: Directory for plots; None disables plotting
+            render_profile: Render profile of the plots (default: the active one)
+        """
+        self.output_dir = output_dir
+        self.render_profile = render_profile
+        self.fingerprints: Dict[int, str] = {}
+        self.year_results: Dict[int, Dict] = {}
+        self.pair_results: Dict[Tuple[int, int], Dict] = {}
+        self.global_results: Dict = {}
+        self.rollups = Rollups()
+
+    def update(self, data_by_year: Dict[int, List[List[int]]]) -> Dict:
+        """
+        Bring cached results up to date with new data.
+
+        Args:
+            data_by_year: Dictionary with year -> data mapping
+
+        Returns:
+            Dictionary with the year diff and what was recomputed
+        """
+        fingerprints = year_fingerprints(data_by_year)
+        diff = diff_years(self.fingerprints, fingerprints)
+        dirty = set(diff['added']) | set(diff['changed'])
+        self.fingerprints = fingerprints
+
+        for year in diff['removed']:
+            self.year_results.pop(year, None)
+            if self.output_dir:
+                Path(self.output_dir, f'monthly_totals_{year}.{render.extension(self.render_profile)}').unlink(missing_ok=True)
+
+        for year in sorted(dirty):
+            self.year_results[year] = year_stats(data_by_year[year])
+        self.rollups.update(data_by_year, changed=dirty)
+
+        # Adjacent pairs plus first-vs-last, reusing untouched comparisons
+        years = sorted(data_by_year.keys())
+        pairs = list(zip(years, years[1:]))
+        if len(years) > 1 and (years[0], years[-1]) not in pairs:
+            pairs.append((years[0], years[-1]))
+        recomputed_pairs = []
+        pair_results = {}
+        for ya, yb in pairs:
+            cached = self.pair_results.get((ya, yb))
+            if cached is None or ya in dirty or yb in dirty:
+                cached = descriptive.compare_years(data_by_year[ya], data_by_year[yb], ya, yb)
+                recomputed_pairs.append((ya, yb))
+            pair_results[(ya, yb)] = cached
+        self.pair_results = pair_results
+
+        any_change = bool(dirty or diff['removed'])
+        if any_change and years:
+            self.global_results = advanced.comprehensive_analysis(data_by_year)
+            years_data = [data_by_year[y] for y in years]
+            self.global_results['avg_unique_days'] = descriptive.avg_unique_days(years_data)
+            self.global_results['common_days'] = descriptive.common_days_across_years(years_data)
+
+        if self.output_dir and any_change and years:
+            viz_advanced.generate_all_plots(data_by_year, output_dir=self.output_dir,
+                                            years=sorted(dirty), include_comparisons=True,
+                                            profile=self.render_profile)
+
+        return {
+            'diff': diff,
+            'recomputed_years': sorted(dirty),
+            'recomputed_pairs': recomputed_pairs,
+            'recomputed_global': any_change,
+        }
+
+
+def file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Return (mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def watch(filename: str = 'events.json',
+          on_update: Optional[Callable[[IncrementalAnalysis, Dict], None]] = None,
+          output_dir: Optional[str] = 'outputs',
+          interval: float = DEFAULT_POLL_INTERVAL,
+          max_cycles: Optional[int] = None,
+          render_profile: Optional[str] = None) -> IncrementalAnalysis:
+    """
+    Poll the data file and update the analysis whenever it changes.
+
+    The file is re-read only when its modification time or size changes.
+    Files caught mid-write (invalid JSON) are retried on the next poll.
+
+    Args:
+        filename: JSON file in data/raw/ (or an absolute path)
+        on_update: Callback receiving the analysis and the update summary
+        output_dir: Directory for plots; None disables plotting
+        interval: Seconds between polls
+        max_cycles: Stop after this many updates (default: run until interrupted)
+        render_profile: Render profile of the plots (default: the active one)
+
+    Returns:
+        The incremental analysis with the latest results
+    """
+    path = get_data_path(filename)
+    analysis = IncrementalAnalysis(output_dir=output_dir, render_profile=render_profile)
+    last_signature = None
+    cycles = 0
+
+    logger.info(f"Watching {path} (poll every {interval}s)")
+    try:
+        while max_cycles is None or cycles < max_cycles:
+            signature = file_signature(path)
+            if signature is not None and signature != last_signature:
+                try:
+                    data_by_year = load_events_data(filename)
+                except (json.JSONDecodeError, ValueError) as e:
+                    logger.warning(f"Could not load {path}, retrying: {e}")
+                else:
+                    last_signature = signature
+                    summary = analysis.update(data_by_year)
+                    cycles += 1
+                    if on_update is not None:
+                        on_update(analysis, summary)
+                    continue
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        logger.info("Watch stopped")
+
+    return analysis